@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark: breach filter build rate and lookup latency
+
+Builds a filter from N synthetic passwords (streamed, never held in memory),
+then times lookups of present and absent passwords.
+
+Usage: python benchmarks/bench_breach.py [--entries N] [--lookups N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_generator.breach import BreachFilter, build_filter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=2_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.pwbf")
+        for vectorized in (True, False):
+            start = time.perf_counter()
+            build_filter((f"leaked-{i}" for i in range(args.entries)), path,
+                         capacity=args.entries, vectorized=vectorized)
+            elapsed = time.perf_counter() - start
+            print(f"build ({'numpy' if vectorized else 'pure'}): {args.entries:,} entries in "
+                  f"{elapsed:.2f}s ({args.entries / elapsed:,.0f}/s), "
+                  f"{os.path.getsize(path) / 2**20:.1f} MiB")
+
+        with BreachFilter(path) as breached:
+            for name, fmt in (("present", "leaked-{}"), ("absent", "fresh-{}")):
+                candidates = [fmt.format(i) for i in range(args.lookups)]
+                start = time.perf_counter()
+                hits = sum(p in breached for p in candidates)
+                elapsed = time.perf_counter() - start
+                print(f"lookup {name:<7}: {elapsed / args.lookups * 1e6:6.2f} us each, "
+                      f"{hits:,} hits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-password latency with on-demand os.urandom vs the pre-filled pool
+
+Usage: python benchmarks/bench_entropy.py [--count N] [--length L]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_generator import compile_charset, generate_password
+from password_generator.entropy import EntropyPool
+
+
+def measure(count, length, alphabet, randbytes):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        generate_password(length, alphabet, randbytes)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)], sum(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--length", type=int, default=16)
+    args = parser.parse_args()
+
+    alphabet = compile_charset()
+    pool = EntropyPool()
+    print(f"{args.count:,} single {args.length}-char passwords")
+    for name, source in (("os.urandom", os.urandom), ("EntropyPool", pool.read)):
+        p50, p99, total = measure(args.count, args.length, alphabet, source)
+        print(f"  {name:<12} p50 {p50 * 1e6:7.2f} us  p99 {p99 * 1e6:7.2f} us  "
+              f"{args.count / total:12,.0f} pw/s")
+    stats = pool.stats()
+    print(f"  pool: refills={stats['refills']} stalls={stats['stalls']} "
+          f"fill={stats['fill_level']:.0%}")
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: encrypted export throughput against plain generation, and peak memory
+
+Usage: python benchmarks/bench_export.py [--count N] [--length N] [--cipher NAME]
+"""
+
+import argparse
+import os
+import string
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_generator.export import (CIPHERS, DEFAULT_CHUNK_SIZE, EncryptedReader,
+                                       export_encrypted, new_key)
+from password_generator.streaming import iter_framed
+
+CHARSET = string.ascii_letters + string.digits + string.punctuation
+
+
+class CountingSink:
+    """Write-only file object that discards data"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=2_000_000)
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--cipher", choices=CIPHERS, default="aes-256-gcm")
+    args = parser.parse_args()
+    key = new_key()
+    mib = args.count * (args.length + 1) / 2 ** 20
+
+    # Same block size the export generates with, so only the encryption differs
+    per_block = DEFAULT_CHUNK_SIZE // (args.length + 1)
+
+    def generate_only():
+        sink = CountingSink()
+        for block in iter_framed(args.count, args.length, CHARSET, "newline", per_block):
+            sink.write(block)
+        return sink
+
+    def encrypted():
+        sink = CountingSink()
+        export_encrypted(sink, args.count, args.length, CHARSET, key, cipher=args.cipher)
+        return sink
+
+    export_encrypted(CountingSink(), 10_000, args.length, CHARSET, key, cipher=args.cipher)
+    print(f"{args.count:,} passwords of {args.length} chars ({mib:,.0f} MiB of plaintext)")
+    _, plain = timed(generate_only)
+    print(f"  {'generate only':<32}{args.count / plain:12,.0f} pw/s  {mib / plain:8,.1f} MiB/s")
+    sink, sealed = timed(encrypted)
+    print(f"  {'generate + ' + args.cipher:<32}{args.count / sealed:12,.0f} pw/s  "
+          f"{mib / sealed:8,.1f} MiB/s  ({sealed / plain - 1:+.0%} vs generate only)")
+
+    # Peak traced memory does not grow with the count
+    for count in (args.count // 10, args.count):
+        tracemalloc.start()
+        export_encrypted(CountingSink(), count, args.length, CHARSET, key, cipher=args.cipher)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  peak memory for {count:>12,} passwords: {peak / 1024:8,.0f} KiB")
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".bench_export.pwx")
+    try:
+        with open(path, "wb") as out:
+            export_encrypted(out, args.count, args.length, CHARSET, key, cipher=args.cipher)
+        with EncryptedReader(path, key) as reader:
+            last = reader.chunk_count - 1
+            _, seek = timed(lambda: reader.passwords(last))
+        print(f"  seek + decrypt chunk {last:,} of {reader.chunk_count:,}: {seek * 1e6:,.0f} us")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
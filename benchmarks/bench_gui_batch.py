@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark: event-loop responsiveness while a BatchJob generates on a worker thread
+
+Runs headless. The main thread plays the part of Tk's mainloop: a timer ticks
+every --poll-ms, drains finished chunks into a list (exactly what the GUI batch
+panel does) and records how late each tick fired. With a display available,
+the same numbers are shown in the batch panel's status line.
+
+Usage: python benchmarks/bench_gui_batch.py [--count N] [--length L] [--poll-ms MS]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_generator import compile_charset
+from password_generator.jobs import BatchJob
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--poll-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    interval = args.poll_ms / 1000
+    job = BatchJob(args.count, args.length, compile_charset())
+    results = []
+    lags = []
+    start = time.perf_counter()
+    job.start()
+    while True:
+        expected = time.perf_counter() + interval
+        time.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+        for chunk in job.drain():
+            results.extend(chunk)
+        if job.done and job.chunks.empty():
+            break
+    elapsed = time.perf_counter() - start
+
+    lags.sort()
+    print(f"{len(results):,} x {args.length}-char passwords in {elapsed:.2f}s "
+          f"({len(results) / elapsed:,.0f} pw/s) with the loop ticking every {args.poll_ms:g} ms")
+    print(f"  tick lag p50 {lags[len(lags) // 2] * 1000:6.2f} ms  "
+          f"p99 {lags[int(len(lags) * 0.99)] * 1000:6.2f} ms  max {lags[-1] * 1000:6.2f} ms "
+          f"over {len(lags)} ticks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: launching the CLI/GUI from demo.py in a new interpreter vs in-process
+
+Usage: python benchmarks/bench_launch.py [--runs N]
+
+The old launcher ran `os.system("python main.py")`: a cold interpreter that
+re-imports everything on every launch. The in-process launcher imports the
+tool module on first use, then reuses it. Import costs are read from
+`python -X importtime` (cumulative microseconds per top-level import); launch
+wall times are medians over --runs. The GUI module is only imported, never
+started, so no display is needed.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TOOLS = {"cli": "main", "gui": "gui_password_generator"}
+
+
+def importtime(code):
+    """Cumulative import time in microseconds of each top-level import in code"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=ROOT, check=True)
+    totals = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Top-level imports are indented by one space, nested ones by more
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            totals[name.strip()] = int(cumulative)
+    return totals
+
+
+def wall_ms(args, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], stdout=subprocess.DEVNULL, cwd=ROOT, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def in_process_ms(module):
+    """First and repeat launch cost inside an interpreter that already runs demo.py"""
+    code = ("import importlib, time, demo\n"
+            "start = time.perf_counter()\n"
+            f"importlib.import_module({module!r})\n"
+            "first = time.perf_counter() - start\n"
+            "start = time.perf_counter()\n"
+            f"importlib.import_module({module!r})\n"
+            "print(first * 1000, (time.perf_counter() - start) * 1000)")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=ROOT, check=True)
+    first, repeat = result.stdout.split()
+    return float(first), float(repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = wall_ms(["-c", "pass"], args.runs)
+    print(f"Bare interpreter startup: {baseline:.1f} ms (median of {args.runs})")
+    print(f"{'tool':<5}{'new interpreter':>18}{'cold imports':>15}"
+          f"{'in-process 1st':>17}{'imports after demo':>20}{'repeat':>10}")
+    for tool, module in TOOLS.items():
+        cold = wall_ms(["-c", f"import {module}"], args.runs)
+        cold_imports = importtime(f"import {module}")[module]
+        # What is still left to import once demo.py (and the shared library) is loaded
+        warm_imports = importtime(f"import demo; import {module}")[module]
+        first, repeat = in_process_ms(module)
+        print(f"{tool:<5}{cold:>15.1f} ms{cold_imports / 1000:>12.1f} ms"
+              f"{first:>14.1f} ms{warm_imports / 1000:>17.1f} ms{repeat * 1000:>7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
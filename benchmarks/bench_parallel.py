@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parallel batch generation throughput at 1, 2, 4 and N workers
+
+Usage: python benchmarks/bench_parallel.py [--count N] [--length L]
+"""
+
+import argparse
+import os
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_generator.parallel import default_workers, generate_parallel_buffer
+
+CHARSET = string.ascii_letters + string.digits + string.punctuation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000_000)
+    parser.add_argument("--length", type=int, default=16)
+    args = parser.parse_args()
+
+    cores = default_workers()
+    print(f"Generating {args.count:,} x {args.length}-char passwords on {cores} core(s)")
+    baseline = None
+    for workers in sorted({1, 2, 4, cores}):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Warm the pool so process start-up is not part of the timing
+            generate_parallel_buffer(workers, args.length, CHARSET, workers, pool)
+            start = time.perf_counter()
+            generate_parallel_buffer(args.count, args.length, CHARSET, workers, pool)
+            elapsed = time.perf_counter() - start
+        rate = args.count / elapsed
+        baseline = baseline or rate
+        print(f"  {workers:3d} worker(s): {rate:14,.0f} pw/s  (x{rate / baseline:.2f})")
+
+
+if __name__ == "__main__":
+    main()
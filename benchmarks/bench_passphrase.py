@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark: wordlist load time and passphrases/sec for the bundled and a 1M-word list
+
+Usage: python benchmarks/bench_passphrase.py [--words N] [--count N]
+"""
+
+import argparse
+import os
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_generator import generate_batch
+from password_generator.passphrase import DEFAULT_WORDLIST, PassphraseGenerator, Wordlist, build_wordlist
+
+
+def measure(path, words, count):
+    start = time.perf_counter()
+    wordlist = Wordlist(path)
+    wordlist[len(wordlist) // 2]
+    load = time.perf_counter() - start
+
+    generator = PassphraseGenerator(words, wordlist)
+    start = time.perf_counter()
+    generator.generate_batch(count)
+    elapsed = time.perf_counter() - start
+    print(f"  {os.path.basename(path):<16} {len(wordlist):>9,} words  load {load * 1000:6.3f} ms  "
+          f"{count / elapsed:10,.0f} phrases/s  ({generator.entropy_bits:.0f} bits)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=6, help="words per passphrase")
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--list-size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{args.count:,} passphrases of {args.words} words")
+    measure(DEFAULT_WORDLIST, args.words, args.count)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "million.pwwl")
+        # Random 10-letter "words" stand in for a large custom list
+        start = time.perf_counter()
+        build_wordlist(generate_batch(args.list_size, 10, string.ascii_lowercase), path)
+        print(f"  (built {args.list_size:,}-word list in {time.perf_counter() - start:.2f}s)")
+        measure(path, args.words, args.count)
+
+
+if __name__ == "__main__":
+    main()
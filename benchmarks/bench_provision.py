@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark: provisioning rows/sec and rows/sec per core, by worker count
+
+Usage: python benchmarks/bench_provision.py [--rows N] [--algorithm A] [--cost N]
+
+The default cost is the production one, so expect a few rows/sec per core;
+pass e.g. --cost 10000 to measure pipeline overhead instead of hashing.
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_generator.provision import ALGORITHMS, DEFAULT_COST, hash_password, provision
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=64)
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="pbkdf2_sha256")
+    parser.add_argument("--cost", type=int, help="work factor (default: production)")
+    parser.add_argument("--chunk-rows", type=int, default=8)
+    args = parser.parse_args()
+    cost = args.cost or DEFAULT_COST[args.algorithm]
+    cpus = os.cpu_count() or 1
+
+    hash_password("warm-up password", args.algorithm, cost)
+    samples = 5
+    start = time.perf_counter()
+    for _ in range(samples):
+        hash_password("sample password", args.algorithm, cost)
+    single = (time.perf_counter() - start) / samples
+    print(f"{args.algorithm} cost {cost:,}: {single * 1000:.1f} ms per hash "
+          f"(ceiling {1 / single:,.1f} rows/s per core)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "users.csv")
+        with open(source, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["user", "email"])
+            writer.writerows((f"user{i}", f"user{i}@example.org") for i in range(args.rows))
+
+        for workers in sorted({1, max(1, cpus // 2), cpus}):
+            dest = os.path.join(tmp, f"out{workers}.csv")
+            start = time.perf_counter()
+            provision(source, dest, algorithm=args.algorithm, cost=cost, workers=workers,
+                      chunk_rows=args.chunk_rows)
+            rate = args.rows / (time.perf_counter() - start)
+            print(f"  {workers:>3} worker(s)  {rate:10,.1f} rows/s  {rate / workers:10,.1f} rows/s/core")
+
+
+if __name__ == "__main__":
+    main()
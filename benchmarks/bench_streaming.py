@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming throughput and peak RSS for large output counts
+
+Each count runs in a fresh interpreter so its peak RSS is measured on its own.
+
+Usage: python benchmarks/bench_streaming.py [--counts 1000000 100000000] [--framing newline]
+"""
+
+import argparse
+import os
+import resource
+import string
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CHARSET = string.ascii_letters + string.digits + string.punctuation
+
+
+def run_child(count, length, framing):
+    """Stream count passwords to /dev/null and report rate and own peak RSS"""
+    from password_generator.streaming import write_stream
+
+    with open(os.devnull, 'wb') as out:
+        start = time.perf_counter()
+        write_stream(out, count, length, CHARSET, framing)
+        elapsed = time.perf_counter() - start
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{elapsed} {peak_kib}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10**6, 10**8])
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--framing", default="newline")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        run_child(args.child, args.length, args.framing)
+        return
+
+    print(f"Streaming {args.length}-char passwords, {args.framing} framing")
+    for count in args.counts:
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", str(count),
+             "--length", str(args.length), "--framing", args.framing],
+            capture_output=True, text=True, check=True,
+        )
+        elapsed, peak_kib = result.stdout.split()
+        elapsed = float(elapsed)
+        print(f"  {count:>13,}: {elapsed:9.2f}s  {count / elapsed:14,.0f} pw/s  "
+              f"peak RSS {int(peak_kib) / 1024:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
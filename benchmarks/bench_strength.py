@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark: strength scoring throughput for single passwords and credential dumps
+
+Usage: python benchmarks/bench_strength.py [--count N] [--length L]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_generator import compile_charset, generate_batch
+from password_generator.strength import assess, score_batch, score_lines
+
+
+def report(name, count, elapsed):
+    print(f"  {name:<22} {elapsed:8.3f}s  {count / elapsed:14,.0f} passwords/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--length", type=int, default=12)
+    args = parser.parse_args()
+
+    passwords = generate_batch(args.count, args.length, compile_charset())
+    dump = ("\n".join(passwords) + "\n").encode()
+    print(f"Scoring {args.count:,} x {args.length}-char passwords")
+
+    start = time.perf_counter()
+    for password in passwords:
+        assess(password)
+    report("assess() per password", args.count, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    score_batch(passwords)
+    report("score_batch(list)", args.count, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    score_lines(dump)
+    report("score_lines(bytes)", args.count, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
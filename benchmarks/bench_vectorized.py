@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark: NumPy fixed-width backend vs the pure-Python bulk engine
+
+Usage: python benchmarks/bench_vectorized.py [--count N] [--length L] [--output PATH]
+"""
+
+import argparse
+import os
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_generator import generate_batch
+from password_generator.vectorized import generate_array, have_numpy, write_passwords
+
+CHARSET = string.ascii_letters + string.digits + string.punctuation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000_000)
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--output", default=os.devnull)
+    args = parser.parse_args()
+
+    print(f"NumPy backend available: {have_numpy()}")
+    print(f"Generating {args.count:,} x {args.length}-char passwords")
+
+    start = time.perf_counter()
+    generate_batch(args.count, args.length, CHARSET)
+    elapsed = time.perf_counter() - start
+    print(f"  generate_batch (list[str]) : {elapsed:8.3f}s  {args.count / elapsed:14,.0f} pw/s")
+
+    start = time.perf_counter()
+    generate_array(args.count, args.length, CHARSET)
+    elapsed = time.perf_counter() - start
+    print(f"  generate_array (S{args.length})     : {elapsed:8.3f}s  {args.count / elapsed:14,.0f} pw/s")
+
+    start = time.perf_counter()
+    write_passwords(args.output, args.count, args.length, CHARSET)
+    elapsed = time.perf_counter() - start
+    print(f"  write_passwords -> {args.output}: {elapsed:8.3f}s  {args.count / elapsed:14,.0f} pw/s")
+
+
+if __name__ == "__main__":
+    main()
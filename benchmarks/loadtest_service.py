@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Load test: p50/p99 latency of the local password service under concurrency
+
+Starts `python -m password_generator.service` on a free localhost port, then
+drives it with keep-alive asyncio clients at each concurrency level.
+
+Usage: python benchmarks/loadtest_service.py [--requests 2000] [--concurrency 1 8 32 64]
+                                            [--query "length=16&count=1"]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def client(port, path, count, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode()
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            length = 0
+            status = await reader.readline()
+            while True:
+                line = await reader.readline()
+                if line == b"\r\n":
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if b" 200 " not in status:
+                raise RuntimeError(f"unexpected response: {status!r}")
+    finally:
+        writer.close()
+
+
+async def run_level(port, path, total, concurrency):
+    latencies = []
+    per_client = max(1, total // concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, path, per_client, latencies) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(latencies) / elapsed, percentile(latencies, 0.50), percentile(latencies, 0.99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--query", default="length=16&count=1")
+    args = parser.parse_args()
+
+    server = subprocess.Popen([sys.executable, "-m", "password_generator.service", "--port", "0"],
+                              cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(server.stdout.readline().rsplit(":", 1)[1])
+        path = f"/generate?{args.query}"
+        print(f"GET {path} x {args.requests} per level")
+        print(f"  {'clients':>7}  {'req/s':>10}  {'p50 ms':>8}  {'p99 ms':>8}")
+        for concurrency in args.concurrency:
+            rate, p50, p99 = asyncio.run(run_level(port, path, args.requests, concurrency))
+            print(f"  {concurrency:>7}  {rate:>10,.0f}  {p50 * 1000:>8.2f}  {p99 * 1000:>8.2f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: reproducible timings with JSON baselines and a regression gate
+
+Covers single and batch generation (by length, charset size and count),
+the same call with instrumentation disabled, strength scoring, charset
+building, importing the core and CLI startup. Every case reports
+throughput, per-call latency percentiles and peak memory (traced Python
+allocations; the child's max RSS for the import and CLI cases). Runs
+headless: nothing here touches tkinter, the clipboard or a display.
+
+Usage:
+    python benchmarks/suite.py --save benchmarks/baseline.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json [--tolerance 0.25]
+
+With --baseline the run exits with status 1 if any case is slower (lower
+throughput or higher median latency) or uses more memory than the baseline
+allows.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import string
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from password_generator import (build_charset, compile_charset, generate_batch, generate_password,
+                                metrics)
+from password_generator.strength import assess, score_batch
+
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_MEMORY_TOLERANCE = 0.10
+# Allocator noise below this many KiB is never reported as a memory regression
+MEMORY_SLACK_KIB = 64
+
+CHARSETS = {
+    10: string.digits,
+    62: string.ascii_letters + string.digits,
+    94: string.ascii_letters + string.digits + string.punctuation,
+}
+
+# items: results produced per call (throughput is items/s); min_calls: samples to collect
+Case = namedtuple("Case", "name unit items func min_calls memory", defaults=(20, None))
+
+
+def _run_child(*args):
+    """Run a fresh interpreter to completion and return its max RSS in KiB"""
+    proc = subprocess.Popen([sys.executable, *args], stdout=subprocess.DEVNULL, cwd=ROOT)
+    _, status, usage = os.wait4(proc.pid, 0)
+    if os.waitstatus_to_exitcode(status):
+        raise RuntimeError(f"{args} exited with status {os.waitstatus_to_exitcode(status)}")
+    return usage.ru_maxrss
+
+
+CLI_ARGS = (os.path.join(ROOT, "main.py"), "--length", "12")
+IMPORT_ARGS = ("-c", "import password_generator.core")
+
+
+def build_cases():
+    """The benchmark matrix; names are stable keys in the baseline file"""
+    cases = []
+    for length in (8, 16, 64):
+        for size, chars in CHARSETS.items():
+            alphabet = compile_charset(include=chars, uppercase=False, lowercase=False,
+                                       digits=False, symbols=False)
+            cases.append(Case(f"generate/single/len{length}/chars{size}", "pw/s", 1,
+                              lambda a=alphabet, n=length: generate_password(n, a)))
+
+    # The CLI/GUI call path with instrumentation disabled; should match len16/chars94
+    alphabet = compile_charset()
+
+    def instrumented_off():
+        with metrics.stage("mapping"):
+            generate_password(16, alphabet, metrics.entropy_source())
+
+    cases.append(Case("generate/single/len16/chars94/metrics_off", "pw/s", 1, instrumented_off))
+    for count in (1_000, 100_000):
+        alphabet = compile_charset()
+        cases.append(Case(f"generate/batch/len16/chars94/n{count}", "pw/s", count,
+                          lambda a=alphabet, n=count: generate_batch(n, 16, a), min_calls=5))
+    passwords = generate_batch(10_000, 16, compile_charset())
+    cases += [
+        Case("strength/assess", "pw/s", 1, lambda: assess("xQ7#pL2@vR9!")),
+        Case("strength/score_batch/n10000", "pw/s", 10_000, lambda: score_batch(passwords),
+             min_calls=5),
+        Case("charset/build", "sets/s", 1,
+             lambda: build_charset(exclude_similar=True, exclude_ambiguous=True)),
+        Case("charset/compile_cached", "sets/s", 1, lambda: compile_charset()),
+        Case("import/core", "runs/s", 1, lambda: _run_child(*IMPORT_ARGS), min_calls=10,
+             memory=lambda: _run_child(*IMPORT_ARGS)),
+        Case("cli/startup", "runs/s", 1, lambda: _run_child(*CLI_ARGS), min_calls=10,
+             memory=lambda: _run_child(*CLI_ARGS)),
+    ]
+    return cases
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def traced_peak_kib(func):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(case, min_time):
+    """Time calls until both min_calls and min_time are reached"""
+    case.func()  # warm caches and imports
+    gc.collect()
+    samples = []
+    clock = time.perf_counter
+    deadline = clock() + min_time
+    while len(samples) < case.min_calls or clock() < deadline:
+        start = clock()
+        case.func()
+        samples.append(clock() - start)
+    samples.sort()
+    return {
+        "unit": case.unit,
+        "calls": len(samples),
+        "throughput": case.items * len(samples) / sum(samples),
+        "p50_us": percentile(samples, 0.50) * 1e6,
+        "p95_us": percentile(samples, 0.95) * 1e6,
+        "p99_us": percentile(samples, 0.99) * 1e6,
+        "peak_kib": case.memory() if case.memory else traced_peak_kib(case.func),
+    }
+
+
+def run_suite(only=None, min_time=0.2, report=print):
+    results = {}
+    for case in build_cases():
+        if only and not any(pattern in case.name for pattern in only):
+            continue
+        results[case.name] = result = run_case(case, min_time)
+        report(f"  {case.name:<42} {result['throughput']:>14,.0f} {case.unit:<7}"
+               f" p50 {result['p50_us']:>10.1f} us  p99 {result['p99_us']:>10.1f} us"
+               f"  peak {result['peak_kib']:>9,.0f} KiB")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE,
+            memory_tolerance=DEFAULT_MEMORY_TOLERANCE):
+    """Return a list of human-readable regressions of current against baseline"""
+    regressions = []
+    for name, base in baseline["results"].items():
+        cur = current["results"].get(name)
+        if cur is None:
+            continue
+        if cur["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {cur['throughput']:,.0f} < "
+                               f"baseline {base['throughput']:,.0f} {base['unit']}")
+        if cur["p50_us"] > base["p50_us"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {cur['p50_us']:.1f} us > "
+                               f"baseline {base['p50_us']:.1f} us")
+        allowed = base["peak_kib"] * (1 + memory_tolerance) + MEMORY_SLACK_KIB
+        if cur["peak_kib"] > allowed:
+            regressions.append(f"{name}: peak {cur['peak_kib']:,.0f} KiB > "
+                               f"baseline {base['peak_kib']:,.0f} KiB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float,
+                        help="allowed slowdown as a fraction (default: the baseline's, "
+                             f"else {DEFAULT_TOLERANCE})")
+    parser.add_argument("--memory-tolerance", type=float,
+                        help=f"allowed peak-memory growth (default {DEFAULT_MEMORY_TOLERANCE})")
+    parser.add_argument("--only", nargs="+", help="run cases whose name contains any of these")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per case")
+    args = parser.parse_args(argv)
+
+    print(f"Python {platform.python_version()} on {platform.platform()}, "
+          f"{os.cpu_count()} CPU(s)")
+    current = run_suite(args.only, args.min_time)
+
+    if args.save:
+        current["tolerance"] = args.tolerance if args.tolerance is not None else DEFAULT_TOLERANCE
+        current["memory_tolerance"] = (args.memory_tolerance if args.memory_tolerance is not None
+                                       else DEFAULT_MEMORY_TOLERANCE)
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print(f"💾 Saved baseline to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        tolerance = args.tolerance
+        if tolerance is None:
+            tolerance = baseline.get("tolerance", DEFAULT_TOLERANCE)
+        memory_tolerance = args.memory_tolerance
+        if memory_tolerance is None:
+            memory_tolerance = baseline.get("memory_tolerance", DEFAULT_MEMORY_TOLERANCE)
+        regressions = compare(current, baseline, tolerance, memory_tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) beyond {tolerance:.0%} tolerance:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"✅ No regressions beyond {tolerance:.0%} tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,19 @@ Demonstration script for the Random Password Generator
 Shows examples of both command-line and GUI functionality
 """
 
-import random
-import string
+import importlib
 import sys
-import os
+
+from password_generator import Generator, PasswordPolicy
+from password_generator.keyspace import CodeSequence, new_key
+
+# Tools the demo can launch: name -> (module, entry point). Each module is
+# imported the first time it is launched, so the demo starts without tkinter,
+# and later launches reuse the loaded modules, charset cache and entropy pool.
+LAUNCHERS = {
+    "cli": ("main", "run_interactive"),
+    "gui": ("gui_password_generator", "main"),
+}
 
 def demo_password_generation():
     """Demonstrate password generation with different settings"""
@@ -19,27 +28,24 @@ def demo_password_generation():
     configs = [
         {
             "name": "🔒 Basic Security (8 chars, letters + numbers)",
-            "length": 8,
-            "chars": string.ascii_letters + string.digits,
+            "policy": PasswordPolicy(8, symbols=False),
             "count": 3
         },
         {
             "name": "🛡️ High Security (12 chars, all types)",
-            "length": 12,
-            "chars": string.ascii_letters + string.digits + string.punctuation,
+            "policy": PasswordPolicy(12),
             "count": 3
         },
         {
             "name": "🏰 Maximum Security (16 chars, all types)",
-            "length": 16,
-            "chars": string.ascii_letters + string.digits + string.punctuation,
+            "policy": PasswordPolicy(16),
             "count": 3
         },
         {
             "name": "📱 PIN Code (4 digits)",
-            "length": 4,
-            "chars": string.digits,
-            "count": 5
+            "policy": PasswordPolicy(4, uppercase=False, lowercase=False, symbols=False),
+            "count": 5,
+            "unique": True
         }
     ]
     
@@ -47,40 +53,29 @@ def demo_password_generation():
         print(f"{config['name']}")
         print("-" * len(config['name']))
         
-        for i in range(config['count']):
-            password = ''.join(random.choice(config['chars']) for _ in range(config['length']))
-            strength = calculate_demo_strength(password, config['chars'])
+        generator = Generator(config['policy'])
+        if config.get('unique'):
+            # Short codes are issued without replacement so they never repeat
+            sequence = CodeSequence(new_key(), generator.alphabet, generator.length)
+            passwords = list(sequence.iter_codes(0, config['count']))
+        else:
+            passwords = generator.generate_batch(config['count'])
+        for i, password in enumerate(passwords):
+            strength = calculate_demo_strength(password, generator)
             print(f"  {i+1}. {password} ({strength})")
         
         print()
 
-def calculate_demo_strength(password, charset):
-    """Calculate strength for demo purposes"""
-    length = len(password)
-    has_letters = any(c in string.ascii_letters for c in charset)
-    has_numbers = any(c in string.digits for c in charset)
-    has_symbols = any(c in string.punctuation for c in charset)
-    
-    char_types = sum([has_letters, has_numbers, has_symbols])
-    
-    if length < 6:
-        return "Very Weak"
-    elif length < 8:
-        return "Weak"
-    elif length < 12:
-        if char_types >= 3:
-            return "Strong"
-        elif char_types >= 2:
-            return "Moderate"
-        else:
-            return "Weak"
-    else:
-        if char_types >= 3:
-            return "Very Strong"
-        elif char_types >= 2:
-            return "Strong"
-        else:
-            return "Moderate"
+def launch(tool):
+    """Run a tool in this process, importing its module on first use"""
+    module_name, entry_point = LAUNCHERS[tool]
+    module = importlib.import_module(module_name)
+    return getattr(module, entry_point)()
+
+def calculate_demo_strength(password, generator):
+    """Calculate strength for demo purposes from the generating charset's entropy"""
+    bits, label = generator.assess(password)
+    return f"{label}, {bits:.0f} bits"
 
 def show_features():
     """Show available features"""
@@ -173,10 +168,10 @@ def main():
                 show_usage_examples()
             elif choice == '4':
                 print("🏃 Launching command-line version...")
-                os.system("python main.py")
+                launch("cli")
             elif choice == '5':
                 print("🖥️ Launching GUI version...")
-                os.system("python gui_password_generator.py")
+                launch("gui")
             elif choice == '6':
                 print("👋 Thanks for using the Random Password Generator!")
                 break
@@ -185,7 +180,7 @@ def main():
             
             print()
             
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
             print("\n\n👋 Thanks for using the Random Password Generator!")
             break
         except Exception as e:
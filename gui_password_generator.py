@@ -1,14 +1,21 @@
+import time
 import tkinter as tk
-from tkinter import messagebox, ttk
-import random
-import string
-import pyperclip
+from tkinter import filedialog, messagebox, simpledialog, ttk
+
+from password_generator import Generator, PasswordPolicy, metrics
+from password_generator.breach import default_filter
+from password_generator.entropy import default_pool
+from password_generator.jobs import BatchJob
+from password_generator.markov import MarkovGenerator
+from password_generator.passphrase import PassphraseGenerator
+from password_generator.policy import CLASS_CHARS, ConstrainedGenerator
+from password_generator.strength import Strength, assess, rate_bits
 
 class PasswordGeneratorGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("🔐 Random Password Generator")
-        self.root.geometry("450x500")
+        self.root.geometry("450x800")
         self.root.resizable(False, False)
         
         # Configure style
@@ -82,10 +89,58 @@ class PasswordGeneratorGUI:
         ttk.Checkbutton(advanced_frame, text="🚫 Exclude ambiguous symbols ({ } [ ] ( ) / \\ ' \" ~ , ; . < >)", 
                        variable=self.exclude_ambiguous_var).grid(row=1, column=0, sticky=tk.W, pady=2)
         
+        self.no_repeats_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(advanced_frame, text="🔁 No repeated characters in a row (aa)", 
+                       variable=self.no_repeats_var).grid(row=2, column=0, sticky=tk.W, pady=2)
+        
+        self.no_sequences_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(advanced_frame, text="📶 No 3-character sequences (abc, 321)", 
+                       variable=self.no_sequences_var).grid(row=3, column=0, sticky=tk.W, pady=2)
+        
         # Generate Button
         generate_btn = ttk.Button(main_frame, text="🎲 Generate Password", 
                                 command=self.generate_password, style='Generate.TButton')
-        generate_btn.grid(row=4, column=0, columnspan=2, pady=(0, 15), sticky=(tk.W, tk.E))
+        generate_btn.grid(row=4, column=0, columnspan=2, pady=(0, 5), sticky=(tk.W, tk.E))
+        
+        batch_btn = ttk.Button(main_frame, text="📦 Batch Generate...", 
+                             command=self.open_batch_panel)
+        batch_btn.grid(row=7, column=0, columnspan=2, pady=(0, 15), sticky=(tk.W, tk.E))
+        
+        # Passphrase Section
+        phrase_frame = ttk.LabelFrame(main_frame, text="Passphrase", padding="10")
+        phrase_frame.grid(row=8, column=0, columnspan=2, sticky=(tk.W, tk.E))
+        
+        ttk.Label(phrase_frame, text="Words:").grid(row=0, column=0, sticky=tk.W)
+        self.words_var = tk.StringVar(value="6")
+        ttk.Spinbox(phrase_frame, from_=1, to=32, width=5, 
+                   textvariable=self.words_var).grid(row=0, column=1, padx=(5, 15), sticky=tk.W)
+        ttk.Label(phrase_frame, text="Separator:").grid(row=0, column=2, sticky=tk.W)
+        self.separator_var = tk.StringVar(value="-")
+        ttk.Entry(phrase_frame, width=4, 
+                 textvariable=self.separator_var).grid(row=0, column=3, padx=(5, 0), sticky=tk.W)
+        
+        self.capitalize_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(phrase_frame, text="🔠 Capitalize words", 
+                       variable=self.capitalize_var).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=2)
+        self.phrase_number_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(phrase_frame, text="🔢 Add a number", 
+                       variable=self.phrase_number_var).grid(row=1, column=2, columnspan=2, sticky=tk.W, pady=2)
+        
+        ttk.Button(phrase_frame, text="🗝️ Generate Passphrase", 
+                  command=self.generate_passphrase).grid(row=2, column=0, columnspan=4, 
+                                                          pady=(5, 0), sticky=(tk.W, tk.E))
+        
+        # Pronounceable Section
+        speak_frame = ttk.LabelFrame(main_frame, text="Pronounceable", padding="10")
+        speak_frame.grid(row=9, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(15, 0))
+        
+        self.speak_capitalize_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(speak_frame, text="🔠 Capitalize first letter", 
+                       variable=self.speak_capitalize_var).grid(row=0, column=0, sticky=tk.W, pady=2)
+        ttk.Button(speak_frame, text="🗣️ Generate Pronounceable", 
+                  command=self.generate_pronounceable).grid(row=1, column=0, pady=(5, 0), 
+                                                             sticky=(tk.W, tk.E))
+        speak_frame.columnconfigure(0, weight=1)
         
         # Result Section
         result_frame = ttk.LabelFrame(main_frame, text="Generated Password", padding="10")
@@ -128,82 +183,80 @@ class PasswordGeneratorGUI:
     def generate_password(self):
         """Generate a password based on user settings"""
         try:
-            # Get password length
-            length = int(self.length_var.get())
-            if length <= 0:
-                raise ValueError("Password length must be positive")
+            # Get password length (the policy rejects lengths below 1)
+            policy = self.current_policy(int(self.length_var.get()))
             
             # Build character set
-            characters = ""
-            
-            if self.uppercase_var.get():
-                characters += string.ascii_uppercase
-            if self.lowercase_var.get():
-                characters += string.ascii_lowercase
-            if self.numbers_var.get():
-                characters += string.digits
-            if self.symbols_var.get():
-                characters += string.punctuation
-            
-            # Apply exclusions
-            if self.exclude_similar_var.get():
-                similar_chars = "0Ol1I"
-                characters = ''.join(c for c in characters if c not in similar_chars)
-            
-            if self.exclude_ambiguous_var.get():
-                ambiguous_chars = "{}[]()/'\"~,;.<>"
-                characters = ''.join(c for c in characters if c not in ambiguous_chars)
+            with metrics.stage("charset_build"):
+                characters = policy.alphabet()
             
             # Validate character set
             if not characters:
                 messagebox.showwarning("Selection Error", 
                                      "Please select at least one character type!")
                 return
+            generator = Generator(policy)
             
-            # Generate password
-            password = ''.join(random.choice(characters) for _ in range(length))
+            # Generate password containing every ticked character type
+            with metrics.stage("mapping"):
+                password = self.constrained_generator(policy.length, generator.alphabet).generate()
             
             # Display password
-            self.result_var.set(password)
+            with metrics.stage("output"):
+                self.result_var.set(password)
             
             # Update strength indicator
-            strength = self.calculate_strength(password)
+            with metrics.stage("strength"):
+                strength = self.calculate_strength(password, generator)
             self.update_strength_display(strength)
             
         except ValueError as e:
             messagebox.showerror("Invalid Input", 
                                f"Please enter a valid positive number for length!\nError: {e}")
 
-    def calculate_strength(self, password):
-        """Calculate password strength"""
-        length = len(password)
-        has_upper = any(c.isupper() for c in password)
-        has_lower = any(c.islower() for c in password)
-        has_digit = any(c.isdigit() for c in password)
-        has_symbol = any(c in string.punctuation for c in password)
-        
-        # Count character types
-        char_types = sum([has_upper, has_lower, has_digit, has_symbol])
-        
-        # Calculate strength
-        if length < 8:
-            return "Weak"
-        elif length < 12:
-            if char_types >= 3:
-                return "Strong"
-            elif char_types >= 2:
-                return "Moderate"
-            else:
-                return "Weak"
-        else:  # length >= 12
-            if char_types >= 4:
-                return "Very Strong"
-            elif char_types >= 3:
-                return "Strong"
-            elif char_types >= 2:
-                return "Moderate"
-            else:
-                return "Weak"
+    def generate_passphrase(self):
+        """Generate a passphrase of random words from the bundled wordlist"""
+        try:
+            generator = PassphraseGenerator(
+                int(self.words_var.get()),
+                separator=self.separator_var.get(),
+                capitalize="first" if self.capitalize_var.get() else "none",
+                digits=2 if self.phrase_number_var.get() else 0,
+                randbytes=default_pool().read,
+            )
+        except ValueError as e:
+            messagebox.showerror("Invalid Input", 
+                               f"Please enter a valid positive number of words!\nError: {e}")
+            return
+        
+        self.result_var.set(generator.generate())
+        # Rate the passphrase by how it was made, not by its characters
+        bits = generator.entropy_bits
+        self.update_strength_display(Strength(bits, rate_bits(bits)))
+
+    def generate_pronounceable(self):
+        """Generate an easy-to-type password from the trigram model, using the chosen length"""
+        try:
+            generator = MarkovGenerator(
+                int(self.length_var.get()),
+                capitalize=self.speak_capitalize_var.get(),
+                randbytes=default_pool().read,
+            )
+        except ValueError as e:
+            messagebox.showerror("Invalid Input", 
+                               f"Please enter a valid positive number for length!\nError: {e}")
+            return
+        
+        self.result_var.set(generator.generate())
+        # Rated by the model's min-entropy: the likeliest outputs are what a guesser tries first
+        bits = generator.min_entropy_bits
+        self.update_strength_display(Strength(bits, rate_bits(bits)))
+
+    def calculate_strength(self, password, generator=None):
+        """Calculate password strength as bits of entropy plus a rating, screening known-bad passwords"""
+        if generator is None:
+            return assess(password, breached=default_filter())
+        return generator.assess(password, default_filter())
 
     def update_strength_display(self, strength):
         """Update the strength indicator with color coding"""
@@ -211,24 +264,31 @@ class PasswordGeneratorGUI:
             "Very Strong": "green",
             "Strong": "blue",
             "Moderate": "orange",
-            "Weak": "red"
+            "Weak": "red",
+            "Very Weak": "dark red",
+            "Breached": "dark red"
         }
         
         icons = {
             "Very Strong": "🛡️",
             "Strong": "🔒",
             "Moderate": "⚠️",
-            "Weak": "❌"
+            "Weak": "❌",
+            "Very Weak": "❌",
+            "Breached": "🚨"
         }
         
-        self.strength_var.set(f"{icons.get(strength, '❓')} Password Strength: {strength}")
-        self.strength_label.configure(foreground=colors.get(strength, "black"))
+        bits, label = strength
+        self.strength_var.set(f"{icons.get(label, '❓')} Password Strength: {label} ({bits:.0f} bits)")
+        self.strength_label.configure(foreground=colors.get(label, "black"))
 
     def copy_password(self):
         """Copy the generated password to clipboard"""
         password = self.result_var.get()
         if password:
             try:
+                import pyperclip  # only needed for the clipboard, so loaded on first copy
+
                 pyperclip.copy(password)
                 messagebox.showinfo("Success", "Password copied to clipboard! 📋")
             except Exception as e:
@@ -241,15 +301,284 @@ class PasswordGeneratorGUI:
         self.result_var.set("")
         self.strength_var.set("")
 
+    def current_policy(self, length=16):
+        """PasswordPolicy for the ticked options"""
+        return PasswordPolicy(
+            length,
+            uppercase=self.uppercase_var.get(),
+            lowercase=self.lowercase_var.get(),
+            digits=self.numbers_var.get(),
+            symbols=self.symbols_var.get(),
+            exclude_similar=self.exclude_similar_var.get(),
+            exclude_ambiguous=self.exclude_ambiguous_var.get(),
+        )
+
+    def constrained_generator(self, length, characters=None):
+        """ConstrainedGenerator for the ticked options, shared with the batch panel
+
+        Every ticked character type appears at least once and the repeat and
+        sequence rules apply. Returns None when no character type is ticked.
+        """
+        if characters is None:
+            characters = self.current_policy(length).alphabet()
+        if not characters:
+            return None
+        required = {
+            "upper": self.uppercase_var.get(),
+            "lower": self.lowercase_var.get(),
+            "digits": self.numbers_var.get(),
+            "symbols": self.symbols_var.get(),
+        }
+        return ConstrainedGenerator(
+            length, characters,
+            min_counts={name: 1 for name, ticked in required.items()
+                        if ticked and any(c in CLASS_CHARS[name] for c in characters.chars)},
+            no_repeats=self.no_repeats_var.get(),
+            no_sequences=self.no_sequences_var.get(),
+            randbytes=metrics.entropy_source(default_pool().read),
+        )
+
+    def open_batch_panel(self):
+        """Open the batch generation window"""
+        BatchPanel(self.root, self.constrained_generator, self.length_var.get())
+
+
+class VirtualList(ttk.Frame):
+    """A listbox that only ever holds the rows on screen, so millions of items scroll instantly"""
+
+    def __init__(self, master, rows=15):
+        super().__init__(master)
+        self.items = []
+        self.rows = rows
+        self.offset = 0
+        self.listbox = tk.Listbox(self, height=rows, width=48, font=('Courier', 10),
+                                  activestyle='none')
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.columnconfigure(0, weight=1)
+        # Wheel events scroll our offset, not the (tiny) listbox contents
+        self.listbox.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.listbox.bind('<Button-4>', lambda e: self.scroll(-1))
+        self.listbox.bind('<Button-5>', lambda e: self.scroll(1))
+
+    def set_items(self, items):
+        self.items = items
+        self.offset = 0
+        self.refresh()
+
+    def scroll(self, steps):
+        self.offset += steps * 3
+        self.refresh()
+        return 'break'
+
+    def yview(self, *args):
+        """Scrollbar callback: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * len(self.items))
+        elif args[0] == 'scroll':
+            step = self.rows if args[2] == 'pages' else 1
+            self.offset += int(args[1]) * step
+        self.refresh()
+
+    def refresh(self):
+        """Redraw the visible window; cheap enough to call after every appended chunk"""
+        total = len(self.items)
+        self.offset = max(0, min(self.offset, total - self.rows))
+        visible = self.items[self.offset:self.offset + self.rows]
+        self.listbox.delete(0, tk.END)
+        if visible:
+            self.listbox.insert(tk.END, *(f"{i:>9}  {pw}" for i, pw in
+                                          enumerate(visible, self.offset + 1)))
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+
+class BatchPanel:
+    """Generate up to millions of passwords without freezing the window"""
+
+    POLL_MS = 50
+
+    def __init__(self, master, generator_factory, length):
+        self.generator_factory = generator_factory
+        self.job = None
+        self.pending = None
+        self.results = []
+        self.lags = []
+
+        self.window = tk.Toplevel(master)
+        self.window.title("📦 Batch Generate")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        frame = ttk.Frame(self.window, padding="10")
+        frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        ttk.Label(frame, text="Count:").grid(row=0, column=0, sticky=tk.W)
+        self.count_var = tk.StringVar(value="100000")
+        ttk.Spinbox(frame, from_=1, to=10_000_000, increment=1000, width=10,
+                    textvariable=self.count_var).grid(row=0, column=1, sticky=tk.W, padx=(5, 15))
+        ttk.Label(frame, text="Length:").grid(row=0, column=2, sticky=tk.W)
+        self.length_var = tk.StringVar(value=length)
+        ttk.Spinbox(frame, from_=1, to=4096, width=6,
+                    textvariable=self.length_var).grid(row=0, column=3, sticky=tk.W, padx=(5, 0))
+
+        self.start_btn = ttk.Button(frame, text="🎲 Start", command=self.start)
+        self.start_btn.grid(row=1, column=0, columnspan=2, pady=8, sticky=(tk.W, tk.E))
+        self.cancel_btn = ttk.Button(frame, text="⛔ Cancel", command=self.cancel, state='disabled')
+        self.cancel_btn.grid(row=1, column=2, columnspan=2, pady=8, sticky=(tk.W, tk.E))
+
+        self.progress = ttk.Progressbar(frame, mode='determinate', maximum=1)
+        self.progress.grid(row=2, column=0, columnspan=4, sticky=(tk.W, tk.E))
+        self.status_var = tk.StringVar(value="Ready")
+        ttk.Label(frame, textvariable=self.status_var).grid(row=3, column=0, columnspan=4,
+                                                            sticky=tk.W, pady=(2, 8))
+
+        self.list = VirtualList(frame)
+        self.list.grid(row=4, column=0, columnspan=4, sticky=(tk.W, tk.E))
+        self.list.set_items(self.results)
+
+        ttk.Button(frame, text="📋 Copy All", command=self.copy_all).grid(
+            row=5, column=0, columnspan=2, pady=(8, 0), sticky=(tk.W, tk.E))
+        ttk.Button(frame, text="💾 Export...", command=self.export).grid(
+            row=5, column=2, columnspan=2, pady=(8, 0), sticky=(tk.W, tk.E))
+        ttk.Button(frame, text="🔒 Export Encrypted...", command=self.export_encrypted).grid(
+            row=6, column=0, columnspan=4, pady=(8, 0), sticky=(tk.W, tk.E))
+
+    def start(self):
+        """Start a background job and begin polling it from the event loop"""
+        try:
+            count = int(self.count_var.get())
+            length = int(self.length_var.get())
+            generator = self.generator_factory(length)
+            if generator is None:
+                messagebox.showwarning("Selection Error",
+                                       "Please select at least one character type!",
+                                       parent=self.window)
+                return
+            self.job = BatchJob(count, length, generator.alphabet, generator=generator)
+        except ValueError as e:
+            messagebox.showerror("Invalid Input", f"Please enter valid numbers!\nError: {e}",
+                                 parent=self.window)
+            return
+        self.results = []
+        self.lags = []
+        self.list.set_items(self.results)
+        self.progress.configure(maximum=max(count, 1), value=0)
+        self.start_btn.configure(state='disabled')
+        self.cancel_btn.configure(state='normal')
+        self.started = time.perf_counter()
+        self.job.start()
+        self.schedule_poll()
+
+    def schedule_poll(self):
+        self.expected = time.perf_counter() + self.POLL_MS / 1000
+        self.pending = self.window.after(self.POLL_MS, self.poll)
+
+    def poll(self):
+        """Move finished chunks into the list; also records how late this tick ran"""
+        self.lags.append(max(0.0, time.perf_counter() - self.expected))
+        for chunk in self.job.drain():
+            self.results.extend(chunk)
+        self.list.refresh()
+        self.progress.configure(value=len(self.results))
+        elapsed = time.perf_counter() - self.started
+        if self.job.done and self.job.chunks.empty():
+            self.finish(elapsed)
+        else:
+            self.status_var.set(f"⏳ {len(self.results):,} / {self.job.count:,} "
+                                f"({elapsed:.1f}s)")
+            self.schedule_poll()
+
+    def finish(self, elapsed):
+        self.pending = None
+        self.start_btn.configure(state='normal')
+        self.cancel_btn.configure(state='disabled')
+        lags = sorted(self.lags)
+        worst = lags[-1] * 1000 if lags else 0.0
+        p99 = lags[int(len(lags) * 0.99)] * 1000 if lags else 0.0
+        if self.job.error:
+            self.status_var.set(f"❌ {self.job.error}")
+        else:
+            state = "⛔ Cancelled" if self.job.cancelled else "✅ Done"
+            self.status_var.set(f"{state}: {len(self.results):,} in {elapsed:.1f}s "
+                                f"(UI lag p99 {p99:.0f} ms, max {worst:.0f} ms)")
+
+    def cancel(self):
+        if self.job:
+            self.job.cancel()
+
+    def copy_all(self):
+        """Copy every generated password, one per line"""
+        if not self.results:
+            messagebox.showwarning("No Passwords", "Generate a batch first!", parent=self.window)
+            return
+        try:
+            import pyperclip
+
+            pyperclip.copy("\n".join(self.results))
+            messagebox.showinfo("Success", f"{len(self.results):,} passwords copied! 📋",
+                                parent=self.window)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to copy to clipboard: {e}", parent=self.window)
+
+    def export(self):
+        """Write every generated password to a text file, one per line"""
+        if not self.results:
+            messagebox.showwarning("No Passwords", "Generate a batch first!", parent=self.window)
+            return
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension=".txt",
+                                            filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            for start in range(0, len(self.results), 100_000):
+                f.write("\n".join(self.results[start:start + 100_000]))
+                f.write("\n")
+        self.status_var.set(f"💾 Saved {len(self.results):,} passwords to {path}")
+
+    def export_encrypted(self):
+        """Write every generated password to a passphrase-encrypted file (no plaintext on disk)"""
+        from password_generator.export import EncryptedWriter
+
+        if not self.results:
+            messagebox.showwarning("No Passwords", "Generate a batch first!", parent=self.window)
+            return
+        passphrase = simpledialog.askstring("Passphrase", "Passphrase for the export:",
+                                            show="*", parent=self.window)
+        if not passphrase:
+            return
+        if simpledialog.askstring("Passphrase", "Repeat the passphrase:",
+                                  show="*", parent=self.window) != passphrase:
+            messagebox.showerror("Error", "The passphrases do not match.", parent=self.window)
+            return
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension=".pwx",
+                                            filetypes=[("Encrypted exports", "*.pwx"),
+                                                       ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            with open(path, "wb") as f, EncryptedWriter(f, passphrase=passphrase) as writer:
+                for start in range(0, len(self.results), 100_000):
+                    writer.write(self.results[start:start + 100_000])
+        except (ImportError, OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Encrypted export failed: {e}", parent=self.window)
+            return
+        self.status_var.set(f"🔒 Saved {len(self.results):,} encrypted passwords to {path}")
+
+    def close(self):
+        self.cancel()
+        if self.pending:
+            self.window.after_cancel(self.pending)
+        self.window.destroy()
+
 def main():
     """Main function to run the GUI application"""
+    metrics.enable_from_env()
     try:
         root = tk.Tk()
         app = PasswordGeneratorGUI(root)
         root.mainloop()
-    except ImportError:
-        print("❌ Error: pyperclip library not found!")
-        print("Please install it using: pip install pyperclip")
     except Exception as e:
         print(f"❌ An error occurred: {e}")
 
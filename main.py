@@ -1,5 +1,10 @@
-import random
-import string
+import sys
+
+from password_generator import Generator, PasswordPolicy, metrics
+from password_generator.core import POLICY_TOKENS
+from password_generator.strength import assess
+
+OUTPUT_FORMATS = ("text", "nul", "csv", "json")
 
 def generate_password_cli():
     """
@@ -21,30 +26,30 @@ def generate_password_cli():
         use_numbers = input("Include numbers? (y/n): ").lower() == 'y'
         use_symbols = input("Include symbols? (y/n): ").lower() == 'y'
 
-        # Build character set based on user preferences
-        characters = ""
-        if use_letters:
-            characters += string.ascii_letters
-        if use_numbers:
-            characters += string.digits
-        if use_symbols:
-            characters += string.punctuation
-
         # Validate that at least one character type is selected
-        if not characters:
+        if not (use_letters or use_numbers or use_symbols):
             print("❌ You must select at least one character type!")
             return
 
+        # Compile the policy's character set once (cached per option set)
+        policy = PasswordPolicy(length, uppercase=use_letters, lowercase=use_letters,
+                                digits=use_numbers, symbols=use_symbols)
+        with metrics.stage("charset_build"):
+            generator = Generator(policy, metrics.entropy_source())
+
         # Generate password
-        password = ''.join(random.choice(characters) for _ in range(length))
+        with metrics.stage("mapping"):
+            password = generator.generate()
         
         # Display results
-        print("\n" + "=" * 40)
-        print(f"✅ Generated Password: {password}")
-        print("=" * 40)
+        with metrics.stage("output"):
+            print("\n" + "=" * 40)
+            print(f"✅ Generated Password: {password}")
+            print("=" * 40)
         
         # Show password strength info
-        strength = check_password_strength(password, use_letters, use_numbers, use_symbols)
+        with metrics.stage("strength"):
+            strength = check_password_strength(password, generator)
         print(f"🛡️  Password Strength: {strength}")
         
         # Ask if user wants to generate another password
@@ -52,38 +57,209 @@ def generate_password_cli():
         if another == 'y':
             print("\n")
             generate_password_cli()
+        # Passphrases come last so scripts piping answers into the prompts above keep working
+        elif input("Generate a passphrase of words? (y/n): ").lower() == 'y':
+            generate_passphrase_cli()
 
     except ValueError:
         print("❌ Invalid input! Please enter numeric values for length.")
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, EOFError):
         print("\n\n👋 Thanks for using Random Password Generator!")
 
-def check_password_strength(password, has_letters, has_numbers, has_symbols):
+def generate_passphrase_cli():
     """
-    Check the strength of the generated password
+    Interactive passphrase mode: random words from the bundled wordlist
     """
-    length = len(password)
-    
-    if length < 8:
-        return "Weak (too short)"
-    elif length >= 8 and length < 12:
-        if has_letters and has_numbers and has_symbols:
-            return "Strong"
-        elif (has_letters and has_numbers) or (has_letters and has_symbols):
-            return "Moderate"
-        else:
-            return "Weak (limited character types)"
-    else:  # length >= 12
-        if has_letters and has_numbers and has_symbols:
-            return "Very Strong"
-        elif (has_letters and has_numbers) or (has_letters and has_symbols):
-            return "Strong"
-        else:
-            return "Moderate"
+    from password_generator.passphrase import PassphraseGenerator
+    from password_generator.strength import rate_bits
+
+    words = int(input("Enter number of words (e.g. 6): "))
+    if words <= 0:
+        print("❌ Number of words must be positive.")
+        return
+    separator = input("Separator (default '-'): ") or "-"
+    capitalize = "first" if input("Capitalize words? (y/n): ").lower() == 'y' else "none"
+    digits = 2 if input("Add a number? (y/n): ").lower() == 'y' else 0
+
+    generator = PassphraseGenerator(words, separator=separator, capitalize=capitalize,
+                                    digits=digits)
+    passphrase = generator.generate()
+    bits = generator.entropy_bits
+    print("\n" + "=" * 40)
+    print(f"✅ Generated Passphrase: {passphrase}")
+    print("=" * 40)
+    print(f"🛡️  Passphrase Strength: {rate_bits(bits)} ({bits:.0f} bits)")
+
+def check_password_strength(password, generator=None):
+    """
+    Check the strength of the generated password from its entropy in bits,
+    after screening it against the local breached-password filter. With the
+    Generator that made it, its exact alphabet size is used.
+    """
+    from password_generator.breach import default_filter
+
+    if generator is None:
+        bits, label = assess(password, breached=default_filter())
+    else:
+        bits, label = generator.assess(password, default_filter())
+    return f"{label} ({bits:.0f} bits)"
+
+def build_arg_parser():
+    """Build the parser for the non-interactive, scriptable mode"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Generate random passwords. Run without arguments for interactive mode.")
+    parser.add_argument("--length", type=int, default=16, help="password length (default: 16)")
+    parser.add_argument("--count", type=int, default=1, help="number of passwords (default: 1)")
+    parser.add_argument("--charset", default="letters,digits,symbols",
+                        help="comma-separated classes from: " + ", ".join(POLICY_TOKENS)
+                             + " (default: letters,digits,symbols)")
+    parser.add_argument("--chars", help="explicit characters to draw from; overrides --charset")
+    parser.add_argument("--exclude-similar", action="store_true",
+                        help="exclude look-alike characters (0, O, l, 1, I)")
+    parser.add_argument("--exclude-ambiguous", action="store_true",
+                        help="exclude ambiguous symbols such as { } [ ] ( ) / \\ ' \" ~ , ; . < >")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="text",
+                        help="output framing: one per line, NUL-terminated, CSV or a JSON array")
+
+    seeded = parser.add_argument_group("deterministic mode (NOT SECRET: for load tests and fixtures)")
+    seeded.add_argument("--seed",
+                        help="regenerate the same passwords from this seed; anyone with the "
+                             "seed can too, so never use them as real credentials")
+    seeded.add_argument("--start", type=int,
+                        help="index of the first password, to split a seeded job (default: 0)")
+
+    phrases = parser.add_argument_group("passphrase mode")
+    phrases.add_argument("--words", type=int,
+                         help="generate passphrases of this many words instead of passwords")
+    phrases.add_argument("--wordlist", help="compiled wordlist file (default: bundled list)")
+    phrases.add_argument("--separator", default="-", help="word separator (default: -)")
+    phrases.add_argument("--capitalize", choices=("none", "first", "random"), default="none",
+                         help="capitalize no words, every word, or random words")
+    phrases.add_argument("--digits", type=int, default=0,
+                         help="append this many random digits to one random word")
+    return parser
+
+def _framed(out, chunks, output_format, start=0):
+    """Write chunks of passwords or passphrases in a delimited --format"""
+    from password_generator.streaming import frame_chunks
+
+    framing = "newline" if output_format == "text" else output_format
+    for block in frame_chunks(chunks, framing, start):
+        out.write(block)
+
+def write_seeded(out, args, alphabet):
+    """Write seeded passwords args.start .. args.start + args.count - 1, honouring --format"""
+    from password_generator.seeded import SeededGenerator
+
+    generator = SeededGenerator(args.seed, args.length, alphabet)
+    stop = args.start + args.count
+    if args.format == "json":
+        import json
+
+        out.write(json.dumps(generator.passwords(args.start, stop)).encode('utf-8') + b"\n")
+        return
+    _framed(out, generator.iter_chunks(args.start, stop), args.format, args.start)
+
+def write_passphrases(out, args):
+    """Passphrase counterpart of write_stream, honouring --format"""
+    from password_generator.passphrase import PassphraseGenerator
+    from password_generator.streaming import DEFAULT_CHUNK_SIZE
+
+    generator = PassphraseGenerator(args.words, args.wordlist, args.separator,
+                                    args.capitalize, args.digits)
+    if args.format == "json":
+        import json
+
+        out.write(json.dumps(generator.generate_batch(args.count)).encode('utf-8') + b"\n")
+        return
+    # Like write_stream, build and write one chunk at a time so memory stays flat
+    chunks = (generator.generate_batch(min(DEFAULT_CHUNK_SIZE, args.count - i))
+              for i in range(0, args.count, DEFAULT_CHUNK_SIZE))
+    _framed(out, chunks, args.format)
+
+def resolve_policy(length, classes, chars=None, exclude_similar=False, exclude_ambiguous=False):
+    """Turn --length/--charset/--chars/--exclude-* values into a PasswordPolicy"""
+    if chars is not None:
+        return PasswordPolicy(length, False, False, False, False, exclude_similar,
+                              exclude_ambiguous, include=chars)
+    return PasswordPolicy.from_tokens(classes, length, exclude_similar=exclude_similar,
+                                      exclude_ambiguous=exclude_ambiguous)
+
+def resolve_charset(classes, chars=None, exclude_similar=False, exclude_ambiguous=False):
+    """Turn --charset/--chars/--exclude-* values into a compiled character set"""
+    return resolve_policy(1, classes, chars, exclude_similar, exclude_ambiguous).alphabet()
+
+def run_cli(argv):
+    """Non-interactive entry point, e.g. python main.py --length 20 --count 5"""
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+
+    if args.length <= 0:
+        parser.error("--length must be positive")
+    if args.count < 0:
+        parser.error("--count must not be negative")
+    if args.start is not None and args.seed is None:
+        parser.error("--start only applies with --seed")
+    args.start = args.start or 0
+
+    if args.words is not None:
+        if args.seed is not None:
+            parser.error("--seed does not apply to --words; passphrases are always random")
+        if args.words <= 0:
+            parser.error("--words must be positive")
+        if args.digits < 0:
+            parser.error("--digits must not be negative")
+        try:
+            write_passphrases(sys.stdout.buffer, args)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        sys.stdout.buffer.flush()
+        return 0
 
-if __name__ == "__main__":
+    try:
+        policy = resolve_policy(args.length, args.charset, args.chars,
+                                args.exclude_similar, args.exclude_ambiguous)
+    except ValueError as e:
+        parser.error(str(e))
+    if not policy.alphabet():
+        parser.error("the selected options leave no characters to choose from")
+    generator = Generator(policy)
+
+    out = sys.stdout.buffer
+    if args.seed is not None:
+        if args.start < 0:
+            parser.error("--start must not be negative")
+        from password_generator.seeded import WARNING
+
+        print(WARNING, file=sys.stderr)
+        write_seeded(out, args, generator.alphabet)
+        out.flush()
+        return 0
+    if args.format == "json":
+        import json
+
+        passwords = generator.generate_batch(args.count)
+        out.write(json.dumps(passwords).encode('utf-8') + b"\n")
+    else:
+        from password_generator.streaming import write_stream
+
+        framing = "newline" if args.format == "text" else args.format
+        write_stream(out, args.count, args.length, generator.alphabet, framing)
+    out.flush()
+    return 0
+
+def run_interactive():
+    """Interactive entry point, also launched in-process by demo.py"""
+    metrics.enable_from_env()
     try:
         generate_password_cli()
     except Exception as e:
         print(f"❌ An error occurred: {e}")
         print("Please try again.")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+    run_interactive()
@@ -0,0 +1,34 @@
+"""
+Shared password generation library used by main.py, gui_password_generator.py
+and demo.py
+"""
+
+from .charsets import (
+    Alphabet,
+    alphabet_for,
+    apply_exclusions,
+    build_charset,
+    compile_charset,
+)
+from .core import (
+    Generator,
+    PasswordPolicy,
+    generate_batch,
+    generate_password,
+    random_bytes,
+    random_string,
+)
+
+__all__ = [
+    "Alphabet",
+    "Generator",
+    "PasswordPolicy",
+    "alphabet_for",
+    "apply_exclusions",
+    "build_charset",
+    "compile_charset",
+    "generate_batch",
+    "generate_password",
+    "random_bytes",
+    "random_string",
+]
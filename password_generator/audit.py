@@ -0,0 +1,500 @@
+"""
+Streaming statistical audit of generator output for uniformity.
+
+A UniformityAuditor consumes passwords (or symbol indices) chunk by chunk
+and keeps only running counts, so it can follow a stream of 10**9 or more
+characters in memory proportional to the alphabet: per-position symbol
+counts (length x k), six running sums for the serial correlation, and one counter
+per character class. Counting is vectorized with NumPy's bincount when
+NumPy is installed, with a pure-Python fallback.
+
+Checks, each reduced to a p-value:
+
+    alphabet          any symbol outside the alphabet fails outright
+    chi2/overall      symbol frequencies over all positions
+    chi2/pos<i>       symbol frequencies at position i (per-position mapping bugs)
+    serial            correlation of adjacent symbol indices within a password
+                      (Knuth's serial correlation test), two-sided
+    coverage/<class>  share of passwords containing the class, two-sided
+
+Chi-square p-values use the Wilson-Hilferty normal approximation and only
+an excess fails: output more even than chance (codes issued without
+replacement) passes. Chi-square checks whose smallest expected cell count is
+below MIN_EXPECTED are skipped until enough data has been seen. The audit
+fails if any p-value is below alpha divided by the number of checks (a
+Bonferroni correction), so a correct generator fails with probability at
+most alpha.
+
+build_audit(mode) wires the auditor to each generation mode, and the CLI
+runs them all as a pass/fail gate (the vectorized mode is reported as
+skipped when NumPy is not installed):
+
+    python -m password_generator.audit --count 1000000
+
+Pronounceable (Markov) output is non-uniform by design and is not audited.
+"""
+
+import math
+import sys
+import time
+from collections import namedtuple
+
+from .charsets import alphabet_for, compile_charset
+from .policy import CLASS_CHARS, ConstrainedGenerator
+
+DEFAULT_ALPHA = 1e-6
+MIN_EXPECTED = 5
+DEFAULT_CHUNK = 65536
+
+MODES = ("core", "entropy_pool", "vectorized", "streaming", "parallel", "seeded", "keyspace",
+         "constrained", "passphrase")
+
+Check = namedtuple("Check", "name statistic p_value")
+
+
+def chi2_sf(x, df):
+    """Upper tail P(X >= x) of a chi-square with df degrees of freedom (Wilson-Hilferty)"""
+    if df <= 0:
+        return 1.0
+    if math.isinf(x):
+        return 0.0
+    scale = 2 / (9 * df)
+    z = ((x / df) ** (1 / 3) - (1 - scale)) / math.sqrt(scale)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def normal_two_sided(z):
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover - exercised when NumPy is absent
+        return None
+    return np
+
+
+class UniformityAuditor:
+    """
+    Running uniformity statistics for fixed-length outputs.
+
+    alphabet is a charset (str or Alphabet) for password strings, or an int
+    symbol count for index streams fed with update_indices. expected gives
+    the probability of each symbol (default: uniform). classes maps a name
+    to the characters of a class whose coverage is checked (default: the
+    standard classes the alphabet partly covers); coverage overrides the
+    expected share of passwords containing a class, which otherwise assumes
+    independent positions. serial=False skips the serial test for modes
+    whose positions are dependent by design.
+    """
+
+    def __init__(self, alphabet, length, expected=None, classes=None, coverage=None, serial=True,
+                 vectorized=None):
+        if length <= 0:
+            raise ValueError("Length must be positive")
+        if isinstance(alphabet, int):
+            self.alphabet = None
+            k = alphabet
+            chars = None
+        else:
+            self.alphabet = alphabet_for(alphabet)
+            chars = self.alphabet.chars
+            k = self.alphabet.size
+        if k < 1:
+            raise ValueError("The alphabet must not be empty")
+        expected = [1 / k] * k if expected is None else [float(p) for p in expected]
+        if len(expected) != k or abs(sum(expected) - 1) > 1e-9:
+            raise ValueError(f"expected must be {k} probabilities summing to 1")
+
+        if classes is None:
+            classes = {}
+            if chars is not None:
+                for name, members in CLASS_CHARS.items():
+                    if any(c in members for c in chars):
+                        classes[name] = members
+        self.k = k
+        self.length = length
+        self.expected = expected
+        self.serial = serial
+        self.passwords = 0
+        self._np = _numpy() if vectorized is not False else None
+        if vectorized and self._np is None:
+            raise ImportError("Vectorized counting needs NumPy")
+
+        # Symbol -> index (k marks a symbol outside the alphabet)
+        self._index = {c: i for i, c in enumerate(chars)} if chars is not None else None
+        self._class_names = []
+        self._class_members = []
+        self._coverage_expected = []
+        for name, members in classes.items():
+            if chars is not None:
+                member_set = set(members)
+                mask = [c in member_set for c in chars]
+            else:
+                mask = [i in members for i in range(k)]
+            p_class = sum(p for p, m in zip(expected, mask) if m)
+            share = (coverage or {}).get(name, 1 - (1 - p_class) ** length)
+            self._class_names.append(name)
+            self._class_members.append(mask)
+            self._coverage_expected.append(share)
+        self._covered = [0] * len(self._class_names)
+        self._byte_table = None
+        self._serial_sums = [0, 0, 0, 0, 0, 0]  # n, sx, sy, sxx, syy, sxy
+
+        if self._np is not None:
+            np = self._np
+            self._counts = np.zeros((length, k + 1), dtype=np.int64)
+            self._offsets = (np.arange(length, dtype=np.int64) * (k + 1))[None, :]
+            self._masks = [np.array(mask + [False]) for mask in self._class_members]
+            if chars is not None:
+                codes = [ord(c) for c in chars]
+                if max(codes) < 1 << 16:
+                    table = np.full(max(codes) + 2, k, dtype=np.int64)
+                    table[codes] = np.arange(k)
+                    self._table = table
+                else:
+                    self._table = None
+                    order = np.argsort(codes)
+                    self._sorted_codes = np.array(codes, dtype=np.uint32)[order]
+                    self._order = np.append(order, k)
+        else:
+            self._counts = [[0] * (k + 1) for _ in range(length)]
+
+    @property
+    def chars(self):
+        """Number of symbols audited so far"""
+        return self.passwords * self.length
+
+    def _indices_numpy(self, passwords):
+        np = self._np
+        codes = np.frombuffer("".join(passwords).encode("utf-32-le"), dtype=np.uint32)
+        if self._table is not None:
+            top = len(self._table) - 1
+            return self._table[np.minimum(codes, top)].reshape(len(passwords), self.length)
+        pos = np.minimum(np.searchsorted(self._sorted_codes, codes), self.k - 1)
+        idx = np.where(self._sorted_codes[pos] == codes, pos, self.k)
+        return self._order[idx].reshape(len(passwords), self.length)
+
+    def update(self, passwords):
+        """Audit a chunk of password strings, all of the auditor's length"""
+        if self._index is None:
+            raise TypeError("This auditor counts symbol indices; use update_indices")
+        if not passwords:
+            return
+        length = self.length
+        if any(len(p) != length for p in passwords):
+            raise ValueError(f"Every password must be {length} characters")
+        if self._np is not None:
+            self.update_indices(self._indices_numpy(passwords))
+        else:
+            index, k = self._index, self.k
+            self.update_indices([[index.get(c, k) for c in p] for p in passwords])
+
+    def update_buffer(self, data):
+        """Audit fixed-width records packed back to back (single-byte alphabets only)"""
+        if self.alphabet is None or not self.alphabet.single_byte:
+            raise TypeError("update_buffer needs a single-byte character alphabet")
+        if len(data) % self.length:
+            raise ValueError(f"The buffer is not a whole number of {self.length}-byte records")
+        if self._byte_table is None:
+            lookup = {b: i for i, b in enumerate(self.alphabet.symbols)}
+            # Indices fit a byte only below 255; otherwise go through str
+            self._byte_table = bytes(lookup.get(b, self.k) for b in range(256)) if self.k < 255 else b""
+        if not self._byte_table:
+            self.update([data[i:i + self.length].decode("latin-1")
+                         for i in range(0, len(data), self.length)])
+            return
+        indices = bytes(data).translate(self._byte_table)
+        n = len(indices) // self.length
+        if self._np is not None:
+            np = self._np
+            self.update_indices(np.frombuffer(indices, dtype=np.uint8).reshape(n, self.length))
+        else:
+            self.update_indices([indices[i:i + self.length]
+                                 for i in range(0, len(indices), self.length)])
+
+    def update_indices(self, rows):
+        """Audit a chunk of symbol-index rows (n x length; NumPy array or lists)"""
+        if self._np is not None:
+            self._update_numpy(rows)
+        else:
+            self._update_python(rows)
+
+    def _update_numpy(self, rows):
+        np = self._np
+        idx = np.asarray(rows, dtype=np.int64)
+        if idx.ndim != 2 or idx.shape[1] != self.length:
+            raise ValueError(f"rows must be n x {self.length}")
+        if not len(idx):
+            return
+        idx = np.where((idx < 0) | (idx > self.k), self.k, idx)
+        self._counts += np.bincount((idx + self._offsets).ravel(),
+                                    minlength=self._counts.size).reshape(self._counts.shape)
+        self.passwords += len(idx)
+        if self.length > 1:
+            x, y = idx[:, :-1], idx[:, 1:]
+            sums = self._serial_sums
+            sums[0] += x.size
+            sums[1] += int(x.sum())
+            sums[2] += int(y.sum())
+            sums[3] += int((x * x).sum())
+            sums[4] += int((y * y).sum())
+            sums[5] += int((x * y).sum())
+        for i, mask in enumerate(self._masks):
+            self._covered[i] += int(mask[idx].any(axis=1).sum())
+
+    def _update_python(self, rows):
+        counts, k, length = self._counts, self.k, self.length
+        sums = self._serial_sums
+        masks = self._class_members
+        for row in rows:
+            row = [i if 0 <= i < k else k for i in row]
+            if len(row) != length:
+                raise ValueError(f"rows must be n x {length}")
+            for position, i in enumerate(row):
+                counts[position][i] += 1
+            for a, b in zip(row, row[1:]):
+                sums[0] += 1
+                sums[1] += a
+                sums[2] += b
+                sums[3] += a * a
+                sums[4] += b * b
+                sums[5] += a * b
+            for j, mask in enumerate(masks):
+                if any(i < k and mask[i] for i in row):
+                    self._covered[j] += 1
+            self.passwords += 1
+
+    def _row_counts(self):
+        if self._np is not None:
+            return [list(map(int, row)) for row in self._counts]
+        return [list(row) for row in self._counts]
+
+    def _chi_square(self, name, counts):
+        total = sum(counts)
+        expected = self.expected
+        support = [p for p in expected if p > 0]
+        if total == 0 or len(support) < 2 or total * min(support) < MIN_EXPECTED:
+            return None
+        statistic = 0.0
+        for observed, p in zip(counts, expected):
+            if p > 0:
+                e = total * p
+                statistic += (observed - e) ** 2 / e
+            elif observed:
+                return Check(name, math.inf, 0.0)
+        return Check(name, statistic, chi2_sf(statistic, len(support) - 1))
+
+    def checks(self):
+        """Every applicable check on the data seen so far, as Check tuples"""
+        rows = self._row_counts()
+        foreign = sum(row[self.k] for row in rows)
+        results = [Check("alphabet", foreign, 0.0 if foreign else 1.0)]
+        overall = [sum(column) for column in zip(*rows)][:self.k]
+        for name, counts in [("chi2/overall", overall)] + [
+                (f"chi2/pos{i}", row[:self.k]) for i, row in enumerate(rows)]:
+            check = self._chi_square(name, counts)
+            if check:
+                results.append(check)
+
+        n, sx, sy, sxx, syy, sxy = self._serial_sums
+        variance = (n * sxx - sx * sx) * (n * syy - sy * sy)
+        if self.serial and n > 1 and variance > 0:
+            r = (n * sxy - sx * sy) / math.sqrt(variance)
+            results.append(Check("serial", r, normal_two_sided(r * math.sqrt(n))))
+
+        for name, share, covered in zip(self._class_names, self._coverage_expected, self._covered):
+            n = self.passwords
+            if not n:
+                continue
+            if share >= 1 or share <= 0:
+                missed = covered != n * share
+                results.append(Check(f"coverage/{name}", covered / n, 0.0 if missed else 1.0))
+            else:
+                z = (covered - n * share) / math.sqrt(n * share * (1 - share))
+                results.append(Check(f"coverage/{name}", covered / n, normal_two_sided(z)))
+        return results
+
+    def failures(self, alpha=DEFAULT_ALPHA):
+        """Checks whose p-value is below the Bonferroni-corrected threshold"""
+        checks = self.checks()
+        threshold = alpha / len(checks)
+        return [check for check in checks if check.p_value < threshold]
+
+    def passed(self, alpha=DEFAULT_ALPHA):
+        return not self.failures(alpha)
+
+    def summary(self, alpha=DEFAULT_ALPHA):
+        """Human-readable report, worst check first"""
+        checks = sorted(self.checks(), key=lambda check: check.p_value)
+        threshold = alpha / len(checks)
+        failed = [check for check in checks if check.p_value < threshold]
+        lines = [f"{'❌ FAIL' if failed else '✅ PASS'}: {self.passwords:,} outputs, "
+                 f"{self.chars:,} symbols, {len(checks)} checks at alpha {alpha:g}"]
+        for check in checks[:5] if not failed else failed:
+            lines.append(f"   {check.name:<20} statistic {check.statistic:>12.4g}  "
+                         f"p {check.p_value:.3g}")
+        return "\n".join(lines)
+
+
+def _constrained_expectation(generator):
+    """Per-symbol probabilities and class coverage of a ConstrainedGenerator without adjacency rules"""
+    chars = generator.alphabet.chars
+    length = generator.length
+    slots = [(slot_chars, generator.pattern.count(slot))
+             for slot, slot_chars in enumerate(generator.slot_chars)]
+    expected = [sum(count / length / len(slot_chars) for slot_chars, count in slots if c in slot_chars)
+                for c in chars]
+    coverage = {}
+    for name, members in CLASS_CHARS.items():
+        missing = 1.0
+        for slot_chars, count in slots:
+            share = sum(c in members for c in slot_chars) / len(slot_chars)
+            missing *= (1 - share) ** count
+        coverage[name] = 1 - missing
+    return expected, coverage
+
+
+def build_audit(mode, length=16, charset=None, seed="audit"):
+    """
+    An auditor wired to one generation mode: returns (auditor, feed), where
+    feed(n) generates n more outputs in that mode and audits them.
+    """
+    from .core import generate_batch
+
+    alphabet = alphabet_for(charset if charset is not None else compile_charset())
+
+    if mode == "core":
+        auditor = UniformityAuditor(alphabet, length)
+        return auditor, lambda n: auditor.update(generate_batch(n, length, alphabet))
+
+    if mode == "entropy_pool":
+        from .entropy import default_pool
+
+        auditor = UniformityAuditor(alphabet, length)
+        read = default_pool().read
+        return auditor, lambda n: auditor.update(generate_batch(n, length, alphabet, read))
+
+    if mode == "vectorized":
+        from .vectorized import generate_matrix
+
+        auditor = UniformityAuditor(alphabet, length)
+        # The matrix is audited as raw bytes, without building a str per password
+        return auditor, lambda n: auditor.update_buffer(bytes(generate_matrix(n, length, alphabet)))
+
+    if mode == "streaming":
+        from .streaming import iter_framed
+
+        auditor = UniformityAuditor(alphabet, length)
+
+        def feed(n):
+            for block in iter_framed(n, length, alphabet, "newline"):
+                auditor.update(block.decode("utf-8").split("\n")[:-1])
+        return auditor, feed
+
+    if mode == "parallel":
+        from .parallel import generate_parallel
+
+        auditor = UniformityAuditor(alphabet, length)
+        return auditor, lambda n: auditor.update(generate_parallel(n, length, alphabet, workers=2))
+
+    if mode == "seeded":
+        from .seeded import SeededGenerator
+
+        generator = SeededGenerator(seed, length, alphabet)
+        auditor = UniformityAuditor(alphabet, length)
+
+        def feed(n):
+            start = auditor.passwords
+            auditor.update(generator.passwords(start, start + n))
+        return auditor, feed
+
+    if mode == "keyspace":
+        from .keyspace import CodeSequence, new_key
+
+        sequence = CodeSequence(new_key(), alphabet, length)
+        auditor = UniformityAuditor(alphabet, length)
+
+        def feed(n):
+            start = auditor.passwords
+            auditor.update(list(sequence.iter_codes(start, start + n)))
+        return auditor, feed
+
+    if mode == "constrained":
+        min_counts = {name: 1 for name, members in CLASS_CHARS.items()
+                      if any(c in members for c in alphabet.chars)}
+        generator = ConstrainedGenerator(length, alphabet, min_counts)
+        expected, coverage = _constrained_expectation(generator)
+        # Slots are shuffled without replacement, so adjacent positions are
+        # dependent by design and the serial test does not apply
+        auditor = UniformityAuditor(alphabet, length, expected, coverage=coverage, serial=False)
+        return auditor, lambda n: auditor.update(generator.generate_batch(n))
+
+    if mode == "passphrase":
+        from .passphrase import PassphraseGenerator, load_wordlist
+
+        wordlist = load_wordlist()
+        words = {wordlist[i]: i for i in range(len(wordlist))}
+        generator = PassphraseGenerator(length, wordlist, separator="\n")
+        auditor = UniformityAuditor(len(wordlist), length, classes={})
+        return auditor, lambda n: auditor.update_indices(
+            [[words[w] for w in phrase.split("\n")] for phrase in generator.generate_batch(n)])
+
+    raise ValueError(f"Unknown mode {mode!r}; expected one of {', '.join(MODES)}")
+
+
+def audit_mode(mode, count, length=16, charset=None, chunk=DEFAULT_CHUNK):
+    """Audit count outputs of a mode in chunks; returns the auditor"""
+    auditor, feed = build_audit(mode, length, charset)
+    remaining = count
+    while remaining:
+        n = min(chunk, remaining)
+        feed(n)
+        remaining -= n
+    return auditor
+
+
+def main(argv=None):
+    """Run the audit over generation modes; exit status 1 if any fails"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Statistical uniformity audit of every generation mode")
+    parser.add_argument("--mode", choices=MODES, nargs="+", default=list(MODES))
+    parser.add_argument("--count", type=int, default=200_000, help="outputs per mode")
+    parser.add_argument("--length", type=int, default=16,
+                        help="characters per password (words per passphrase)")
+    parser.add_argument("--charset", help="characters to draw from (default: all four classes)")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                        help=f"chance of failing a correct generator (default {DEFAULT_ALPHA:g})")
+    args = parser.parse_args(argv)
+    if args.length <= 0 or args.count <= 0:
+        parser.error("--length and --count must be positive")
+
+    failed = []
+    audited = 0
+    for mode in args.mode:
+        if mode == "vectorized" and _numpy() is None:
+            print(f"[{mode}] skipped: NumPy is not installed")
+            continue
+        audited += 1
+        count = args.count
+        if mode in ("keyspace", "passphrase"):
+            # Pure-Python per-output paths: audit fewer outputs in the same time
+            count = max(1, count // 10)
+        start = time.perf_counter()
+        auditor = audit_mode(mode, count, args.length, args.charset)
+        elapsed = time.perf_counter() - start
+        print(f"[{mode}] {auditor.chars / elapsed:,.0f} symbols/s generated + audited")
+        print(auditor.summary(args.alpha))
+        if not auditor.passed(args.alpha):
+            failed.append(mode)
+    if failed:
+        print(f"❌ Failed: {', '.join(failed)}")
+        return 1
+    print(f"✅ All {audited} audited modes look uniform")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
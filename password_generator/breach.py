@@ -0,0 +1,280 @@
+"""
+Offline screening against known-breached and common passwords.
+
+The corpus is a Bloom filter stored in a memory-mapped file, so a lookup is
+one SHA-1 plus a handful of byte reads (a few microseconds) with no network
+and no load step; only the pages a lookup touches are read from disk.
+
+Every entry is keyed by the SHA-1 of the UTF-8 password (lines that are not
+valid UTF-8 are keyed by their raw bytes). Plain-text lists are
+hashed while building; lists that are already SHA-1 hashed (such as the
+Pwned Passwords "HEX:count" download) are used as-is. The 20-byte digest is
+already uniformly distributed, so the k filter positions are derived from it
+by enhanced triple hashing, (h1 + i*h2 + i^2*h3 + (i^3 - i)/6) mod m with h1,
+h2, h3 taken from the digest, rather than by hashing again. Plain double
+hashing collapses all k probes onto one bit whenever its step is a multiple of
+m, and allows only m^2 probe sequences; both put a floor of about n/m^2 under
+the false-positive rate of a small filter.
+
+File layout: a HEADER_SIZE-byte header (magic, version, hash count, bit
+count, entry count, capacity) followed by the bit array.
+
+The builder streams its input once (plus a counting pass when no capacity is
+given) and its memory is bounded by the chunk size; the bit array itself
+lives in the output file. With NumPy installed, bits are set a chunk at a
+time; both paths produce identical files.
+
+A small list of very common passwords is bundled (data/common-passwords.txt,
+compiled to data/breached.pwbf). The false-positive rate is also the share
+of freshly generated passwords a strength check wrongly reports as breached,
+so the default (used for the bundled filter) is 1e-12; that costs about 7.2
+bytes per entry, and the bundled filter still fits in about 1 KiB:
+
+    python -m password_generator.breach build password_generator/data/common-passwords.txt \
+        password_generator/data/breached.pwbf
+
+For real screening build a filter from a large corpus and point
+PASSWORD_BREACH_FILTER at it:
+
+    python -m password_generator.breach build pwned-passwords-sha1.txt breached.pwbf --hashed
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+import sys
+from functools import lru_cache
+
+MAGIC = b"PWBF"
+VERSION = 2
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<4sHHQQQ")
+
+DEFAULT_FP_RATE = 1e-12
+BUILD_CHUNK = 65536
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_FILTER = os.path.join(DATA_DIR, "breached.pwbf")
+FILTER_ENV = "PASSWORD_BREACH_FILTER"
+
+
+def password_digest(password):
+    """SHA-1 digest used as the filter key for a password"""
+    # surrogateescape restores the raw bytes of list lines that are not valid UTF-8
+    return hashlib.sha1(password.encode("utf-8", "surrogateescape")).digest()
+
+
+def filter_size(capacity, fp_rate=DEFAULT_FP_RATE):
+    """Return (nbits, nhashes) for a Bloom filter holding capacity entries"""
+    ln2 = math.log(2)
+    nbits = max(64, int(-max(capacity, 1) * math.log(fp_rate) / ln2 ** 2))
+    return nbits, max(1, round(nbits / max(capacity, 1) * ln2))
+
+
+def _positions(digest, nbits, nhashes):
+    h1 = int.from_bytes(digest[:8], "little") % nbits
+    h2 = int.from_bytes(digest[8:16], "little") % nbits
+    h3 = int.from_bytes(digest[16:20], "little") % nbits
+    return [(h1 + i * h2 + i * i * h3 + (i ** 3 - i) // 6) % nbits for i in range(nhashes)]
+
+
+class BreachFilter:
+    """Read-only, memory-mapped Bloom filter of breached password digests"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.nhashes, self.nbits, self.count, self.capacity = \
+            _HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            if magic == MAGIC:
+                raise ValueError(f"{path} is an old breach filter format; rebuild it")
+            raise ValueError(f"{path} is not a breach filter")
+        self.path = path
+
+    def contains_digest(self, digest):
+        mm = self._mm
+        nbits = self.nbits
+        h1 = int.from_bytes(digest[:8], "little") % nbits
+        h2 = int.from_bytes(digest[8:16], "little") % nbits
+        h3 = int.from_bytes(digest[16:20], "little") % nbits
+        # Stop at the first clear bit: absent passwords usually need one or two probes
+        for i in range(self.nhashes):
+            pos = (h1 + i * h2 + i * i * h3 + (i ** 3 - i) // 6) % nbits
+            if not mm[HEADER_SIZE + (pos >> 3)] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def __contains__(self, password):
+        return self.contains_digest(password_digest(password))
+
+    def screen(self, passwords):
+        """Return the passwords that (probably) appear in the corpus"""
+        return [p for p in passwords if p in self]
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_digests(lines, hashed=False):
+    """
+    Yield filter keys from a text list. Plain lists have one password per
+    line; hashed lists have a hex SHA-1 per line, optionally followed by
+    ":count". Blank lines are skipped.
+    """
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        if hashed:
+            yield bytes.fromhex(line.split(":", 1)[0].strip())
+        else:
+            yield password_digest(line)
+
+
+def _set_bits_array(bits, digests, nbits, nhashes):
+    """NumPy version of _set_bits for a uint8 array view of the bit array"""
+    import numpy as np
+
+    raw = np.frombuffer(b"".join(digests), dtype=[("h1", "<u8"), ("h2", "<u8"), ("h3", "<u4")])
+    m = np.uint64(nbits)
+    h1, h2, h3 = raw["h1"] % m, raw["h2"] % m, raw["h3"].astype(np.uint64) % m
+    for i in range(nhashes):
+        pos = (h1 + np.uint64(i) * h2 + np.uint64(i * i) * h3 + np.uint64((i ** 3 - i) // 6)) % m
+        masks = np.left_shift(np.uint8(1), (pos & np.uint64(7)).astype(np.uint8))
+        np.bitwise_or.at(bits, pos >> np.uint64(3), masks)
+
+
+def _set_bits(bits, digests, nbits, nhashes):
+    for digest in digests:
+        for pos in _positions(digest, nbits, nhashes):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+
+def _fill_filter(mm, source, hashed, nbits, nhashes, vectorized):
+    """Set the bits for every entry of source in the mapped filter; returns the entry count"""
+    set_bits = _set_bits
+    bits = memoryview(mm)[HEADER_SIZE:]
+    if vectorized:
+        try:
+            import numpy as np
+        except ImportError:  # pragma: no cover - exercised when NumPy is absent
+            pass
+        else:
+            bits.release()
+            bits = np.frombuffer(mm, dtype=np.uint8, offset=HEADER_SIZE)
+            set_bits = _set_bits_array
+    count = 0
+    chunk = []
+    try:
+        for digest in iter_digests(source, hashed):
+            chunk.append(digest)
+            if len(chunk) == BUILD_CHUNK:
+                set_bits(bits, chunk, nbits, nhashes)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            set_bits(bits, chunk, nbits, nhashes)
+            count += len(chunk)
+    finally:
+        # Drop the view even on error, or the map cannot be closed
+        if isinstance(bits, memoryview):
+            bits.release()
+        del bits
+    return count
+
+
+def build_filter(source, dest, capacity=None, fp_rate=DEFAULT_FP_RATE, hashed=False,
+                 vectorized=True):
+    """
+    Build a filter file from a text list (path or iterable of lines) in one
+    streaming pass. capacity defaults to the line count of a file source.
+    vectorized uses NumPy when it is installed. Returns the number of entries added.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if capacity is None:
+            with open(source, encoding="utf-8", errors="surrogateescape") as f:
+                capacity = sum(1 for line in f if line.strip("\r\n"))
+        with open(source, encoding="utf-8", errors="surrogateescape") as f:
+            return build_filter(f, dest, capacity, fp_rate, hashed, vectorized)
+    if capacity is None:
+        raise ValueError("capacity is required when building from a stream")
+
+    nbits, nhashes = filter_size(capacity, fp_rate)
+    tmp = f"{dest}.tmp"
+    fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, HEADER_SIZE + (nbits + 7) // 8)
+        mm = mmap.mmap(fd, 0)
+    finally:
+        os.close(fd)
+
+    try:
+        count = _fill_filter(mm, source, hashed, nbits, nhashes, vectorized)
+        _HEADER.pack_into(mm, 0, MAGIC, VERSION, nhashes, nbits, count, capacity)
+        mm.flush()
+    except BaseException:
+        mm.close()
+        os.remove(tmp)
+        raise
+    mm.close()
+    os.replace(tmp, dest)
+    return count
+
+
+@lru_cache(maxsize=1)
+def default_filter():
+    """The filter named by $PASSWORD_BREACH_FILTER, else the bundled one (None if absent)"""
+    path = os.environ.get(FILTER_ENV) or DEFAULT_FILTER
+    return BreachFilter(path) if os.path.exists(path) else None
+
+
+def main(argv=None):
+    """python -m password_generator.breach {build,check} ..."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or query a breached-password filter.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="build a filter from a text list (one per line)")
+    build.add_argument("source", help="password list, or '-' for stdin (needs --capacity)")
+    build.add_argument("dest")
+    build.add_argument("--capacity", type=int, help="expected entries (default: count lines)")
+    build.add_argument("--fp-rate", type=float, default=DEFAULT_FP_RATE)
+    build.add_argument("--hashed", action="store_true",
+                       help="lines are hex SHA-1 digests (optionally HEX:count)")
+    check = sub.add_parser("check", help="print which passwords from stdin are breached")
+    check.add_argument("--filter", help="filter file (default: $%s or bundled)" % FILTER_ENV)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        source = sys.stdin if args.source == "-" else args.source
+        try:
+            count = build_filter(source, args.dest, args.capacity, args.fp_rate, args.hashed)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"Wrote {count:,} entries to {args.dest}")
+        return 0
+
+    breached = BreachFilter(args.filter) if args.filter else default_filter()
+    if breached is None:
+        parser.error("no breach filter found; build one first")
+    found = 0
+    for line in sys.stdin:
+        password = line.rstrip("\r\n")
+        if password and password in breached:
+            found += 1
+            print(f"❌ breached: {password}")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Central charset compiler with a bounded LRU cache.
+
+An option set (character classes, exclusions, custom include/exclude lists)
+is compiled once into an immutable Alphabet holding everything the bulk
+engine needs: the symbols, their count, the 256-entry byte lookup table used
+with bytes.translate and the rejection threshold. Repeat requests with the
+same options return the cached Alphabet and do no charset work at all.
+"""
+
+import string
+from functools import lru_cache
+
+# Characters removed by the GUI's "Advanced Options" exclusions
+SIMILAR_CHARS = "0Ol1I"
+AMBIGUOUS_CHARS = "{}[]()/'\"~,;.<>"
+
+# Maximum number of distinct option sets / explicit charsets kept compiled
+CACHE_SIZE = 256
+
+
+def rejection_limit(size, space=256):
+    """Return the largest multiple of size within space; samples at or above it are rejected"""
+    return space - (space % size)
+
+
+class Alphabet:
+    """Immutable, precompiled character set ready for bulk sampling"""
+
+    __slots__ = ("chars", "size", "symbols", "table", "rejected", "limit", "_index_map")
+
+    def __init__(self, chars):
+        chars = ''.join(dict.fromkeys(chars))
+        size = len(chars)
+        try:
+            symbols = chars.encode('latin-1')
+            index_map = None
+        except UnicodeEncodeError:
+            symbols = None
+            # Map entropy bytes onto symbol indices, then indices onto characters
+            index_map = {i: c for i, c in enumerate(chars)}
+
+        table = rejected = None
+        limit = 0
+        if 0 < size <= 256:
+            limit = rejection_limit(size)
+            targets = symbols if symbols is not None else bytes(range(size))
+            table = bytes(targets[b % size] for b in range(limit)) + bytes(256 - limit)
+            rejected = bytes(range(limit, 256))
+
+        for name, value in (("chars", chars), ("size", size), ("symbols", symbols),
+                            ("table", table), ("rejected", rejected), ("limit", limit),
+                            ("_index_map", index_map)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Alphabet objects are immutable")
+
+    def __reduce__(self):
+        # Rebuild from the symbols when sent to worker processes
+        return (Alphabet, (self.chars,))
+
+    def __len__(self):
+        return self.size
+
+    def __eq__(self, other):
+        return isinstance(other, Alphabet) and other.chars == self.chars
+
+    def __hash__(self):
+        return hash(self.chars)
+
+    def __repr__(self):
+        return f"Alphabet({self.chars!r})"
+
+    @property
+    def single_byte(self):
+        """True when every symbol fits in one latin-1 byte"""
+        return self.symbols is not None
+
+    def decode(self, data):
+        """Turn bytes produced through this alphabet's table back into text"""
+        text = data.decode('latin-1')
+        if self._index_map is not None:
+            text = text.translate(self._index_map)
+        return text
+
+
+def apply_exclusions(characters, exclude_similar=False, exclude_ambiguous=False):
+    """Remove look-alike and/or ambiguous symbols from a character set"""
+    if exclude_similar:
+        characters = ''.join(c for c in characters if c not in SIMILAR_CHARS)
+    if exclude_ambiguous:
+        characters = ''.join(c for c in characters if c not in AMBIGUOUS_CHARS)
+    return characters
+
+
+def build_charset(uppercase=True, lowercase=True, digits=True, symbols=True,
+                  exclude_similar=False, exclude_ambiguous=False, include="", exclude=""):
+    """Assemble a character set string from the character type and exclusion options"""
+    characters = ""
+    if uppercase:
+        characters += string.ascii_uppercase
+    if lowercase:
+        characters += string.ascii_lowercase
+    if digits:
+        characters += string.digits
+    if symbols:
+        characters += string.punctuation
+    characters += include
+
+    characters = apply_exclusions(characters, exclude_similar, exclude_ambiguous)
+    if exclude:
+        characters = ''.join(c for c in characters if c not in exclude)
+    return ''.join(dict.fromkeys(characters))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_charset(uppercase=True, lowercase=True, digits=True, symbols=True,
+                    exclude_similar=False, exclude_ambiguous=False, include="", exclude=""):
+    """Compile an option set into a cached, immutable Alphabet"""
+    return Alphabet(build_charset(uppercase, lowercase, digits, symbols,
+                                  exclude_similar, exclude_ambiguous, include, exclude))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _alphabet_from_chars(chars):
+    return Alphabet(chars)
+
+
+def alphabet_for(charset):
+    """Return the compiled Alphabet for a charset string (or pass an Alphabet through)"""
+    if isinstance(charset, Alphabet):
+        return charset
+    return _alphabet_from_chars(charset)
+
+
+def cache_stats():
+    """Hit/miss statistics for the option-set and explicit-charset caches"""
+    stats = {}
+    for name, cached in (("policies", compile_charset), ("charsets", _alphabet_from_chars)):
+        info = cached.cache_info()
+        stats[name] = {"hits": info.hits, "misses": info.misses,
+                       "size": info.currsize, "maxsize": info.maxsize}
+    return stats
+
+
+def clear_cache():
+    """Drop every compiled alphabet"""
+    compile_charset.cache_clear()
+    _alphabet_from_chars.cache_clear()
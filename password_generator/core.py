@@ -0,0 +1,248 @@
+"""
+Bulk password generation engine shared by the CLI, GUI and demo scripts.
+
+Rather than calling random.choice once per character, a batch pulls one large
+block of OS entropy and maps it onto the character set with bytes.translate.
+Bytes that would introduce modulo bias are deleted in that same pass
+(rejection sampling), so every character in the set is equally likely.
+
+Every function accepts either a plain charset string or a precompiled
+Alphabet from charsets.compile_charset, plus an optional randbytes callable
+so callers can choose the entropy source. Bulk calls default to os.urandom
+(their reads are large); single passwords default to the shared EntropyPool.
+
+Entry points describe what they want with a PasswordPolicy and generate
+through a Generator, which compiles the policy's alphabet once and keeps its
+entropy source, so per-password calls do no setup work.
+"""
+
+import math
+import os
+from array import array
+
+from .charsets import alphabet_for, compile_charset, rejection_limit
+from .entropy import default_pool
+from .strength import assess
+
+# Cap a single os.urandom read so huge batches are fetched in pieces
+MAX_ENTROPY_BLOCK = 1 << 24
+
+
+def _checked_alphabet(charset):
+    alphabet = alphabet_for(charset)
+    if not alphabet.size:
+        raise ValueError("Character set must not be empty")
+    return alphabet
+
+
+def _random_string_wide(count, alphabet, randbytes):
+    """Draw from charsets larger than 256 symbols using 16-bit samples"""
+    size = alphabet.size
+    if size > 65536:
+        raise ValueError("Character set must not exceed 65536 symbols")
+    chars = alphabet.chars
+    limit = rejection_limit(size, 65536)
+    out = []
+    while len(out) < count:
+        want = count - len(out)
+        samples = array('H')
+        samples.frombytes(randbytes(2 * (want * 65536 // limit + 16)))
+        out.extend(chars[v % size] for v in samples if v < limit)
+    return ''.join(out[:count])
+
+
+def _translated_entropy(count, alphabet, randbytes):
+    """Read OS entropy and map it through the alphabet table until count symbols are accepted"""
+    table, rejected, limit = alphabet.table, alphabet.rejected, alphabet.limit
+    chunks = []
+    have = 0
+    while have < count:
+        want = count - have
+        # Over-request a little so a single read usually covers the rejected bytes
+        block = min(want * 256 // limit + want // 32 + 16, MAX_ENTROPY_BLOCK)
+        chunk = randbytes(block).translate(table, rejected)
+        chunks.append(chunk)
+        have += len(chunk)
+    return b''.join(chunks)[:count]
+
+
+def random_bytes(count, charset, randbytes=None):
+    """Return count symbols of a single-byte (latin-1) charset as raw bytes"""
+    if count < 0:
+        raise ValueError("Character count must not be negative")
+    alphabet = _checked_alphabet(charset)
+    if not alphabet.single_byte or alphabet.size > 256:
+        raise ValueError("Byte output needs a single-byte (latin-1) character set")
+    return _translated_entropy(count, alphabet, randbytes or os.urandom)
+
+
+def random_string(count, charset, randbytes=None):
+    """Return count characters drawn uniformly and independently from charset"""
+    if count < 0:
+        raise ValueError("Character count must not be negative")
+    alphabet = _checked_alphabet(charset)
+    randbytes = randbytes or os.urandom
+    if alphabet.size > 256:
+        return _random_string_wide(count, alphabet, randbytes)
+    return alphabet.decode(_translated_entropy(count, alphabet, randbytes))
+
+
+def generate_password(length, charset, randbytes=None):
+    """Generate a single password of the given length
+
+    Single passwords draw from the shared pre-filled EntropyPool by default,
+    so interactive use does not pay a syscall per password.
+    """
+    if length <= 0:
+        raise ValueError("Password length must be positive")
+    return random_string(length, charset, randbytes or default_pool().read)
+
+
+def generate_batch(n, length, charset, randbytes=None):
+    """Generate n passwords of the given length in one bulk pass"""
+    if n < 0:
+        raise ValueError("Password count must not be negative")
+    if length <= 0:
+        raise ValueError("Password length must be positive")
+    text = random_string(n * length, charset, randbytes)
+    return [text[i:i + length] for i in range(0, n * length, length)]
+
+
+# (name, type, default) for every PasswordPolicy field, in constructor order
+_POLICY_FIELDS = (
+    ("length", int, 16),
+    ("uppercase", bool, True),
+    ("lowercase", bool, True),
+    ("digits", bool, True),
+    ("symbols", bool, True),
+    ("exclude_similar", bool, False),
+    ("exclude_ambiguous", bool, False),
+    ("include", str, ""),
+    ("exclude", str, ""),
+)
+
+# Tokens of a policy spec such as "letters,digits,no-similar" and the fields they switch on
+POLICY_TOKENS = {
+    "upper": ("uppercase",),
+    "lower": ("lowercase",),
+    "letters": ("uppercase", "lowercase"),
+    "digits": ("digits",),
+    "symbols": ("symbols",),
+    "no-similar": ("exclude_similar",),
+    "no-ambiguous": ("exclude_ambiguous",),
+}
+_CLASS_FIELDS = ("uppercase", "lowercase", "digits", "symbols")
+
+
+class PasswordPolicy:
+    """Immutable, type-checked description of the passwords to generate
+
+    Fields: length (int), uppercase / lowercase / digits / symbols (bool),
+    exclude_similar / exclude_ambiguous (bool), include / exclude (str,
+    extra characters to add or remove). Values are checked on construction,
+    so a bad policy fails where it is built rather than mid-batch.
+    """
+
+    __slots__ = tuple(name for name, _, _ in _POLICY_FIELDS)
+
+    def __init__(self, length=16, uppercase=True, lowercase=True, digits=True, symbols=True,
+                 exclude_similar=False, exclude_ambiguous=False, include="", exclude=""):
+        values = (length, uppercase, lowercase, digits, symbols,
+                  exclude_similar, exclude_ambiguous, include, exclude)
+        for (name, kind, _), value in zip(_POLICY_FIELDS, values):
+            # bool is an int subclass; a length of True is a bug, not 1
+            if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+                raise TypeError(f"{name} must be {kind.__name__}, not {type(value).__name__}")
+            object.__setattr__(self, name, value)
+        if length <= 0:
+            raise ValueError("Password length must be positive")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PasswordPolicy objects are immutable")
+
+    def _values(self):
+        return tuple(getattr(self, name) for name, _, _ in _POLICY_FIELDS)
+
+    def __reduce__(self):
+        return (PasswordPolicy, self._values())
+
+    def __eq__(self, other):
+        return isinstance(other, PasswordPolicy) and other._values() == self._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __repr__(self):
+        changed = ", ".join(f"{name}={getattr(self, name)!r}" for name, _, default in _POLICY_FIELDS
+                            if getattr(self, name) != default)
+        return f"PasswordPolicy({changed})"
+
+    @classmethod
+    def from_tokens(cls, spec, length=16, **fields):
+        """Build a policy from a comma-separated spec such as 'letters,digits,no-similar'
+
+        A spec naming no character class gets all four. fields sets the
+        remaining fields; exclusions given there are combined with the spec's.
+        """
+        flags = dict.fromkeys(_CLASS_FIELDS, False)
+        for token in (spec or "").split(","):
+            token = token.strip().lower()
+            if not token:
+                continue
+            if token not in POLICY_TOKENS:
+                raise ValueError(f"unknown policy token {token!r}")
+            flags.update(dict.fromkeys(POLICY_TOKENS[token], True))
+        if not any(flags[name] for name in _CLASS_FIELDS):
+            flags.update(dict.fromkeys(_CLASS_FIELDS, True))
+        for name in ("exclude_similar", "exclude_ambiguous"):
+            flags[name] = flags.get(name, False) or fields.pop(name, False)
+        return cls(length, **flags, **fields)
+
+    def replace(self, **changes):
+        """Return a copy with some fields changed"""
+        values = {name: getattr(self, name) for name, _, _ in _POLICY_FIELDS}
+        values.update(changes)
+        return PasswordPolicy(**values)
+
+    def alphabet(self):
+        """The compiled (and cached) Alphabet this policy draws from"""
+        return compile_charset(self.uppercase, self.lowercase, self.digits, self.symbols,
+                               self.exclude_similar, self.exclude_ambiguous,
+                               self.include, self.exclude)
+
+
+class Generator:
+    """A PasswordPolicy compiled once, with its entropy source, for repeated generation
+
+    randbytes defaults to the shared EntropyPool for single passwords and to
+    os.urandom for batches, as with generate_password / generate_batch.
+    """
+
+    __slots__ = ("policy", "alphabet", "randbytes")
+
+    def __init__(self, policy=None, randbytes=None):
+        self.policy = policy if policy is not None else PasswordPolicy()
+        self.alphabet = _checked_alphabet(self.policy.alphabet())
+        self.randbytes = randbytes
+
+    @property
+    def length(self):
+        return self.policy.length
+
+    @property
+    def bits(self):
+        """Entropy of one password in bits"""
+        return self.policy.length * math.log2(self.alphabet.size) if self.alphabet.size > 1 else 0.0
+
+    def generate(self):
+        """Return one password"""
+        return random_string(self.policy.length, self.alphabet,
+                             self.randbytes or default_pool().read)
+
+    def generate_batch(self, n):
+        """Return a list of n passwords from one bulk pass"""
+        return generate_batch(n, self.policy.length, self.alphabet, self.randbytes)
+
+    def assess(self, password, breached=None):
+        """Strength of a password from this generator, using its exact alphabet size"""
+        return assess(password, self.alphabet.size, breached)
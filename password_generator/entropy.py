@@ -0,0 +1,193 @@
+"""
+Pre-filled pool of OS entropy with background refill.
+
+The pool keeps two equally sized buffers filled by os.urandom. Requests are
+served from the active buffer; once its remaining bytes drop below the
+low-water mark, a background thread refills the standby buffer so it is ready
+before the active one runs dry. At steady state a request therefore never
+waits on a syscall. If the standby buffer is not ready when it is needed, the
+active buffer is refilled synchronously and the event is counted as a stall.
+
+read(n) returns a bytes copy and immediately zeroes the consumed region, so
+it is a drop-in replacement for os.urandom. take(n) hands out a zero-copy
+memoryview for consumers such as NumPy or hashlib; the regions it hands out
+are zeroed when the pool moves on to its next buffer, so such a view is only
+valid until then and should be used straight away.
+
+Like os.urandom, pools are fork-safe: a forked child discards the bytes it
+inherited and refills its buffers from its own os.urandom before serving,
+so parent and child never hand out the same bytes.
+"""
+
+import os
+import threading
+import weakref
+
+DEFAULT_POOL_SIZE = 1 << 18
+DEFAULT_LOW_WATER = 0.75
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+_pools = weakref.WeakSet()
+
+
+class EntropyPool:
+    """Double-buffered OS entropy handed out in slices and refilled in the background"""
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, low_water=DEFAULT_LOW_WATER, background=True):
+        if size <= 0:
+            raise ValueError("Pool size must be positive")
+        if not 0 <= low_water <= 1:
+            raise ValueError("Low-water mark must be a fraction between 0 and 1")
+        self.size = size
+        self.low_water = int(size * low_water)
+        self.refills = 0
+        self.stalls = 0
+        self.bytes_served = 0
+
+        self._active = bytearray(os.urandom(size))
+        self._standby = bytearray(size)
+        self._zeros = memoryview(bytes(size))
+        self._closed = False
+        self._background = background
+        self._reset()
+        _pools.add(self)
+        if background:
+            with self._cond:
+                self._request_refill()
+
+    def _reset(self):
+        """Fresh lock and buffer state; the background thread starts on the next refill request"""
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._view = memoryview(self._active)
+        self._pos = 0
+        self._standby_ready = False
+        self._refill_requested = False
+        self._thread = None
+
+    def _after_fork(self):
+        """In a forked child: drop the inherited bytes, which the parent may also serve"""
+        self._reset()
+        self._view[:] = os.urandom(self.size)
+        self._standby[:] = self._zeros
+
+    def _request_refill(self):
+        """Ask the background thread to fill the standby buffer (lock held)"""
+        if not self._background or self._closed:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._refill_loop, name="entropy-refill",
+                                            daemon=True)
+            self._thread.start()
+        if not self._standby_ready and not self._refill_requested:
+            self._refill_requested = True
+            self._cond.notify()
+
+    def _refill_loop(self):
+        while True:
+            with self._cond:
+                while not self._refill_requested and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                target = self._standby
+            # Fill outside the lock so readers keep drawing from the active buffer
+            target[:] = os.urandom(self.size)
+            with self._cond:
+                self._standby_ready = True
+                self._refill_requested = False
+                self.refills += 1
+
+    def _next_buffer(self):
+        """Switch to a fresh buffer once the active one cannot serve a request (lock held)"""
+        if self._standby_ready:
+            # Wipe what take() handed out before the buffer goes back for refilling
+            self._view[:self._pos] = self._zeros[:self._pos]
+            self._active, self._standby = self._standby, self._active
+            self._view = memoryview(self._active)
+            self._standby_ready = False
+        else:
+            # Background refill fell behind (or is disabled): refill inline
+            self.stalls += 1
+            self._view[:] = os.urandom(self.size)
+            self.refills += 1
+        self._pos = 0
+
+    def _claim(self, n):
+        """Reserve n bytes of the active buffer and return their start offset (lock held)"""
+        start = self._pos
+        if start + n > self.size:
+            self._next_buffer()
+            start = 0
+        end = self._pos = start + n
+        self.bytes_served += n
+        if self.size - end < self.low_water and not self._refill_requested:
+            self._request_refill()
+        return start
+
+    def read(self, n):
+        """Return n bytes of entropy and wipe them from the pool; drop-in for os.urandom"""
+        if n > self.size:
+            with self._lock:
+                self.bytes_served += n
+            return os.urandom(n)
+        with self._lock:
+            start = self._claim(n)
+            region = self._view[start:start + n]
+            data = region.tobytes()
+            region[:] = self._zeros[:n]
+        return data
+
+    def take(self, n):
+        """Return a zero-copy memoryview of n bytes; valid until the buffer is recycled"""
+        if n > self.size:
+            with self._cond:
+                self.bytes_served += n
+            return memoryview(os.urandom(n))
+        with self._lock:
+            start = self._claim(n)
+            return self._view[start:start + n].toreadonly()
+
+    def stats(self):
+        """Fill level and counters for monitoring"""
+        with self._cond:
+            available = self.size - self._pos + (self.size if self._standby_ready else 0)
+            return {
+                "size": self.size,
+                "available": available,
+                "fill_level": available / (2 * self.size),
+                "standby_ready": self._standby_ready,
+                "refills": self.refills,
+                "stalls": self.stalls,
+                "bytes_served": self.bytes_served,
+            }
+
+    def close(self):
+        """Stop the background refill thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def _reset_pools_in_child():
+    global _default_pool_lock
+    _default_pool_lock = threading.Lock()
+    for pool in list(_pools):
+        pool._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_in_child)
+
+
+def default_pool():
+    """Process-wide pool used by generate_password and the service, created on first use"""
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = EntropyPool()
+    return _default_pool
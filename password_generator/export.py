@@ -0,0 +1,316 @@
+"""
+Streaming, encrypted bulk export: passwords never reach disk in plaintext.
+
+Passwords are framed one per line and packed into fixed-size plaintext
+chunks, each sealed with an AEAD cipher (AES-256-GCM or ChaCha20-Poly1305,
+from the optional `cryptography` package). Only one chunk is held in memory
+at a time, so exporting many gigabytes uses the same memory as exporting a
+few passwords.
+
+File layout:
+
+    header   HEADER_SIZE bytes: magic, version, cipher, KDF, scrypt log2(n),
+             chunk size, salt, nonce prefix
+    chunks   each chunk_size + TAG_SIZE bytes of ciphertext
+
+A chunk's plaintext is a uint32 count of used bytes, whole newline-terminated
+records, then zero padding up to chunk_size. Because every chunk has the same
+size, chunk k starts at HEADER_SIZE + k * (chunk_size + TAG_SIZE) and can be
+read and decrypted on its own, and no record is split across chunks.
+
+Nonces follow the STREAM construction: nonce prefix || chunk counter || a
+flag set only on the last chunk, and the header is the associated data of
+every chunk. Reordering, dropping or truncating chunks, or editing the
+header, therefore fails authentication instead of yielding partial output.
+
+The key is either 32 raw bytes (new_key) or derived from a passphrase with
+scrypt, using the per-file salt stored in the header.
+
+    python -m password_generator.export write --count 1000000 -o out.pwx
+    python -m password_generator.export read out.pwx --chunk 3
+"""
+
+import getpass
+import hashlib
+import os
+import struct
+import sys
+
+from .charsets import alphabet_for
+from .streaming import iter_framed
+
+MAGIC = b"PWEX"
+VERSION = 1
+HEADER_SIZE = 64
+TAG_SIZE = 16
+KEY_SIZE = 32
+SALT_SIZE = 16
+NONCE_PREFIX_SIZE = 7
+DEFAULT_CHUNK_SIZE = 64 * 1024
+MIN_CHUNK_SIZE = 64
+
+CIPHERS = {"aes-256-gcm": 1, "chacha20-poly1305": 2}
+KDF_NONE, KDF_SCRYPT = 0, 1
+SCRYPT_LOG2_N = 15
+# scrypt costs a file may ask a reader for: 16 MiB to 128 MiB of memory
+SCRYPT_LOG2_N_RANGE = (14, 17)
+
+_HEADER = struct.Struct(f"<4sHBBBI{SALT_SIZE}s{NONCE_PREFIX_SIZE}s")
+_USED = struct.Struct("<I")
+_COUNTER = struct.Struct(">IB")
+
+
+def _aead(cipher_id, key):
+    """An AEAD object for the cipher, importing `cryptography` on first use"""
+    try:
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+    except ImportError as e:
+        raise ImportError("Encrypted export needs the 'cryptography' package: "
+                          "pip install cryptography") from e
+    if cipher_id == CIPHERS["aes-256-gcm"]:
+        return AESGCM(key)
+    if cipher_id == CIPHERS["chacha20-poly1305"]:
+        return ChaCha20Poly1305(key)
+    raise ValueError(f"Unknown cipher id {cipher_id}")
+
+
+def new_key():
+    """Fresh random 32-byte key; keep it safe, the file cannot be read without it"""
+    return os.urandom(KEY_SIZE)
+
+
+def derive_key(passphrase, salt, log2_n=SCRYPT_LOG2_N):
+    """32-byte key from a passphrase with scrypt"""
+    low, high = SCRYPT_LOG2_N_RANGE
+    if not low <= log2_n <= high:
+        raise ValueError(f"scrypt cost 2**{log2_n} is outside the allowed 2**{low}..2**{high}")
+    n = 1 << log2_n
+    return hashlib.scrypt(passphrase.encode("utf-8"), salt=salt, n=n, r=8, p=1,
+                          maxmem=2 * 128 * 8 * n + (1 << 20), dklen=KEY_SIZE)
+
+
+def _resolve_key(key, passphrase, kdf, salt, log2_n):
+    if kdf == KDF_SCRYPT:
+        if passphrase is None:
+            raise ValueError("This export is protected by a passphrase")
+        return derive_key(passphrase, salt, log2_n)
+    if key is None or len(key) != KEY_SIZE:
+        raise ValueError(f"A {KEY_SIZE}-byte key is required")
+    return bytes(key)
+
+
+class EncryptedWriter:
+    """Write passwords to a binary file object as an encrypted, chunked stream"""
+
+    def __init__(self, out, key=None, passphrase=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                 cipher="aes-256-gcm"):
+        if cipher not in CIPHERS:
+            raise ValueError(f"Unknown cipher {cipher!r}; expected one of {', '.join(CIPHERS)}")
+        if not MIN_CHUNK_SIZE <= chunk_size < 1 << 32:
+            raise ValueError(f"chunk_size must be at least {MIN_CHUNK_SIZE} bytes")
+        if (key is None) == (passphrase is None):
+            raise ValueError("Give exactly one of key or passphrase")
+        kdf = KDF_SCRYPT if passphrase is not None else KDF_NONE
+        salt = os.urandom(SALT_SIZE)
+        self._aead = _aead(CIPHERS[cipher], _resolve_key(key, passphrase, kdf, salt,
+                                                         SCRYPT_LOG2_N))
+        self._header = _HEADER.pack(MAGIC, VERSION, CIPHERS[cipher], kdf, SCRYPT_LOG2_N,
+                                    chunk_size, salt, os.urandom(NONCE_PREFIX_SIZE))
+        self._header += bytes(HEADER_SIZE - len(self._header))
+        self._prefix = self._header[_HEADER.size - NONCE_PREFIX_SIZE:_HEADER.size]
+        self._out = out
+        self.chunk_size = chunk_size
+        self._capacity = chunk_size - _USED.size
+        self._pending = b""
+        self.chunks = 0
+        self.closed = False
+        out.write(self._header)
+
+    def _seal(self, records, final):
+        if self.chunks >= 1 << 32:
+            raise OverflowError("Too many chunks for one export")
+        plaintext = _USED.pack(len(records)) + records + bytes(self._capacity - len(records))
+        nonce = self._prefix + _COUNTER.pack(self.chunks, final)
+        self._out.write(self._aead.encrypt(nonce, plaintext, self._header))
+        self.chunks += 1
+
+    def write_block(self, data):
+        """Write newline-terminated records (bytes); they are sealed a chunk at a time"""
+        if self.closed:
+            raise ValueError("write to a closed EncryptedWriter")
+        data = self._pending + data
+        start = 0
+        capacity = self._capacity
+        # Seal only while more than a chunk is buffered: the last chunk must be flagged final
+        while len(data) - start > capacity:
+            cut = data.rfind(b"\n", start, start + capacity)
+            if cut < 0:
+                raise ValueError("A password is longer than the chunk size")
+            self._seal(data[start:cut + 1], False)
+            start = cut + 1
+        self._pending = data[start:]
+
+    def write(self, passwords):
+        """Write a list of password strings"""
+        text = "".join(p + "\n" for p in passwords)
+        if text.count("\n") != len(passwords):
+            raise ValueError("Passwords must not contain newlines")
+        self.write_block(text.encode("utf-8"))
+
+    def close(self):
+        """Seal the final chunk; the export is unreadable until this is called"""
+        if not self.closed:
+            self._seal(self._pending, True)
+            self._pending = b""
+            self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        # On error leave the stream unterminated so it cannot pass as complete
+        if exc_type is None:
+            self.close()
+        return False
+
+
+def export_encrypted(out, count, length, charset, key=None, passphrase=None,
+                     chunk_size=DEFAULT_CHUNK_SIZE, cipher="aes-256-gcm", randbytes=None):
+    """Generate count passwords straight into an encrypted export; returns the count"""
+    alphabet = alphabet_for(charset)
+    if "\n" in alphabet.chars:
+        raise ValueError("The character set must not contain newlines")
+    with EncryptedWriter(out, key, passphrase, chunk_size, cipher) as writer:
+        # About one chunk of passwords per generated block keeps memory flat
+        per_block = max(1, chunk_size // (length + 1))
+        for block in iter_framed(count, length, alphabet, "newline", per_block, randbytes):
+            writer.write_block(block)
+    return count
+
+
+class EncryptedReader:
+    """Random-access reader for an encrypted export (path or seekable binary file)"""
+
+    def __init__(self, source, key=None, passphrase=None):
+        self._owns = isinstance(source, (str, os.PathLike))
+        self._f = open(source, "rb") if self._owns else source
+        try:
+            self._f.seek(0)
+            header = self._f.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                raise ValueError("Not an encrypted export")
+            (magic, version, cipher_id, kdf, log2_n, chunk_size, salt,
+             prefix) = _HEADER.unpack_from(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("Not an encrypted export")
+            size = self._f.seek(0, os.SEEK_END)
+            self._stride = chunk_size + TAG_SIZE
+            body = size - HEADER_SIZE
+            if chunk_size < MIN_CHUNK_SIZE or body <= 0 or body % self._stride:
+                raise ValueError("Encrypted export is truncated or corrupted")
+            self._aead = _aead(cipher_id, _resolve_key(key, passphrase, kdf, salt, log2_n))
+        except BaseException:
+            self.close()
+            raise
+        self._header = header
+        self._prefix = prefix
+        self.chunk_size = chunk_size
+        self.chunk_count = body // self._stride
+
+    def read_chunk(self, k):
+        """Decrypt chunk k and return its newline-terminated records"""
+        from cryptography.exceptions import InvalidTag
+
+        if not 0 <= k < self.chunk_count:
+            raise IndexError(f"chunk {k} out of range (0..{self.chunk_count - 1})")
+        self._f.seek(HEADER_SIZE + k * self._stride)
+        sealed = self._f.read(self._stride)
+        nonce = self._prefix + _COUNTER.pack(k, k == self.chunk_count - 1)
+        try:
+            plaintext = self._aead.decrypt(nonce, sealed, self._header)
+        except InvalidTag:
+            raise ValueError(f"Chunk {k} failed authentication: wrong key, or the file "
+                             "was modified or truncated") from None
+        used, = _USED.unpack_from(plaintext)
+        return plaintext[_USED.size:_USED.size + used]
+
+    def passwords(self, k):
+        """The passwords stored in chunk k"""
+        return self.read_chunk(k).decode("utf-8").split("\n")[:-1]
+
+    def __iter__(self):
+        for k in range(self.chunk_count):
+            yield from self.passwords(k)
+
+    def close(self):
+        if self._owns and self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def main(argv=None):
+    """Command-line entry point: keygen, write and read encrypted exports"""
+    import argparse
+    import string
+
+    parser = argparse.ArgumentParser(description="Encrypted bulk export of generated passwords")
+    sub = parser.add_subparsers(dest="command", required=True)
+    keygen = sub.add_parser("keygen", help="write a new random key file")
+    keygen.add_argument("path")
+    write = sub.add_parser("write", help="generate passwords into an encrypted file")
+    write.add_argument("--count", type=int, required=True)
+    write.add_argument("--length", type=int, default=16)
+    write.add_argument("--charset", default=string.ascii_letters + string.digits + string.punctuation)
+    write.add_argument("--cipher", choices=CIPHERS, default="aes-256-gcm")
+    write.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    write.add_argument("-o", "--output", required=True)
+    read = sub.add_parser("read", help="decrypt to stdout, optionally a single chunk")
+    read.add_argument("path")
+    read.add_argument("--chunk", type=int, help="only this chunk (0-based)")
+    for command in (write, read):
+        command.add_argument("--key-file", help="raw key from `keygen` (default: ask for a passphrase)")
+    args = parser.parse_args(argv)
+
+    if args.command == "keygen":
+        fd = os.open(args.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(new_key())
+        return 0
+
+    key = passphrase = None
+    if args.key_file:
+        with open(args.key_file, "rb") as f:
+            key = f.read()
+    else:
+        passphrase = getpass.getpass("Passphrase: ")
+        if args.command == "write" and getpass.getpass("Repeat passphrase: ") != passphrase:
+            parser.error("passphrases do not match")
+
+    try:
+        if args.command == "write":
+            if args.length <= 0 or args.count < 0:
+                parser.error("--length must be positive and --count must not be negative")
+            with open(args.output, "wb") as out:
+                export_encrypted(out, args.count, args.length, args.charset, key, passphrase,
+                                 args.chunk_size, args.cipher)
+        else:
+            out = sys.stdout.buffer
+            with EncryptedReader(args.path, key, passphrase) as reader:
+                chunks = [args.chunk] if args.chunk is not None else range(reader.chunk_count)
+                for k in chunks:
+                    out.write(reader.read_chunk(k))
+            out.flush()
+    except (ImportError, IndexError, ValueError) as e:
+        parser.error(str(e))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Background batch generation for interactive front ends.
+
+A BatchJob generates a large batch on a worker thread in modest chunks and
+publishes each chunk on a queue. A UI thread polls the queue (e.g. from
+Tk's root.after) and never blocks. Chunks are kept small so no single C-level
+call holds the GIL for long, and the job can be cancelled between chunks.
+
+By default chunks come from the plain batch generator; pass any object
+with a generate_batch(n) method (e.g. a policy.ConstrainedGenerator) as
+`generator` to apply its rules to every password in the batch.
+"""
+
+import queue
+import threading
+
+from .core import generate_batch
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+class BatchJob:
+    """Generate `count` passwords on a worker thread, chunk by chunk"""
+
+    def __init__(self, count, length, charset, chunk_size=DEFAULT_CHUNK_SIZE, generator=None):
+        if count < 0:
+            raise ValueError("Password count must not be negative")
+        if length <= 0:
+            raise ValueError("Password length must be positive")
+        self.count = count
+        self.length = length
+        self.charset = charset
+        self.generator = generator
+        # Keep each chunk to roughly a megabyte of output however long the passwords are
+        self.chunk_size = max(1, min(chunk_size, (1 << 20) // length))
+        self.generated = 0
+        self.error = None
+        self.chunks = queue.Queue()
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="batch-job", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            while self.generated < self.count and not self._cancel.is_set():
+                n = min(self.chunk_size, self.count - self.generated)
+                if self.generator is None:
+                    chunk = generate_batch(n, self.length, self.charset)
+                else:
+                    chunk = self.generator.generate_batch(n)
+                self.chunks.put(chunk)
+                self.generated += n
+        except Exception as e:  # surfaced to the UI through .error
+            self.error = e
+        finally:
+            self._done.set()
+
+    def cancel(self):
+        """Ask the worker to stop after the chunk in progress"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def drain(self, max_chunks=None):
+        """Return every chunk published since the last call, without blocking"""
+        out = []
+        while max_chunks is None or len(out) < max_chunks:
+            try:
+                out.append(self.chunks.get_nowait())
+            except queue.Empty:
+                break
+        return out
+
+    def join(self, timeout=None):
+        self._done.wait(timeout)
+        return self.done
@@ -0,0 +1,184 @@
+"""
+Exhaustive short-code issuing by sampling without replacement.
+
+For small keyspaces (e.g. 4-6 digit PINs) random draws collide long before
+the space runs out. Here index i in [0, N) with N = alphabet_size ** length
+is mapped through a keyed pseudorandom permutation of [0, N) and the result
+is written out as a code. Issuing indices 0, 1, 2, ... therefore yields every
+code exactly once, in an order that is unpredictable without the key.
+
+The permutation is a balanced Feistel network over [0, a*a) with
+a = ceil(sqrt(N)), keyed BLAKE2b as the round function and cycle-walking to
+stay inside [0, N). The only state is the key and a cursor, so memory is
+O(1) for keyspaces up to 10**12 and beyond. Disjoint index ranges can be
+issued by separate workers in parallel (see split_range), and a cursor saved
+with save_cursor can resume issuing later.
+"""
+
+import hashlib
+import json
+import math
+import os
+import secrets
+
+from .charsets import alphabet_for
+
+DEFAULT_ROUNDS = 8
+KEY_SIZE = 32
+
+
+def new_key():
+    """Fresh random key for a CodeSequence; store it securely, it is not in the cursor"""
+    return secrets.token_bytes(KEY_SIZE)
+
+
+class CodeSequence:
+    """Keyed permutation of every length-character code over an alphabet"""
+
+    def __init__(self, key, charset, length, rounds=DEFAULT_ROUNDS):
+        if not key:
+            raise ValueError("A non-empty key is required")
+        if len(key) > hashlib.blake2b.MAX_KEY_SIZE:
+            raise ValueError(f"Key must be at most {hashlib.blake2b.MAX_KEY_SIZE} bytes")
+        if length <= 0:
+            raise ValueError("Code length must be positive")
+        self.alphabet = alphabet_for(charset)
+        if self.alphabet.size < 2:
+            raise ValueError("Alphabet needs at least 2 symbols")
+        self.length = length
+        self.size = self.alphabet.size ** length
+        self.rounds = rounds
+        self._half = math.isqrt(self.size - 1) + 1
+        self._half_bytes = (self._half.bit_length() + 7) // 8 or 1
+        self._positions = {c: i for i, c in enumerate(self.alphabet.chars)}
+        # One keyed hasher per round, copied per call to skip re-keying
+        self._round_hashers = []
+        for r in range(rounds):
+            hasher = hashlib.blake2b(key=bytes(key), digest_size=8)
+            hasher.update(bytes((r,)))
+            self._round_hashers.append(hasher)
+
+    def _round(self, r, value):
+        hasher = self._round_hashers[r].copy()
+        hasher.update(value.to_bytes(self._half_bytes, "big"))
+        return int.from_bytes(hasher.digest(), "big") % self._half
+
+    def _encrypt(self, x):
+        a = self._half
+        left, right = divmod(x, a)
+        for r in range(self.rounds):
+            left, right = right, (left + self._round(r, right)) % a
+        return left * a + right
+
+    def _decrypt(self, y):
+        a = self._half
+        left, right = divmod(y, a)
+        for r in reversed(range(self.rounds)):
+            left, right = (right - self._round(r, left)) % a, left
+        return left * a + right
+
+    def permute(self, index):
+        """Position of index under the keyed permutation of [0, size)"""
+        if not 0 <= index < self.size:
+            raise IndexError("index outside the keyspace")
+        value = self._encrypt(index)
+        # Cycle-walk: the Feistel domain a*a is slightly larger than size
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+    def unpermute(self, value):
+        """Inverse of permute"""
+        if not 0 <= value < self.size:
+            raise IndexError("value outside the keyspace")
+        index = self._decrypt(value)
+        while index >= self.size:
+            index = self._decrypt(index)
+        return index
+
+    def _format(self, value):
+        chars = self.alphabet.chars
+        k = self.alphabet.size
+        out = []
+        for _ in range(self.length):
+            value, digit = divmod(value, k)
+            out.append(chars[digit])
+        return ''.join(reversed(out))
+
+    def code_at(self, index):
+        """The index-th issued code"""
+        return self._format(self.permute(index))
+
+    def index_of(self, code):
+        """The issue index of a code, e.g. to check it was issued before a cursor"""
+        if len(code) != self.length:
+            raise ValueError(f"code must be {self.length} characters")
+        positions = self._positions
+        value = 0
+        for c in code:
+            if c not in positions:
+                raise ValueError(f"{c!r} is not in the code alphabet")
+            value = value * self.alphabet.size + positions[c]
+        return self.unpermute(value)
+
+    def iter_codes(self, start=0, stop=None):
+        """Yield the codes issued at indices [start, stop)"""
+        stop = self.size if stop is None else min(stop, self.size)
+        for index in range(start, stop):
+            yield self.code_at(index)
+
+
+class CodeIssuer:
+    """Hands out codes from a (sub)range of a CodeSequence, tracking a resumable cursor"""
+
+    def __init__(self, sequence, start=0, stop=None, cursor=None):
+        self.sequence = sequence
+        self.start = start
+        self.stop = sequence.size if stop is None else stop
+        self.cursor = start if cursor is None else cursor
+        if not 0 <= self.start <= self.cursor <= self.stop <= sequence.size:
+            raise ValueError("cursor must lie within 0 <= start <= cursor <= stop <= size")
+
+    @property
+    def remaining(self):
+        return self.stop - self.cursor
+
+    def issue(self, count):
+        """Return up to count new codes and advance the cursor"""
+        end = min(self.cursor + count, self.stop)
+        codes = list(self.sequence.iter_codes(self.cursor, end))
+        self.cursor = end
+        return codes
+
+    def state(self):
+        return {"start": self.start, "stop": self.stop, "cursor": self.cursor,
+                "size": self.sequence.size}
+
+
+def split_range(size, workers):
+    """Split [0, size) into `workers` disjoint contiguous ranges"""
+    base, extra = divmod(size, workers)
+    ranges = []
+    start = 0
+    for i in range(workers):
+        stop = start + base + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def save_cursor(path, issuer):
+    """Persist an issuer's range and cursor (never the key) atomically"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(issuer.state(), f)
+    os.replace(tmp, path)
+
+
+def load_cursor(path, sequence):
+    """Resume a CodeIssuer from a cursor file written by save_cursor"""
+    with open(path) as f:
+        state = json.load(f)
+    if state["size"] != sequence.size:
+        raise ValueError("cursor file belongs to a different keyspace")
+    return CodeIssuer(sequence, state["start"], state["stop"], state["cursor"])
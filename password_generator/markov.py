@@ -0,0 +1,326 @@
+"""
+Pronounceable passwords sampled from a precompiled trigram (order-2 Markov) model.
+
+Each character is drawn conditioned on the two before it, using letter
+transition counts from a corpus of words. The model is compiled once into a
+compact binary file and memory-mapped:
+
+    header   MODEL_MAGIC, version, symbol count k, resolution bits
+    symbols  the k letters
+    table    (k + 1) ** 2 states x k uint16 cumulative weights
+
+A state is the pair of previous letters, with 0 standing for "start". Each
+state's weights are quantized to integers summing to exactly 2 ** bits
+(RESOLUTION_BITS by default), so sampling is exact: one uniform draw of
+`bits` random bits, then a binary search over the state's k cumulative
+weights (O(log k)). Batch generation with NumPy expands the table once into a
+flat lookup array and samples every password's next character at once with
+a single indexing operation per position (O(1) per character).
+
+States the corpus never reaches back off to the bigram and then unigram
+distribution, so every state has a full distribution.
+
+Because the distribution is known exactly, the entropy reported is the
+model's true entropy for a password of the given length: entropy_bits is the
+Shannon entropy and min_entropy_bits is -log2 of the single most likely
+password (what a guesser trying the likeliest first must beat). Both are far
+below length * log2(26); that is the price of pronounceability.
+
+Build a model from any word list with:
+
+    python -m password_generator.markov build words.txt model.pwmk
+"""
+
+import math
+import mmap
+import os
+import string
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+
+from .passphrase import DEFAULT_WORDLIST, read_words
+
+MODEL_MAGIC = b"PWMK"
+VERSION = 1
+RESOLUTION_BITS = 12
+_HEADER = struct.Struct("<4sHHH")
+
+LETTERS = string.ascii_lowercase
+DEFAULT_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "trigram.pwmk")
+# The bundled model is built from the bundled passphrase wordlist
+DEFAULT_CORPUS = DEFAULT_WORDLIST[:-len(".pwwl")] + ".txt"
+
+
+def _quantize(counts, total_units):
+    """Integer weights summing to total_units, every nonzero count getting at least 1"""
+    total = sum(counts)
+    weights = [max(1, c * total_units // total) if c else 0 for c in counts]
+    # Largest-remainder correction so the weights sum exactly to total_units
+    order = sorted((i for i, c in enumerate(counts) if c),
+                   key=lambda i: counts[i] * total_units / total - weights[i])
+    diff = total_units - sum(weights)
+    while diff:
+        step = 1 if diff > 0 else -1
+        candidates = order[::-1] if step > 0 else [i for i in order if weights[i] > 1]
+        for i in candidates[:abs(diff)]:
+            weights[i] += step
+            diff -= step
+    return weights
+
+
+def build_model(source, dest, resolution_bits=RESOLUTION_BITS):
+    """
+    Compile a trigram model from a word list (path or iterable of lines; the
+    last field of each line, lowercased, letters a-z only). Returns the number
+    of words used.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as f:
+            return build_model(f, dest, resolution_bits)
+    # At least one unit per letter, and a total of 2 ** bits that fits in uint16
+    if not 8 <= resolution_bits <= 15:
+        raise ValueError("resolution_bits must be between 8 and 15")
+
+    k = len(LETTERS)
+    states = (k + 1) ** 2
+    trigram = [[0] * k for _ in range(states)]
+    bigram = [[0] * k for _ in range(k + 1)]
+    unigram = [0] * k
+    words = 0
+    for word in read_words(source):
+        letters = [LETTERS.index(c) + 1 for c in word.lower() if c in LETTERS]
+        if not letters:
+            continue
+        words += 1
+        a = b = 0
+        for c in letters:
+            trigram[a * (k + 1) + b][c - 1] += 1
+            bigram[b][c - 1] += 1
+            unigram[c - 1] += 1
+            a, b = b, c
+    if not words:
+        raise ValueError("The corpus contains no words")
+
+    units = 1 << resolution_bits
+    table = array('H')
+    for state in range(states):
+        counts = trigram[state]
+        if not any(counts):
+            counts = bigram[state % (k + 1)]
+        if not any(counts):
+            counts = unigram
+        cumulative = 0
+        for weight in _quantize(counts, units):
+            cumulative += weight
+            table.append(cumulative)
+    if sys.byteorder != "little":
+        table.byteswap()
+
+    tmp = f"{dest}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MODEL_MAGIC, VERSION, k, resolution_bits))
+        f.write(LETTERS.encode("ascii"))
+        f.write(table.tobytes())
+    os.replace(tmp, dest)
+    return words
+
+
+class TrigramModel:
+    """Read-only, memory-mapped trigram model"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, k, bits = _HEADER.unpack_from(self._mm)
+        if magic != MODEL_MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a trigram model")
+        self.path = path
+        self.k = k
+        self.bits = bits
+        self.states = (k + 1) ** 2
+        start = _HEADER.size
+        self.symbols = self._mm[start:start + k]
+        start += k
+        end = start + 2 * self.states * k
+        if sys.byteorder == "little":
+            self.table = memoryview(self._mm)[start:end].cast('H')
+        else:
+            self.table = array('H', self._mm[start:end])
+            self.table.byteswap()
+        self._lookup = None
+        self._entropy = {}  # length -> (Shannon, min) entropy, computed once per model
+
+    def weights(self, state):
+        """Quantized weights (summing to 2 ** bits) of the next letter in state"""
+        row = self.table[state * self.k:(state + 1) * self.k]
+        return [hi - lo for lo, hi in zip([0] + list(row[:-1]), row)]
+
+    def next_state(self, state, symbol):
+        return (state % (self.k + 1)) * (self.k + 1) + symbol + 1
+
+    def sample(self, state, r):
+        """Symbol index drawn in state for a uniform r in [0, 2 ** bits)"""
+        base = state * self.k
+        return bisect_right(self.table, r, base, base + self.k) - base
+
+    def lookup(self):
+        """Flat NumPy array: lookup[state << bits | r] is the sampled symbol (built once)"""
+        if self._lookup is None:
+            import numpy as np
+
+            cumulative = np.frombuffer(bytes(self.table), dtype=np.uint16).reshape(-1, self.k)
+            widths = np.diff(cumulative.astype(np.int64), axis=1, prepend=0)
+            symbols = np.tile(np.arange(self.k, dtype=np.uint8), self.states)
+            self._lookup = np.repeat(symbols, widths.ravel())
+        return self._lookup
+
+    def entropy(self, length):
+        """(Shannon, min) entropy in bits of a length-letter password"""
+        if length not in self._entropy:
+            self._entropy[length] = self._compute_entropy(length)
+        return self._entropy[length]
+
+    def _compute_entropy(self, length):
+        units = 1 << self.bits
+        row_entropy = []
+        row_probs = []
+        for state in range(self.states):
+            probs = [w / units for w in self.weights(state)]
+            row_probs.append(probs)
+            row_entropy.append(-sum(p * math.log2(p) for p in probs if p))
+        shannon = 0.0
+        dist = {0: 1.0}
+        best = {0: 0.0}  # state -> max log2 probability of reaching it
+        for _ in range(length):
+            next_dist = {}
+            next_best = {}
+            for state, p_state in dist.items():
+                shannon += p_state * row_entropy[state]
+                for symbol, p in enumerate(row_probs[state]):
+                    if p:
+                        nxt = self.next_state(state, symbol)
+                        next_dist[nxt] = next_dist.get(nxt, 0.0) + p_state * p
+            for state, logp in best.items():
+                for symbol, p in enumerate(row_probs[state]):
+                    if p:
+                        nxt = self.next_state(state, symbol)
+                        value = logp + math.log2(p)
+                        if value > next_best.get(nxt, -math.inf):
+                            next_best[nxt] = value
+            dist, best = next_dist, next_best
+        return shannon, -max(best.values())
+
+    def surprisal(self, password):
+        """-log2 P(password) under the model (inf if the model cannot produce it)"""
+        units = 1 << self.bits
+        state = 0
+        bits = 0.0
+        for c in password:
+            symbol = self.symbols.find(c.lower().encode("ascii", "replace"))
+            weight = self.weights(state)[symbol] if symbol >= 0 else 0
+            if not weight:
+                return math.inf
+            bits -= math.log2(weight / units)
+            state = self.next_state(state, symbol)
+        return bits
+
+
+@lru_cache(maxsize=8)
+def load_model(path=None):
+    """Open (once per path) a compiled model; the bundled one by default"""
+    return TrigramModel(path or DEFAULT_MODEL)
+
+
+class MarkovGenerator:
+    """Pronounceable passwords of a fixed length from a trigram model"""
+
+    def __init__(self, length=12, model=None, capitalize=False, randbytes=None):
+        if length <= 0:
+            raise ValueError("Password length must be positive")
+        if model is None or isinstance(model, (str, os.PathLike)):
+            model = load_model(model)
+        self.length = length
+        self.model = model
+        self.capitalize = capitalize
+        self._randbytes = randbytes or os.urandom
+        self._mask = (1 << model.bits) - 1
+
+    @property
+    def entropy_bits(self):
+        """True Shannon entropy of one password (capitalization adds none)"""
+        return self.model.entropy(self.length)[0]
+
+    @property
+    def min_entropy_bits(self):
+        """-log2 of the probability of the single most likely password"""
+        return self.model.entropy(self.length)[1]
+
+    def _finish(self, text):
+        return text[:1].upper() + text[1:] if self.capitalize else text
+
+    def generate(self):
+        """Return one password"""
+        model, mask = self.model, self._mask
+        draws = array('H')
+        draws.frombytes(self._randbytes(2 * self.length))
+        symbols = model.symbols
+        out = bytearray()
+        state = 0
+        for r in draws:
+            symbol = model.sample(state, r & mask)
+            out.append(symbols[symbol])
+            state = model.next_state(state, symbol)
+        return self._finish(out.decode("ascii"))
+
+    def generate_batch(self, n):
+        """Return a list of n passwords, all positions sampled at once with NumPy if present"""
+        try:
+            import numpy as np
+        except ImportError:  # pragma: no cover - exercised when NumPy is absent
+            return [self.generate() for _ in range(n)]
+
+        model, length = self.model, self.length
+        lookup = model.lookup()
+        draws = np.frombuffer(self._randbytes(2 * n * length), dtype=np.uint16)
+        draws = (draws & self._mask).reshape(n, length)
+        out = np.empty((n, length), dtype=np.uint8)
+        state = np.zeros(n, dtype=np.int64)
+        for i in range(length):
+            symbol = lookup[(state << model.bits) | draws[:, i]]
+            out[:, i] = symbol
+            state = (state % (model.k + 1)) * (model.k + 1) + symbol + 1
+        letters = np.frombuffer(model.symbols, dtype=np.uint8)[out]
+        text = letters.tobytes().decode("ascii")
+        finish = self._finish
+        return [finish(text[i:i + length]) for i in range(0, n * length, length)]
+
+
+def generate_pronounceable(length=12, model=None, capitalize=False, randbytes=None):
+    """Return one pronounceable password from the bundled (or given) model"""
+    return MarkovGenerator(length, model, capitalize, randbytes).generate()
+
+
+def main(argv=None):
+    """python -m password_generator.markov build WORDLIST DEST"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile a trigram model for pronounceable mode.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="compile a model from a one-word-per-line list")
+    build.add_argument("source")
+    build.add_argument("dest")
+    build.add_argument("--bits", type=int, default=RESOLUTION_BITS,
+                       help=f"probability resolution in bits (default {RESOLUTION_BITS})")
+    args = parser.parse_args(argv)
+
+    words = build_model(args.source, args.dest, args.bits)
+    print(f"Built a trigram model from {words:,} words into {args.dest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
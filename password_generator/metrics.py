@@ -0,0 +1,217 @@
+"""
+Opt-in instrumentation for the generation hot path.
+
+Entry points wrap each stage of a generation call in `stage(name)`:
+
+    charset_build   compiling the character set
+    entropy_fetch   reading random bytes (via entropy_source)
+    mapping         turning random bytes into characters
+    strength        scoring the result
+    output          printing / displaying it
+
+Stage times are self times: time spent in a nested stage (entropy fetches
+inside mapping) is recorded against the nested stage only. The open stage
+is tracked in a context variable, so threads and concurrent asyncio tasks
+each nest their own stages even when a stage is held open across an await. Each stage feeds
+a latency histogram, and entropy_source also counts the bytes it hands out.
+
+Instrumentation is off by default. While it is off, stage() returns one
+shared no-op context manager and entropy_source() returns its argument
+unchanged, so the generation path runs exactly as if it were not there.
+Enable it with enable(), or by setting PASSWORD_GENERATOR_METRICS to a file
+path (see enable_from_env): the registry is then written there in
+Prometheus text format when the process exits, ready for a node_exporter
+textfile collector. The HTTP service also exposes it at /metrics.
+"""
+
+import atexit
+import contextvars
+import os
+import threading
+import time
+from bisect import bisect_left
+
+METRICS_ENV = "PASSWORD_GENERATOR_METRICS"
+PREFIX = "password_generator"
+
+STAGES = ("charset_build", "entropy_fetch", "mapping", "strength", "output")
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+           1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+
+COUNTERS = {
+    "entropy_bytes": "Bytes of random data consumed",
+}
+
+_enabled = False
+_current = contextvars.ContextVar("password_generator_stage", default=None)
+_exit_paths = set()
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (non-cumulative counts; +Inf is the last slot)"""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+class Registry:
+    """Per-stage histograms and named counters, safe to update from any thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+            self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def render(self):
+        """The registry in Prometheus text exposition format"""
+        lines = [
+            f"# HELP {PREFIX}_stage_seconds Self time per generation stage",
+            f"# TYPE {PREFIX}_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage in sorted(self.histograms):
+                histogram = self.histograms[stage]
+                cumulative = 0
+                for bound, n in zip(BUCKETS + ("+Inf",), histogram.counts):
+                    cumulative += n
+                    lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} '
+                                 f'{cumulative}')
+                lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{stage}"}} {histogram.sum!r}')
+                lines.append(f'{PREFIX}_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+            for name in sorted(self.counters):
+                metric = f"{PREFIX}_{name}_total"
+                lines.append(f"# HELP {metric} {COUNTERS.get(name, name)}")
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {self.counters[name]}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Stage:
+    """Times one stage, charging nested stages' time to themselves"""
+
+    __slots__ = ("name", "start", "nested", "parent", "token")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.parent = _current.get()
+        self.token = _current.set(self)
+        self.nested = 0.0
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        _current.reset(self.token)
+        if self.parent is not None:
+            self.parent.nested += elapsed
+        REGISTRY.observe(self.name, elapsed - self.nested)
+        return False
+
+
+class _NullStage:
+    """Shared do-nothing stage used while instrumentation is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name):
+    """Context manager timing one stage; a no-op while disabled"""
+    return _Stage(name) if _enabled else _NULL_STAGE
+
+
+def entropy_source(randbytes=None):
+    """
+    Wrap a randbytes function so fetches are timed and counted. While disabled
+    the argument is returned untouched (None keeps the callee's default).
+    """
+    if not _enabled:
+        return randbytes
+    if randbytes is None:
+        from .entropy import default_pool
+
+        randbytes = default_pool().read
+
+    def read(n):
+        with _Stage("entropy_fetch"):
+            data = randbytes(n)
+        REGISTRY.inc("entropy_bytes", len(data))
+        return data
+
+    return read
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def write_prometheus(path, registry=REGISTRY):
+    """Atomically write the registry to path in Prometheus text format"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(registry.render())
+    os.replace(tmp, path)
+
+
+def enable_from_env():
+    """
+    Turn instrumentation on if PASSWORD_GENERATOR_METRICS names a file, and
+    write the metrics there at exit. Returns the path, or None.
+    """
+    path = os.environ.get(METRICS_ENV)
+    if path:
+        enable()
+        # Entry points launched repeatedly in one process register the exit hook once
+        if path not in _exit_paths:
+            _exit_paths.add(path)
+            atexit.register(write_prometheus, path)
+    return path
@@ -0,0 +1,87 @@
+"""
+Multi-core batch generation by sharding a request across a process pool.
+
+The parent allocates one shared-memory block sized for the whole batch
+(n * length bytes of fixed-width records). Each worker fills its own slice
+in place, so results never travel back as pickled lists of strings; only the
+shard bounds go over the pipe. Every worker reads its own entropy straight
+from the OS CSPRNG (os.urandom), which is safe to use after fork and needs
+no per-process seeding.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .core import random_bytes
+
+
+def default_workers():
+    """Number of worker processes to use when none is given"""
+    return os.cpu_count() or 1
+
+
+def _shard_bounds(n, shards):
+    """Split n records into contiguous (start, count) shards of near-equal size"""
+    base, extra = divmod(n, shards)
+    start = 0
+    for i in range(shards):
+        count = base + (1 if i < extra else 0)
+        if count:
+            yield start, count
+        start += count
+
+
+def _fill_shard(shm_name, start, count, length, charset):
+    """Worker: generate count records and write them into the shared block"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        offset = start * length
+        shm.buf[offset:offset + count * length] = random_bytes(count * length, charset)
+    finally:
+        shm.close()
+    return count
+
+
+def generate_parallel_buffer(n, length, charset, workers=None, executor=None):
+    """Return n fixed-width passwords as one bytes buffer of n * length bytes
+
+    Pass an existing ProcessPoolExecutor as executor to reuse warm workers
+    across calls; otherwise a pool of `workers` processes is created.
+    """
+    if n < 0:
+        raise ValueError("Password count must not be negative")
+    if length <= 0:
+        raise ValueError("Password length must be positive")
+    # Validate the charset in the parent so errors surface before forking
+    random_bytes(0, charset)
+
+    workers = workers or default_workers()
+    if n == 0:
+        return b''
+    if workers == 1 and executor is None:
+        return random_bytes(n * length, charset)
+
+    shm = shared_memory.SharedMemory(create=True, size=n * length)
+    try:
+        pool = executor or ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [
+                pool.submit(_fill_shard, shm.name, start, count, length, charset)
+                for start, count in _shard_bounds(n, workers)
+            ]
+            for future in futures:
+                future.result()
+        finally:
+            if executor is None:
+                pool.shutdown()
+        return bytes(shm.buf[:n * length])
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def generate_parallel(n, length, charset, workers=None, executor=None):
+    """Parallel counterpart of generate_batch returning a list of password strings"""
+    data = generate_parallel_buffer(n, length, charset, workers, executor).decode('latin-1')
+    return [data[i:i + length] for i in range(0, n * length, length)]
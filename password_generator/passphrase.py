@@ -0,0 +1,225 @@
+"""
+Diceware-style passphrases drawn from an indexed, memory-mapped wordlist.
+
+Wordlists are compiled once into a compact binary file and memory-mapped, so
+opening even a multi-million word list costs a header read rather than a
+parse of a text file:
+
+    header   WORDLIST_MAGIC, version, word count (little-endian)
+    offsets  count + 1 uint32 byte offsets into the blob
+    blob     the UTF-8 words, back to back
+
+Word i is blob[offsets[i]:offsets[i + 1]], so any word is reachable in O(1)
+without touching the rest of the file. Words are picked by index with
+32-bit rejection sampling, so every word is equally likely whatever the
+list size.
+
+The bundled list (data/wordlist.pwwl, built from data/wordlist.txt) is a
+short list of common, unambiguous English words. Larger lists such as the
+EFF large list (7776 words) can be compiled with:
+
+    python -m password_generator.passphrase build eff_large_wordlist.txt words.pwwl
+"""
+
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from functools import lru_cache
+
+from .policy import IndexSource
+
+WORDLIST_MAGIC = b"PWWL"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHQ")
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_WORDLIST = os.path.join(DATA_DIR, "wordlist.pwwl")
+
+CAPITALIZE = ("none", "first", "random")
+
+
+def read_words(lines):
+    """
+    Yield words from a text wordlist, one per line. Diceware lists prefix each
+    word with its dice roll ("11111<TAB>abacus"); only the last field is kept.
+    Blank lines and '#' comments are skipped.
+    """
+    for line in lines:
+        fields = line.split()
+        if fields and not fields[0].startswith("#"):
+            yield fields[-1]
+
+
+def build_wordlist(source, dest):
+    """
+    Compile a text wordlist (path or iterable of lines) into the binary format.
+    Duplicates are dropped, since a repeated word would be picked more often.
+    Returns the number of words written.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as f:
+            return build_wordlist(f, dest)
+
+    seen = set()
+    offsets = array('I', [0])
+    blob = bytearray()
+    for word in read_words(source):
+        if word in seen:
+            continue
+        seen.add(word)
+        blob += word.encode("utf-8")
+        if len(blob) >= 1 << 32:
+            raise ValueError("Wordlist is too large (4 GiB of words)")
+        offsets.append(len(blob))
+    count = len(offsets) - 1
+    if count < 2:
+        raise ValueError("A wordlist needs at least two distinct words")
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    tmp = f"{dest}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(WORDLIST_MAGIC, VERSION, 0, count))
+        f.write(offsets.tobytes())
+        f.write(blob)
+    os.replace(tmp, dest)
+    return count
+
+
+class Wordlist:
+    """Read-only, memory-mapped view of a compiled wordlist"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count = _HEADER.unpack_from(self._mm)
+        if magic != WORDLIST_MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a compiled wordlist")
+        self.path = path
+        self.size = count
+        start = _HEADER.size
+        self._blob_start = start + 4 * (count + 1)
+        if sys.byteorder == "little":
+            self._offsets = memoryview(self._mm)[start:self._blob_start].cast('I')
+        else:
+            self._offsets = array('I', self._mm[start:self._blob_start])
+            self._offsets.byteswap()
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if not -self.size <= index < self.size:
+            raise IndexError("word index out of range")
+        index %= self.size
+        base = self._blob_start
+        return self._mm[base + self._offsets[index]:base + self._offsets[index + 1]].decode("utf-8")
+
+    @property
+    def bits_per_word(self):
+        return math.log2(self.size)
+
+    def close(self):
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@lru_cache(maxsize=8)
+def load_wordlist(path=None):
+    """Open (once per path) a compiled wordlist; the bundled list by default"""
+    return Wordlist(path or DEFAULT_WORDLIST)
+
+
+class PassphraseGenerator:
+    """
+    Precompiled passphrase options.
+
+    capitalize: "none", "first" (every word capitalized) or "random" (each
+    word capitalized with probability 1/2, adding one bit per word).
+    digits: number of random digits appended to one randomly chosen word.
+    """
+
+    def __init__(self, words=6, wordlist=None, separator="-", capitalize="none", digits=0,
+                 randbytes=None):
+        if words <= 0:
+            raise ValueError("A passphrase needs at least one word")
+        if digits < 0:
+            raise ValueError("Digit count must not be negative")
+        if capitalize not in CAPITALIZE:
+            raise ValueError(f"capitalize must be one of {', '.join(CAPITALIZE)}")
+        if wordlist is None or isinstance(wordlist, (str, os.PathLike)):
+            wordlist = load_wordlist(wordlist)
+        self.words = words
+        self.wordlist = wordlist
+        self.separator = separator
+        self.capitalize = capitalize
+        self.digits = digits
+        self._source = IndexSource(randbytes, 2 * words + digits + 2)
+
+    @property
+    def entropy_bits(self):
+        """Entropy of one passphrase, assuming the attacker knows the options"""
+        bits = self.words * math.log2(len(self.wordlist))
+        if self.capitalize == "random":
+            bits += self.words
+        if self.digits:
+            bits += self.digits * math.log2(10) + math.log2(self.words)
+        return bits
+
+    def generate(self):
+        """Return one passphrase"""
+        below = self._source.below
+        wordlist = self.wordlist
+        size = len(wordlist)
+        words = [wordlist[below(size)] for _ in range(self.words)]
+        if self.capitalize == "first":
+            words = [w.capitalize() for w in words]
+        elif self.capitalize == "random":
+            words = [w.capitalize() if below(2) else w for w in words]
+        if self.digits:
+            i = below(self.words)
+            words[i] += "".join([str(below(10)) for _ in range(self.digits)])
+        return self.separator.join(words)
+
+    def generate_batch(self, n):
+        """Return a list of n passphrases"""
+        generate = self.generate
+        return [generate() for _ in range(n)]
+
+
+def generate_passphrase(words=6, wordlist=None, separator="-", capitalize="none", digits=0,
+                        randbytes=None):
+    """Return one passphrase of `words` words from the bundled (or given) wordlist"""
+    return PassphraseGenerator(words, wordlist, separator, capitalize, digits,
+                               randbytes).generate()
+
+
+def main(argv=None):
+    """python -m password_generator.passphrase build SOURCE DEST"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile a text wordlist for passphrase mode.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="compile a one-word-per-line (or diceware) text list")
+    build.add_argument("source")
+    build.add_argument("dest")
+    args = parser.parse_args(argv)
+
+    count = build_wordlist(args.source, args.dest)
+    print(f"Wrote {count:,} words ({math.log2(count):.2f} bits/word) to {args.dest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Policy-constrained generation that satisfies every rule by construction.
+
+Rules such as "at least 2 digits and 1 symbol, no repeated characters, no
+3-character sequences" are met without generate-and-reject loops, so the
+cost of a password is bounded by its length:
+
+1. Build a slot pattern: one slot per required class member (the minimum
+   counts), with the remaining slots open to the whole alphabet.
+2. Shuffle the pattern with an unbiased Fisher-Yates shuffle.
+3. Fill the slots left to right, each drawn uniformly from its class. Any
+   symbol that would break an adjacency rule is removed from that draw. At
+   most two symbols are ever removed (the previous one, and the one that
+   would extend a run like "ab" into "abc"), so a draw can never fail.
+
+"No repeats" forbids identical adjacent characters ("aa"). "No sequences"
+forbids three consecutive code points ascending or descending ("abc",
+"321"). All random indices come from bulk OS entropy, with 32-bit rejection
+sampling so none of them is biased. Without adjacency rules the slots are
+independent, so each class's symbols are drawn for the whole batch in bulk
+and only the shuffle runs per password.
+"""
+
+import os
+import string
+from array import array
+from itertools import chain
+
+from .charsets import alphabet_for, compile_charset
+from .core import random_string
+
+CLASS_CHARS = {
+    "upper": string.ascii_uppercase,
+    "lower": string.ascii_lowercase,
+    "digits": string.digits,
+    "symbols": string.punctuation,
+}
+
+_ENTROPY_WORDS = 4096
+_SPAN = 1 << 32
+
+
+def _limit(n):
+    """Rejection threshold for drawing below n from 32-bit words"""
+    return _SPAN - _SPAN % n
+
+
+class IndexSource:
+    """Unbiased random integers below n, drawn from bulk entropy 32 bits at a time
+
+    The first read is `words` 32-bit words, sized to what the caller expects
+    to need; each later read doubles, up to _ENTROPY_WORDS, so one-off use
+    stays cheap while long runs still read in bulk.
+    """
+
+    def __init__(self, randbytes=None, words=16):
+        self._randbytes = randbytes or os.urandom
+        # next_word is a C-level iterator; Python code only runs once per block
+        self.next_word = chain.from_iterable(self._blocks(max(1, words))).__next__
+
+    def _blocks(self, words):
+        while True:
+            block = array('I')
+            block.frombytes(self._randbytes(words * 4))
+            yield block
+            words = min(2 * words, _ENTROPY_WORDS)
+
+    def below(self, n):
+        """Return a uniform integer in [0, n)"""
+        limit = _limit(n)
+        value = self.next_word()
+        while value >= limit:
+            value = self.next_word()
+        return value % n
+
+    def shuffle(self, items):
+        """Fisher-Yates shuffle in place"""
+        next_word = self.next_word
+        for i in range(len(items) - 1, 0, -1):
+            limit = _limit(i + 1)
+            value = next_word()
+            while value >= limit:
+                value = next_word()
+            j = value % (i + 1)
+            items[i], items[j] = items[j], items[i]
+
+
+class ConstrainedGenerator:
+    """Precompiled policy: per-class slot alphabets plus adjacency rules"""
+
+    def __init__(self, length, charset=None, min_counts=None, no_repeats=False,
+                 no_sequences=False, randbytes=None):
+        alphabet = alphabet_for(charset if charset is not None else compile_charset())
+        if not alphabet:
+            raise ValueError("Character set must not be empty")
+        if length <= 0:
+            raise ValueError("Password length must be positive")
+        min_counts = {name: count for name, count in (min_counts or {}).items() if count}
+
+        required = sum(min_counts.values())
+        if required > length:
+            raise ValueError(f"Policy requires {required} characters but length is {length}")
+
+        # Slot alphabets: index 0 is the whole alphabet, then one per required class
+        self.slot_chars = [alphabet.chars]
+        self.pattern = [0] * (length - required)
+        for name, count in sorted(min_counts.items()):
+            if name not in CLASS_CHARS:
+                raise ValueError(f"Unknown character class {name!r}")
+            if count < 0:
+                raise ValueError("Minimum counts must not be negative")
+            chars = ''.join(c for c in alphabet.chars if c in CLASS_CHARS[name])
+            if not chars:
+                raise ValueError(f"Policy requires {name} but the character set has none")
+            self.pattern += [len(self.slot_chars)] * count
+            self.slot_chars.append(chars)
+
+        forbidden = int(no_repeats) + int(no_sequences)
+        smallest = min(len(chars) for chars in self.slot_chars)
+        if forbidden and smallest <= forbidden:
+            raise ValueError("Adjacency rules need at least "
+                             f"{forbidden + 1} symbols in every required class")
+
+        self.length = length
+        self.alphabet = alphabet
+        self.no_repeats = no_repeats
+        self.no_sequences = no_sequences
+        self._positions = [{c: i for i, c in enumerate(chars)} for chars in self.slot_chars]
+        # One word per shuffle step and per filled slot, plus rejection slack
+        self._indices = IndexSource(randbytes, 2 * length + 2)
+        self._randbytes = randbytes
+        self._shuffle_steps = [(i, i + 1, _limit(i + 1)) for i in range(length - 1, 0, -1)]
+        self._class_counts = [self.pattern.count(slot) for slot in range(len(self.slot_chars))]
+
+    def _shuffle(self, items):
+        """Fisher-Yates shuffle using precomputed rejection limits"""
+        next_word = self._indices.next_word
+        for i, n, limit in self._shuffle_steps:
+            value = next_word()
+            while value >= limit:
+                value = next_word()
+            j = value % n
+            items[i], items[j] = items[j], items[i]
+
+    def _generate_with_adjacency(self):
+        """Shuffle the slot pattern, then fill it left to right around banned symbols"""
+        next_word = self._indices.next_word
+        pattern = list(self.pattern)
+        self._shuffle(pattern)
+
+        no_repeats, no_sequences = self.no_repeats, self.no_sequences
+        out = []
+        last = before = None
+        for slot in pattern:
+            chars = self.slot_chars[slot]
+            positions = self._positions[slot]
+            skip = []
+            if last is not None:
+                if no_repeats and last in positions:
+                    skip.append(positions[last])
+                if no_sequences and before is not None:
+                    step = ord(last) - ord(before)
+                    if step == 1 or step == -1:
+                        nxt = ord(last) + step
+                        if 0 <= nxt < 0x110000 and chr(nxt) in positions:
+                            skip.append(positions[chr(nxt)])
+                if len(skip) == 2:
+                    if skip[0] == skip[1]:
+                        del skip[1]
+                    elif skip[0] > skip[1]:
+                        skip.reverse()
+
+            n = len(chars) - len(skip)
+            limit = _limit(n)
+            value = next_word()
+            while value >= limit:
+                value = next_word()
+            index = value % n
+            # Map the index over the allowed symbols by stepping past banned ones
+            for banned in skip:
+                if banned <= index:
+                    index += 1
+            before, last = last, chars[index]
+            out.append(last)
+        return ''.join(out)
+
+    def generate(self):
+        """Generate one password satisfying the policy"""
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, n):
+        """Generate n passwords satisfying the policy"""
+        if n < 0:
+            raise ValueError("Password count must not be negative")
+        if self.no_repeats or self.no_sequences:
+            return [self._generate_with_adjacency() for _ in range(n)]
+
+        # Without adjacency rules every slot is independent: draw each class's
+        # symbols for the whole batch in bulk, then shuffle each password
+        pools = [random_string(n * count, chars, self._randbytes)
+                 for chars, count in zip(self.slot_chars, self._class_counts)]
+        shuffle = self._shuffle
+        passwords = []
+        for i in range(n):
+            items = []
+            for pool, count in zip(pools, self._class_counts):
+                items.extend(pool[i * count:(i + 1) * count])
+            shuffle(items)
+            passwords.append(''.join(items))
+        return passwords
+
+
+def generate_constrained(length, charset=None, min_counts=None, no_repeats=False,
+                         no_sequences=False, randbytes=None):
+    """Generate one password that satisfies the policy by construction"""
+    return ConstrainedGenerator(length, charset, min_counts, no_repeats,
+                                no_sequences, randbytes).generate()
+
+
+def generate_constrained_batch(n, length, charset=None, min_counts=None, no_repeats=False,
+                               no_sequences=False, randbytes=None):
+    """Generate n passwords that satisfy the policy by construction"""
+    return ConstrainedGenerator(length, charset, min_counts, no_repeats,
+                                no_sequences, randbytes).generate_batch(n)
@@ -0,0 +1,255 @@
+"""
+Bulk provisioning: a password and a salted hash for every row of a users CSV.
+
+The input CSV is streamed row by row and each row is copied to the output
+with two columns appended: a freshly generated password and its salted,
+encoded hash for the auth database. Hashing (PBKDF2 or scrypt) costs about
+a thousand times as much as generating, so it is fanned out to a process
+pool in chunks of rows, while the parent only reads, generates and writes:
+
+    read chunk -> generate passwords -> submit hashing -> ... -> write in order
+
+At most `max_in_flight` chunks are submitted at once, so memory stays bounded
+however large the input is. Results are collected oldest chunk first, which
+keeps the output in input order.
+
+After each chunk is written and flushed a small checkpoint file records how
+far into the input and output the job got (byte offsets, so resuming a
+10M-row file seeks instead of re-reading). An interrupted run resumes by
+truncating the output to the checkpointed size and seeking the input to the
+checkpointed row. Rows are never hashed twice into the output, though a row
+whose chunk was in flight at the interruption gets a new password on resume.
+
+Hashes are encoded as
+
+    pbkdf2_sha256$<iterations>$<salt>$<hash>
+    scrypt$<n>$<r>$<p>$<salt>$<hash>
+
+with salt and hash in unpadded URL-safe base64; verify_password checks them.
+"""
+
+import base64
+import csv
+import hashlib
+import hmac
+import io
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .core import Generator, PasswordPolicy
+
+ALGORITHMS = ("pbkdf2_sha256", "scrypt")
+# Work factor per algorithm: PBKDF2 iterations (OWASP 2023) or scrypt's n
+DEFAULT_COST = {"pbkdf2_sha256": 600_000, "scrypt": 2 ** 14}
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+HASH_BYTES = 32
+DEFAULT_CHUNK_ROWS = 64
+CHECKPOINT_VERSION = 1
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt_maxmem(n):
+    # hashlib's default limit (32 MiB) is too small for n >= 2**15
+    return 2 * 128 * SCRYPT_R * n + (1 << 20)
+
+
+def hash_password(password, algorithm="pbkdf2_sha256", cost=None, salt=None):
+    """Salted hash of password, encoded with its algorithm and parameters"""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {algorithm!r}; choose from {', '.join(ALGORITHMS)}")
+    cost = cost or DEFAULT_COST[algorithm]
+    salt = salt or os.urandom(SALT_BYTES)
+    secret = password.encode("utf-8")
+    if algorithm == "scrypt":
+        digest = hashlib.scrypt(secret, salt=salt, n=cost, r=SCRYPT_R, p=SCRYPT_P,
+                                maxmem=_scrypt_maxmem(cost), dklen=HASH_BYTES)
+        return f"scrypt${cost}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+    digest = hashlib.pbkdf2_hmac("sha256", secret, salt, cost, HASH_BYTES)
+    return f"pbkdf2_sha256${cost}${_b64(salt)}${_b64(digest)}"
+
+
+def verify_password(password, encoded):
+    """True if password matches a hash produced by hash_password"""
+    fields = encoded.split("$")
+    secret = password.encode("utf-8")
+    if fields[0] == "pbkdf2_sha256" and len(fields) == 4:
+        salt, expected = _unb64(fields[2]), _unb64(fields[3])
+        digest = hashlib.pbkdf2_hmac("sha256", secret, salt, int(fields[1]), len(expected))
+    elif fields[0] == "scrypt" and len(fields) == 6:
+        n, r, p = (int(x) for x in fields[1:4])
+        salt, expected = _unb64(fields[4]), _unb64(fields[5])
+        digest = hashlib.scrypt(secret, salt=salt, n=n, r=r, p=p,
+                                maxmem=2 * 128 * r * n + (1 << 20), dklen=len(expected))
+    else:
+        raise ValueError("unrecognised password hash format")
+    return hmac.compare_digest(digest, expected)
+
+
+def _hash_chunk(passwords, algorithm, cost):
+    """Worker: hash one chunk of passwords"""
+    return [hash_password(p, algorithm, cost) for p in passwords]
+
+
+def read_checkpoint(path):
+    """The saved checkpoint as a dict, or None if there is none"""
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} is not a provisioning checkpoint")
+    return state
+
+
+def write_checkpoint(path, state):
+    """Atomically replace the checkpoint file"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class _RowReader:
+    """csv.reader over a binary file that knows the byte offset after each row"""
+
+    def __init__(self, f):
+        self._f = f
+        self.offset = f.tell()
+        self._reader = csv.reader(self._lines())
+
+    def _lines(self):
+        # csv.reader pulls exactly the lines of one record per row, so after
+        # each row self.offset is the start of the next one
+        for line in iter(self._f.readline, b""):
+            self.offset += len(line)
+            yield line.decode("utf-8")
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._reader)
+
+    def read(self, n):
+        """Up to n more rows (fewer only at end of input)"""
+        rows = []
+        for row in self._reader:
+            if row:
+                rows.append(row)
+                if len(rows) == n:
+                    break
+        return rows
+
+
+def _encode_rows(rows):
+    text = io.StringIO()
+    csv.writer(text, lineterminator="\n").writerows(rows)
+    return text.getvalue().encode("utf-8")
+
+
+def provision(source, dest, policy=None, algorithm="pbkdf2_sha256", cost=None, workers=None,
+              chunk_rows=DEFAULT_CHUNK_ROWS, max_in_flight=None, checkpoint=None, resume=False,
+              report=None):
+    """
+    Write dest: every row of the source CSV plus "password" and "password_hash"
+    columns. Returns the total number of data rows in dest.
+
+    With resume=True an existing checkpoint (dest + ".ckpt" by default)
+    continues an interrupted run; without it an existing checkpoint is an
+    error rather than silently overwritten. report(rows_done), if given, is
+    called after every chunk is written. The checkpoint is removed when the
+    job completes.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {algorithm!r}; choose from {', '.join(ALGORITHMS)}")
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be positive")
+    cost = cost or DEFAULT_COST[algorithm]
+    generator = Generator(policy or PasswordPolicy(16))
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    checkpoint = checkpoint or f"{dest}.ckpt"
+
+    state = read_checkpoint(checkpoint)
+    if state is not None and not resume:
+        raise ValueError(f"{checkpoint} exists from an interrupted run; resume it or delete it")
+
+    with open(source, "rb") as src:
+        reader = _RowReader(src)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"{source} is empty")
+        if header[0].startswith("\ufeff"):
+            header[0] = header[0][1:]
+
+        if state is None:
+            out = open(dest, "wb")
+            out.write(_encode_rows([header + ["password", "password_hash"]]))
+            state = {"version": CHECKPOINT_VERSION, "header": header, "rows": 0,
+                     "input_offset": reader.offset, "output_offset": out.tell()}
+            write_checkpoint(checkpoint, state)
+        else:
+            if header != state["header"]:
+                raise ValueError(f"{source} is not the file {checkpoint} was recorded for")
+            src.seek(state["input_offset"])
+            reader = _RowReader(src)
+            out = open(dest, "r+b")
+            out.truncate(state["output_offset"])
+            out.seek(state["output_offset"])
+
+        def commit(rows):
+            out.write(_encode_rows(rows))
+            out.flush()
+            os.fsync(out.fileno())
+            state["rows"] += len(rows)
+            state["output_offset"] = out.tell()
+            state["input_offset"] = offsets.popleft()
+            write_checkpoint(checkpoint, state)
+            if report:
+                report(state["rows"])
+
+        offsets = deque()
+        with out:
+            if workers == 1:
+                while True:
+                    rows = reader.read(chunk_rows)
+                    if not rows:
+                        break
+                    offsets.append(reader.offset)
+                    passwords = generator.generate_batch(len(rows))
+                    hashes = _hash_chunk(passwords, algorithm, cost)
+                    commit([r + [p, h] for r, p, h in zip(rows, passwords, hashes)])
+            else:
+                pending = deque()
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    while True:
+                        rows = reader.read(chunk_rows)
+                        if rows:
+                            offsets.append(reader.offset)
+                            passwords = generator.generate_batch(len(rows))
+                            future = pool.submit(_hash_chunk, passwords, algorithm, cost)
+                            pending.append((rows, passwords, future))
+                        # Write the oldest chunk when the window is full or input is done
+                        if pending and (len(pending) >= max_in_flight or not rows):
+                            done_rows, passwords, future = pending.popleft()
+                            hashes = future.result()
+                            commit([r + [p, h] for r, p, h in zip(done_rows, passwords, hashes)])
+                        elif not rows:
+                            break
+
+    os.remove(checkpoint)
+    return state["rows"]
@@ -0,0 +1,78 @@
+"""
+Deterministic, seeded generation for load tests and fixtures. NOT SECRET.
+
+Anyone who knows (or guesses) the seed can regenerate every password, so
+output from this module must never be used as a real credential. It exists
+so that a large fixture set (e.g. 50M passwords for load-testing a
+credential store) can be regenerated on demand instead of being stored.
+
+The PRNG is counter based: the bytes for password i are keyed BLAKE2b of
+the counter (i, block), with the key derived from the seed. Password i is
+therefore computed directly in O(1), without generating passwords 0..i-1,
+so a job can be split into index ranges across processes or machines and
+any single password can be looked up later. Characters are mapped from
+those bytes with the same rejection-sampling table as the secure core, so
+the output is uniform over the alphabet.
+"""
+
+import hashlib
+import struct
+
+from .charsets import alphabet_for, compile_charset
+
+WARNING = "⚠️  Deterministic seeded mode: output is reproducible from the seed and NOT secret."
+
+_BLOCK = 64
+_COUNTER = struct.Struct("<QQ")
+_PERSON = b"pwgen-seeded"
+
+
+def seed_key(seed):
+    """Derive a 32-byte key from a str, int or bytes seed"""
+    if isinstance(seed, int) and not isinstance(seed, bool):
+        seed = str(seed)
+    if isinstance(seed, str):
+        seed = seed.encode("utf-8")
+    if not isinstance(seed, bytes):
+        raise TypeError(f"seed must be str, int or bytes, not {type(seed).__name__}")
+    return hashlib.blake2b(seed, digest_size=32, person=_PERSON).digest()
+
+
+class SeededGenerator:
+    """Reproducible, random-access password sequence. For test fixtures only: NOT SECRET."""
+
+    def __init__(self, seed, length=16, charset=None):
+        if length <= 0:
+            raise ValueError("Password length must be positive")
+        self.alphabet = alphabet_for(charset if charset is not None else compile_charset())
+        if not 0 < self.alphabet.size <= 256:
+            raise ValueError("Seeded mode needs a character set of 1 to 256 symbols")
+        self.length = length
+        # Keyed once; each call copies the hasher instead of re-keying
+        self._hasher = hashlib.blake2b(key=seed_key(seed), digest_size=_BLOCK)
+
+    def password_at(self, index):
+        """Password number index (any non-negative integer below 2**64), in O(1)"""
+        if not 0 <= index < 1 << 64:
+            raise IndexError("index must be in [0, 2**64)")
+        base = self._hasher
+        table, rejected = self.alphabet.table, self.alphabet.rejected
+        length = self.length
+        block = 0
+        data = b""
+        while len(data) < length:
+            hasher = base.copy()
+            hasher.update(_COUNTER.pack(index, block))
+            data += hasher.digest().translate(table, rejected)
+            block += 1
+        return self.alphabet.decode(data[:length])
+
+    def passwords(self, start, stop):
+        """List of passwords start..stop-1"""
+        password_at = self.password_at
+        return [password_at(i) for i in range(start, stop)]
+
+    def iter_chunks(self, start, stop, chunk_size=65536):
+        """Yield lists of passwords covering start..stop-1"""
+        for begin in range(start, stop, chunk_size):
+            yield self.passwords(begin, min(begin + chunk_size, stop))
@@ -0,0 +1,225 @@
+"""
+Long-running local HTTP/JSON password service built on asyncio.
+
+Endpoints (GET only):
+
+    /generate?length=16&count=10&policy=letters,digits,no-similar
+        {"passwords": [...]} as JSON. Counts above CHUNKED_THRESHOLD are sent
+        with chunked transfer encoding, the JSON array streamed piecewise.
+    /generate/stream?length=16&count=1000000&policy=...&framing=newline
+        Chunked plain-text stream in newline, nul or csv framing.
+    /health
+        Liveness probe.
+    /metrics
+        Generation metrics in Prometheus text format (populated when started
+        with --metrics; see metrics.py).
+
+`policy` is a comma-separated list of tokens: upper, lower, letters, digits,
+symbols, no-similar, no-ambiguous. It defaults to all four character classes.
+Compiled charsets are reused through the charset cache and all requests draw
+from the process-wide pre-filled EntropyPool.
+
+Run with:  python -m password_generator.service --port 8080
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from urllib.parse import parse_qs, urlsplit
+
+from . import metrics
+from .core import Generator, PasswordPolicy
+from .entropy import default_pool
+from .streaming import FRAMINGS, iter_framed
+
+MAX_LENGTH = 4096
+MAX_COUNT = 1_000_000
+MAX_STREAM_COUNT = 10**9
+CHUNKED_THRESHOLD = 10_000
+STREAM_CHUNK_SIZE = 8192
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class HTTPError(Exception):
+    """Error mapped straight onto an HTTP status and JSON error body"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_policy(value, length=16):
+    """PasswordPolicy for a policy string such as 'letters,digits,no-similar'"""
+    policy = PasswordPolicy.from_tokens(value, length)
+    if not policy.alphabet():
+        raise ValueError("policy leaves no characters to choose from")
+    return policy
+
+
+def _int_param(params, name, default, maximum, minimum=1):
+    raw = params.get(name, [str(default)])[-1]
+    try:
+        value = int(raw)
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an integer")
+    if not minimum <= value <= maximum:
+        raise HTTPError(400, f"{name} must be between {minimum} and {maximum}")
+    return value
+
+
+class PasswordService:
+    """Request handling for the HTTP service; one instance serves every connection"""
+
+    def __init__(self, pool=None):
+        self.pool = pool or default_pool()
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one keep-alive connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    await self._send_json(writer, 400, {"error": "malformed request line"}, False)
+                    break
+                method, target, version = parts
+                keep_alive = (version == "HTTP/1.1"
+                              and headers.get("connection", "").lower() != "close")
+                try:
+                    await self.dispatch(method, target, writer, keep_alive)
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, {"error": str(e)}, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, target, writer, keep_alive):
+        url = urlsplit(target)
+        if url.path not in ("/generate", "/generate/stream", "/health", "/metrics"):
+            raise HTTPError(404, f"no such endpoint {url.path}")
+        if method != "GET":
+            raise HTTPError(405, "only GET is supported")
+        if url.path == "/health":
+            await self._send_json(writer, 200, {"status": "ok"}, keep_alive)
+            return
+        if url.path == "/metrics":
+            body = metrics.REGISTRY.render().encode("utf-8")
+            writer.write(self._head(200, "text/plain; version=0.0.4", keep_alive,
+                                    f"Content-Length: {len(body)}\r\n") + body)
+            await writer.drain()
+            return
+
+        params = parse_qs(url.query)
+        length = _int_param(params, "length", 16, MAX_LENGTH)
+        try:
+            policy = parse_policy(params.get("policy", [""])[-1], length)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+        if url.path == "/generate":
+            count = _int_param(params, "count", 1, MAX_COUNT)
+            await self._generate(writer, policy, count, keep_alive)
+        else:
+            count = _int_param(params, "count", 1, MAX_STREAM_COUNT)
+            framing = params.get("framing", ["newline"])[-1]
+            if framing not in FRAMINGS:
+                raise HTTPError(400, f"framing must be one of {', '.join(FRAMINGS)}")
+            content_type = "text/csv" if framing == "csv" else "text/plain; charset=utf-8"
+            blocks = iter_framed(count, length, policy.alphabet(), framing, STREAM_CHUNK_SIZE,
+                                 self.pool.read)
+            await self._send_chunked(writer, content_type, blocks, keep_alive)
+
+    async def _generate(self, writer, policy, count, keep_alive):
+        if count <= CHUNKED_THRESHOLD:
+            generator = Generator(policy, metrics.entropy_source(self.pool.read))
+            with metrics.stage("mapping"):
+                passwords = generator.generate_batch(count)
+            with metrics.stage("output"):
+                await self._send_json(writer, 200, {"passwords": passwords}, keep_alive)
+            return
+
+        generator = Generator(policy, self.pool.read)
+
+        def blocks():
+            yield b'{"passwords": ['
+            remaining = count
+            while remaining:
+                n = min(STREAM_CHUNK_SIZE, remaining)
+                remaining -= n
+                body = json.dumps(generator.generate_batch(n))[1:-1]
+                yield (body + ("," if remaining else "")).encode("utf-8")
+            yield b"]}"
+
+        await self._send_chunked(writer, "application/json", blocks(), keep_alive)
+
+    @staticmethod
+    def _head(status, content_type, keep_alive, extra):
+        return (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n{extra}"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1")
+
+    async def _send_json(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(self._head(status, "application/json", keep_alive,
+                                f"Content-Length: {len(body)}\r\n") + body)
+        await writer.drain()
+
+    async def _send_chunked(self, writer, content_type, blocks, keep_alive):
+        writer.write(self._head(200, content_type, keep_alive, "Transfer-Encoding: chunked\r\n"))
+        for block in blocks:
+            if block:
+                writer.write(b"%x\r\n%b\r\n" % (len(block), block))
+                # Yield to other connections between chunks of a large response
+                await writer.drain()
+                await asyncio.sleep(0)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8080, ready=None):
+    """Run the service until cancelled; `ready` is called with the bound port"""
+    service = PasswordService()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    bound_port = server.sockets[0].getsockname()[1]
+    if ready is not None:
+        ready(bound_port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON password generation service")
+    parser.add_argument("--host", default="127.0.0.1", help="bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port, 0 for any free port")
+    parser.add_argument("--metrics", action="store_true", help="record metrics for /metrics")
+    args = parser.parse_args(argv)
+    if args.metrics:
+        metrics.enable()
+
+    def announce(port):
+        print(f"Listening on http://{args.host}:{port}", flush=True)
+
+    try:
+        asyncio.run(serve(args.host, args.port, announce))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
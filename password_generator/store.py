@@ -0,0 +1,425 @@
+"""
+Memory-mapped, deduplicated bulk output store for generated credentials.
+
+Records are fixed-width and written into a preallocated memory-mapped file,
+so record i lives at a known offset. Importers can read any record or slice
+of records zero-copy (as a memoryview or a NumPy S{width} array) without
+parsing text.
+
+Uniqueness is enforced by a sidecar index file (<path>.idx), also memory
+mapped, rather than a Python set of strings:
+
+    bitset  one bit per possible code, used when the keyspace
+            (alphabet ** width) fits in MAX_BITSET_BITS; exact
+    bloom   a Bloom filter sized for the store's capacity, used for larger
+            keyspaces; a false positive only discards a fresh candidate, so
+            duplicates can never get through
+
+File layout: a HEADER_SIZE-byte header (magic, version, width, count and the
+alphabet) followed by count * width record bytes. The count in the header
+is updated after every write, so a store left behind by a crash is still
+readable up to its last completed write.
+
+The index header records the width and alphabet it was built for and the
+number of store records it covers. Reopening a store checks the index
+against it: an index for a different width or alphabet is an error, and a
+missing, outdated or out-of-step index (left by a crash mid-write) is
+rebuilt from the store's records, so its bits always match what the store
+holds.
+"""
+
+import math
+import mmap
+import os
+import struct
+import zlib
+from operator import mul
+
+from .charsets import alphabet_for
+from .core import random_bytes
+
+MAGIC = b"PWRS"
+INDEX_MAGIC = b"PWIX"
+VERSION = 1
+INDEX_VERSION = 2
+HEADER_SIZE = 512
+INDEX_HEADER_SIZE = 64
+
+_HEADER = struct.Struct("<4sHHQH")
+_COUNT = struct.Struct("<Q")
+_COUNT_OFFSET = struct.calcsize("<4sHH")
+# magic, version, kind, width, alphabet size, alphabet CRC-32, nbits, nhashes, records covered
+_INDEX_HEADER = struct.Struct("<4sHBHHIQQQ")
+_INDEX_COUNT_OFFSET = _INDEX_HEADER.size - _COUNT.size
+# Index record count while the index is being modified
+_IN_PROGRESS = (1 << 64) - 1
+_REBUILD_CHUNK = 65536
+
+BITSET, BLOOM = 0, 1
+
+# Use an exact bitset up to 2**33 bits (1 GiB of index)
+MAX_BITSET_BITS = 1 << 33
+BLOOM_FALSE_POSITIVE_RATE = 1e-6
+
+# Bloom hashing: two polynomial hashes mod 2**64 finished with the splitmix64
+# mixer; written so the pure-Python and NumPy paths produce identical bits
+_MASK64 = (1 << 64) - 1
+_HASH_BASES = (0x100000001B3, 0x9E3779B97F4A7C15)
+_MAX_WIDTH = 1024
+_POWERS = tuple([pow(base, j, 1 << 64) for j in range(_MAX_WIDTH)] for base in _HASH_BASES)
+
+
+def _mix64(x):
+    x ^= x >> 30
+    x = (x * 0xBF58476D1CE4E5B9) & _MASK64
+    x ^= x >> 27
+    x = (x * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _mix64_array(x):
+    import numpy as np
+
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _map_file(path, size, create):
+    """Open (and optionally size) a file and memory-map it read/write"""
+    fd = os.open(path, os.O_RDWR | (os.O_CREAT if create else 0), 0o600)
+    try:
+        if create:
+            os.ftruncate(fd, size)
+        return mmap.mmap(fd, size or os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+
+
+class UniquenessIndex:
+    """Memory-mapped bitset or Bloom filter over fixed-width records
+
+    count is the number of store records the index covers. An existing index
+    is reused only if it was built for the same width and alphabet and covers
+    exactly count records; otherwise it is replaced by an empty one
+    (self.count == 0) for the caller to refill.
+    """
+
+    def __init__(self, path, alphabet, width, capacity=None, count=0):
+        self.alphabet = alphabet_for(alphabet)
+        self.width = width
+        keyspace = self.alphabet.size ** width
+        self._ranks = {c: i for i, c in enumerate(self.alphabet.symbols)}
+        fingerprint = (width, self.alphabet.size, zlib.crc32(self.alphabet.symbols))
+
+        if os.path.exists(path):
+            mm = _map_file(path, 0, create=False)
+            header = _INDEX_HEADER.unpack_from(mm) if len(mm) >= _INDEX_HEADER.size else None
+            if header is None or header[0] != INDEX_MAGIC:
+                mm.close()
+                raise ValueError(f"{path} is not a uniqueness index")
+            if header[1] == INDEX_VERSION:
+                if header[3:6] != fingerprint:
+                    mm.close()
+                    raise ValueError(f"{path} indexes a store with a different width or alphabet")
+                if header[8] == count:
+                    self._mm = mm
+                    self.kind, self.nbits, self.nhashes, self.count = header[2], *header[6:]
+                    return
+            # Older format, or out of step with the store: start afresh
+            mm.close()
+            os.remove(path)
+
+        if keyspace <= MAX_BITSET_BITS:
+            self.kind, self.nbits, self.nhashes = BITSET, keyspace, 0
+        else:
+            if width > _MAX_WIDTH:
+                raise ValueError(f"Records wider than {_MAX_WIDTH} bytes are not supported")
+            if not capacity:
+                raise ValueError("A Bloom index needs the store capacity up front")
+            ln2 = math.log(2)
+            self.kind = BLOOM
+            self.nbits = max(64, int(-capacity * math.log(BLOOM_FALSE_POSITIVE_RATE) / ln2 ** 2))
+            self.nhashes = max(1, round(self.nbits / capacity * ln2))
+        self._mm = _map_file(path, INDEX_HEADER_SIZE + (self.nbits + 7) // 8, create=True)
+        self.count = 0
+        _INDEX_HEADER.pack_into(self._mm, 0, INDEX_MAGIC, INDEX_VERSION, self.kind, *fingerprint,
+                                self.nbits, self.nhashes, self.count)
+
+    def set_count(self, count):
+        """Record how many store records the index covers (_IN_PROGRESS while changing)"""
+        self.count = count
+        _COUNT.pack_into(self._mm, _INDEX_COUNT_OFFSET, count)
+
+    def _positions(self, record):
+        if self.kind == BITSET:
+            rank = 0
+            size = self.alphabet.size
+            ranks = self._ranks
+            try:
+                for b in record:
+                    rank = rank * size + ranks[b]
+            except KeyError:
+                raise ValueError(f"record byte {b!r} is not in the alphabet") from None
+            return (rank,)
+        h1 = _mix64(sum(map(mul, record, _POWERS[0][:len(record)])) & _MASK64)
+        h2 = _mix64(sum(map(mul, record, _POWERS[1][:len(record)])) & _MASK64) | 1
+        return [((h1 + i * h2) & _MASK64) % self.nbits for i in range(self.nhashes)]
+
+    def add(self, record):
+        """Mark record as seen; returns False if it was (or may have been) seen before"""
+        mm = self._mm
+        positions = self._positions(record)
+        seen = True
+        for pos in positions:
+            offset = INDEX_HEADER_SIZE + (pos >> 3)
+            bit = 1 << (pos & 7)
+            if not mm[offset] & bit:
+                seen = False
+                mm[offset] |= bit
+        return not seen
+
+    def add_matrix(self, matrix):
+        """Vectorized add for an (n, width) uint8 matrix (NumPy)
+
+        Returns the sorted row numbers that were new; duplicates inside the
+        matrix count as seen after their first occurrence.
+        """
+        import numpy as np
+
+        bits = np.frombuffer(self._mm, dtype=np.uint8, offset=INDEX_HEADER_SIZE)
+        if self.kind == BITSET:
+            lookup = np.full(256, -1, dtype=np.int64)
+            lookup[np.frombuffer(self.alphabet.symbols, dtype=np.uint8)] = np.arange(self.alphabet.size)
+            ranks = lookup[matrix]
+            if (ranks < 0).any():
+                raise ValueError("record bytes are not all in the alphabet")
+            places = self.alphabet.size ** np.arange(self.width - 1, -1, -1, dtype=np.int64)
+            keys = ranks @ places
+            keys, first = np.unique(keys, return_index=True)
+            positions = keys[:, None]
+        else:
+            rows = np.ascontiguousarray(matrix).view(np.dtype((np.void, self.width))).ravel()
+            _, first = np.unique(rows, return_index=True)
+            wide = matrix[first].astype(np.uint64)
+            powers = [np.array(p[:self.width], dtype=np.uint64) for p in _POWERS]
+            h1 = _mix64_array((wide * powers[0]).sum(axis=1, dtype=np.uint64))
+            h2 = _mix64_array((wide * powers[1]).sum(axis=1, dtype=np.uint64))
+            h2 |= np.uint64(1)
+            steps = np.arange(self.nhashes, dtype=np.uint64)
+            positions = (h1[:, None] + steps * h2[:, None]) % np.uint64(self.nbits)
+
+        masks = (1 << (positions & 7)).astype(np.uint8)
+        offsets = (positions >> 3).astype(np.int64)
+        seen = np.all(bits[offsets] & masks, axis=1)
+        new_offsets, new_masks = offsets[~seen].ravel(), masks[~seen].ravel()
+        np.bitwise_or.at(bits, new_offsets, new_masks)
+        return np.sort(first[~seen])
+
+    def __contains__(self, record):
+        mm = self._mm
+        return all(mm[INDEX_HEADER_SIZE + (pos >> 3)] & (1 << (pos & 7))
+                   for pos in self._positions(record))
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        self._mm.close()
+
+
+class RecordStore:
+    """Fixed-width record file with random access; opened read-only for importers"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < HEADER_SIZE:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} record store")
+        magic, version, self.width, self.count, alphabet_len = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} record store")
+        start = _HEADER.size
+        self.alphabet = self._mm[start:start + alphabet_len].decode("latin-1")
+        self._view = memoryview(self._mm)[HEADER_SIZE:HEADER_SIZE + self.count * self.width]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        """Record i as a zero-copy memoryview"""
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("record index out of range")
+        return self._view[i * self.width:(i + 1) * self.width]
+
+    def slice(self, start, stop):
+        """Records [start, stop) as one contiguous zero-copy memoryview"""
+        start, stop, _ = slice(start, stop).indices(self.count)
+        return self._view[start * self.width:max(start, stop) * self.width]
+
+    def as_array(self):
+        """All records as a zero-copy NumPy S{width} array"""
+        import numpy as np
+
+        return np.frombuffer(self._view, dtype=f"S{self.width}")
+
+    def close(self):
+        self._view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            # A NumPy array or slice still references the map; it is unmapped
+            # once those are garbage collected
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class UniqueRecordWriter:
+    """Append-only writer that refuses duplicate records"""
+
+    def __init__(self, path, width, alphabet, capacity):
+        self.alphabet = alphabet_for(alphabet)
+        if not self.alphabet.single_byte:
+            raise ValueError("Record stores need a single-byte (latin-1) alphabet")
+        if len(self.alphabet.symbols) > HEADER_SIZE - _HEADER.size:
+            raise ValueError("Alphabet too large for the store header")
+        self.path = path
+        self.width = width
+        self.capacity = capacity
+
+        if os.path.exists(path):
+            with RecordStore(path) as existing:
+                if existing.width != width or existing.alphabet != self.alphabet.chars:
+                    raise ValueError(f"{path} was created with a different width or alphabet")
+                self.count = existing.count
+            self.capacity = max(capacity, self.count)
+        else:
+            self.count = 0
+        self._mm = _map_file(path, HEADER_SIZE + self.capacity * width, create=True)
+        self._write_header()
+        try:
+            self.index = UniquenessIndex(path + ".idx", self.alphabet, width, self.capacity,
+                                         self.count)
+        except ValueError:
+            self._mm.close()
+            raise
+        if self.index.count != self.count:
+            self._rebuild_index()
+
+    def _write_header(self):
+        symbols = self.alphabet.symbols
+        _HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self.width, self.count, len(symbols))
+        self._mm[_HEADER.size:_HEADER.size + len(symbols)] = symbols
+
+    def _rebuild_index(self):
+        """Refill an empty index from the records already in the store"""
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        width = self.width
+        self.index.set_count(_IN_PROGRESS)
+        for start in range(0, self.count, _REBUILD_CHUNK):
+            stop = min(start + _REBUILD_CHUNK, self.count)
+            records = self._mm[HEADER_SIZE + start * width:HEADER_SIZE + stop * width]
+            if np is None:
+                for i in range(0, len(records), width):
+                    self.index.add(records[i:i + width])
+            else:
+                self.index.add_matrix(np.frombuffer(records, dtype=np.uint8).reshape(-1, width))
+        self.index.set_count(self.count)
+
+    def _commit(self):
+        """Publish the new count in the store header, then in the index"""
+        _COUNT.pack_into(self._mm, _COUNT_OFFSET, self.count)
+        self.index.set_count(self.count)
+
+    def _check_alphabet(self, data):
+        """Raise ValueError, before anything is written, if data has a byte outside the alphabet"""
+        foreign = bytes(data).translate(None, self.alphabet.symbols)
+        if foreign:
+            raise ValueError(f"record byte {foreign[0]!r} is not in the store's alphabet")
+
+    def add(self, record):
+        """Append record unless it is a duplicate; returns True if written"""
+        if len(record) != self.width:
+            raise ValueError(f"record must be exactly {self.width} bytes")
+        self._check_alphabet(record)
+        if self.count >= self.capacity:
+            raise ValueError("store is full")
+        self.index.set_count(_IN_PROGRESS)
+        added = self.index.add(record)
+        if added:
+            offset = HEADER_SIZE + self.count * self.width
+            self._mm[offset:offset + self.width] = record
+            self.count += 1
+        self._commit()
+        return added
+
+    def extend(self, records):
+        """Append every new record from an iterable; returns how many were written"""
+        return sum(self.add(record) for record in records if self.count < self.capacity)
+
+    def extend_buffer(self, data):
+        """Append new records from a buffer of back-to-back records; returns how many were written
+
+        Only as many records as the store has room for are examined, so call
+        again with the remainder if the store was nearly full. Uses NumPy
+        when available.
+        """
+        width = self.width
+        if len(data) % width:
+            raise ValueError(f"buffer length must be a multiple of {width}")
+        room = self.capacity - self.count
+        data = data[:room * width]
+        self._check_alphabet(data)
+        try:
+            import numpy as np
+        except ImportError:
+            return self.extend(data[i:i + width] for i in range(0, len(data), width))
+
+        matrix = np.frombuffer(data, dtype=np.uint8).reshape(-1, width)
+        self.index.set_count(_IN_PROGRESS)
+        fresh = matrix[self.index.add_matrix(matrix)]
+        offset = HEADER_SIZE + self.count * width
+        self._mm[offset:offset + fresh.nbytes] = fresh.tobytes()
+        self.count += len(fresh)
+        self._commit()
+        return len(fresh)
+
+    def close(self):
+        """Flush, trim unused capacity and release the maps"""
+        self._mm.flush()
+        self._mm.close()
+        self.index.flush()
+        self.index.close()
+        os.truncate(self.path, HEADER_SIZE + self.count * self.width)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def generate_unique(path, n, length, charset, chunk_size=65536):
+    """Write n distinct length-character codes into the store at path; returns the count"""
+    alphabet = alphabet_for(charset)
+    if alphabet.size ** length < n:
+        raise ValueError(f"Only {alphabet.size ** length} distinct codes exist; cannot issue {n}")
+    with UniqueRecordWriter(path, length, alphabet, n) as writer:
+        while writer.count < n:
+            want = min(chunk_size, n - writer.count)
+            writer.extend_buffer(random_bytes(want * length, alphabet))
+        return writer.count
@@ -0,0 +1,183 @@
+"""
+Entropy-based password strength estimator shared by every entry point.
+
+Strength is reported as bits of entropy: length * log2(alphabet size). When
+the generating alphabet is known (e.g. a password we just generated) its
+exact size is used. Otherwise the effective alphabet is inferred from the
+character classes present, found in a single pass by translating the
+password through a precomputed 256-entry class lookup table.
+
+The batch APIs score whole credential dumps: score_batch for lists of
+strings and score_lines for a raw newline-delimited buffer, the latter
+vectorized with NumPy (segment-wise bitwise OR over the class codes) when it
+is installed.
+
+Entropy says nothing about passwords people actually use: "Password1!" looks
+Strong by its classes. assess() therefore takes an optional breached corpus
+(any container, normally a breach.BreachFilter) and rates a hit as BREACHED
+with zero bits, whatever its length.
+"""
+
+import math
+import string
+from collections import namedtuple
+
+UPPER, LOWER, DIGIT, SYMBOL, OTHER = 1, 2, 4, 8, 16
+
+# Symbols contributed to the effective alphabet by each class
+CLASS_SIZES = {UPPER: 26, LOWER: 26, DIGIT: 10, SYMBOL: 32, OTHER: 100}
+
+# Rating thresholds in bits, checked in order
+RATINGS = (
+    (28, "Very Weak"),
+    (36, "Weak"),
+    (50, "Moderate"),
+    (72, "Strong"),
+    (math.inf, "Very Strong"),
+)
+
+BREACHED = "Breached"
+
+Strength = namedtuple("Strength", "bits label")
+
+
+def _build_class_table():
+    table = bytearray([OTHER]) * 256
+    for chars, cls in ((string.ascii_uppercase, UPPER), (string.ascii_lowercase, LOWER),
+                       (string.digits, DIGIT), (string.punctuation, SYMBOL)):
+        for c in chars:
+            table[ord(c)] = cls
+    # Control characters and space count as symbols rather than exotic characters
+    for b in list(range(0, 32)) + [32, 127]:
+        table[b] = SYMBOL
+    return bytes(table)
+
+
+# Byte -> class bit, used with bytes.translate; UTF-8 bytes >= 0x80 map to OTHER
+CLASS_TABLE = _build_class_table()
+
+# Class bitmask -> effective alphabet size, for every combination of classes
+ALPHABET_BY_MASK = tuple(
+    sum(size for cls, size in CLASS_SIZES.items() if mask & cls) for mask in range(32)
+)
+
+# Alphabet size -> bits per character, precomputed for the sizes above
+_BITS_PER_CHAR = {size: math.log2(size) if size else 0.0 for size in set(ALPHABET_BY_MASK)}
+
+
+def class_mask(password):
+    """Bitmask of the character classes present in password"""
+    mask = 0
+    for cls in frozenset(password.encode('utf-8').translate(CLASS_TABLE)):
+        mask |= cls
+    return mask
+
+
+def estimate_bits(password, alphabet_size=None):
+    """Bits of entropy for password, from the known or the inferred alphabet size"""
+    if not password:
+        return 0.0
+    if alphabet_size is None:
+        return len(password) * _BITS_PER_CHAR[ALPHABET_BY_MASK[class_mask(password)]]
+    return len(password) * math.log2(alphabet_size) if alphabet_size > 1 else 0.0
+
+
+def rate_bits(bits):
+    """Map bits of entropy onto a rating label"""
+    for threshold, label in RATINGS:
+        if bits < threshold:
+            return label
+    return RATINGS[-1][1]
+
+
+def assess(password, alphabet_size=None, breached=None):
+    """Return Strength(bits, label) for a single password, screened against breached"""
+    if breached is not None and password in breached:
+        return Strength(0.0, BREACHED)
+    bits = estimate_bits(password, alphabet_size)
+    return Strength(bits, rate_bits(bits))
+
+
+def score_batch(passwords):
+    """Bits of entropy for every password in an iterable, with inferred alphabets"""
+    table = CLASS_TABLE
+    sizes = ALPHABET_BY_MASK
+    bits_per_char = _BITS_PER_CHAR
+    scores = []
+    append = scores.append
+    for password in passwords:
+        mask = 0
+        for cls in frozenset(password.encode('utf-8').translate(table)):
+            mask |= cls
+        append(len(password) * bits_per_char[sizes[mask]])
+    return scores
+
+
+def score_lines(data):
+    """Bits of entropy for each line of a newline-delimited bytes buffer, as a list
+
+    Lines are split on b"\n" only (a trailing \r is dropped) and their length
+    is measured in bytes, so multi-byte UTF-8 characters count once per
+    byte. Uses NumPy when available; both paths give the same result.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return _score_lines_python(data)
+
+    if not data:
+        return []
+    if data.endswith(b"\r\n"):
+        data = data[:-2]
+    elif data.endswith(b"\n"):
+        data = data[:-1]
+    if not data:
+        return [0.0]
+    raw = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(raw == 10)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(raw)]))
+    # Drop a trailing \r from CRLF lines
+    has_cr = (ends > starts) & (raw[np.maximum(ends - 1, 0)] == 13)
+    ends = ends - has_cr
+    lengths = ends - starts
+
+    codes = np.frombuffer(data.translate(CLASS_TABLE), dtype=np.uint8).copy()
+    codes[newlines] = 0
+    codes[ends[has_cr]] = 0
+    # reduceat needs in-bounds starts; empty trailing lines are zeroed below
+    masks = np.bitwise_or.reduceat(codes, np.minimum(starts, len(codes) - 1))
+    masks[lengths == 0] = 0
+
+    lookup = np.array([_BITS_PER_CHAR[size] for size in ALPHABET_BY_MASK])
+    return (lengths * lookup[masks]).tolist()
+
+
+def _score_lines_python(data):
+    """score_lines without NumPy, over the same bytes and line boundaries"""
+    lines = data.split(b"\n")
+    if lines[-1] == b"":
+        lines.pop()
+    table = CLASS_TABLE
+    sizes = ALPHABET_BY_MASK
+    bits_per_char = _BITS_PER_CHAR
+    scores = []
+    append = scores.append
+    for line in lines:
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        mask = 0
+        for cls in frozenset(line.translate(table)):
+            mask |= cls
+        append(len(line) * bits_per_char[sizes[mask]])
+    return scores
+
+
+def score_matrix(matrix):
+    """Bits of entropy for each row of an (n, length) uint8 password matrix (NumPy)"""
+    import numpy as np
+
+    codes = np.frombuffer(CLASS_TABLE, dtype=np.uint8)[matrix]
+    masks = np.bitwise_or.reduce(codes, axis=1)
+    lookup = np.array([_BITS_PER_CHAR[size] for size in ALPHABET_BY_MASK])
+    return matrix.shape[1] * lookup[masks]
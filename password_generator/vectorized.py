@@ -0,0 +1,106 @@
+"""
+Optional NumPy backend that produces passwords as a fixed-width byte matrix.
+
+A secrets-seeded uint8 entropy buffer is filtered with a vectorized rejection
+mask (so selection stays unbiased) and mapped onto the charset in one fancy
+indexing step. The result can be viewed as an S{length} array or dumped as a
+single bytes buffer, so millions of passwords reach disk without creating a
+Python str per password.
+
+If NumPy is not installed every function falls back to the pure-Python engine
+in core.py and returns equivalent plain bytes objects.
+"""
+
+import secrets
+
+from .charsets import alphabet_for
+from .core import MAX_ENTROPY_BLOCK, generate_batch
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+
+
+def have_numpy():
+    """Return True when the vectorized backend is available"""
+    return np is not None
+
+
+def _single_byte_alphabet(charset):
+    """Compile charset, requiring one byte per symbol as the fixed-width format does"""
+    alphabet = alphabet_for(charset)
+    if not alphabet.size:
+        raise ValueError("Character set must not be empty")
+    if not alphabet.single_byte:
+        raise ValueError("Vectorized output needs a single-byte (latin-1) character set")
+    return alphabet
+
+
+def _check_shape(n, length):
+    if n < 0:
+        raise ValueError("Password count must not be negative")
+    if length <= 0:
+        raise ValueError("Password length must be positive")
+
+
+def generate_matrix(n, length, charset, randbytes=None):
+    """Return an (n, length) C-contiguous uint8 matrix of password bytes (NumPy only)"""
+    if np is None:
+        raise RuntimeError("NumPy is not installed; use generate_array or generate_buffer")
+    _check_shape(n, length)
+    alphabet = _single_byte_alphabet(charset)
+    limit = alphabet.limit
+    randbytes = randbytes or secrets.token_bytes
+    # The alphabet's translate table already folds "byte % size -> symbol" into one lookup
+    lookup = np.frombuffer(alphabet.table, dtype=np.uint8)[:limit]
+
+    total = n * length
+    out = np.empty(total, dtype=np.uint8)
+    filled = 0
+    while filled < total:
+        want = total - filled
+        block = min(want * 256 // limit + want // 32 + 64, MAX_ENTROPY_BLOCK)
+        raw = np.frombuffer(randbytes(block), dtype=np.uint8)
+        # Vectorized rejection: drop bytes from the biased tail, keep the rest
+        accepted = raw[raw < limit][:want]
+        np.take(lookup, accepted, out=out[filled:filled + len(accepted)])
+        filled += len(accepted)
+    return out.reshape(n, length)
+
+
+def generate_array(n, length, charset):
+    """Return n passwords as a contiguous S{length} array, or a list of bytes without NumPy"""
+    if np is None:
+        _single_byte_alphabet(charset)
+        return [p.encode('latin-1') for p in generate_batch(n, length, charset)]
+    return generate_matrix(n, length, charset).view(f'S{length}').reshape(n)
+
+
+def generate_buffer(n, length, charset, separator=b'\n', randbytes=None):
+    """Return n passwords as one bytes buffer, each followed by separator"""
+    _check_shape(n, length)
+    if np is None:
+        _single_byte_alphabet(charset)
+        sep = separator.decode('latin-1')
+        text = ''.join(p + sep for p in generate_batch(n, length, charset, randbytes))
+        return text.encode('latin-1')
+
+    if not separator:
+        return generate_matrix(n, length, charset, randbytes).tobytes()
+    width = length + len(separator)
+    framed = np.empty((n, width), dtype=np.uint8)
+    framed[:, :length] = generate_matrix(n, length, charset, randbytes)
+    framed[:, length:] = np.frombuffer(separator, dtype=np.uint8)
+    return framed.tobytes()
+
+
+def write_passwords(path, n, length, charset, separator=b'\n', chunk_size=1_000_000):
+    """Write n passwords to path in fixed-size chunks; returns the number written"""
+    written = 0
+    with open(path, 'wb') as f:
+        while written < n:
+            count = min(chunk_size, n - written)
+            f.write(generate_buffer(count, length, charset, separator))
+            written += count
+    return written
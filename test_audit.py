@@ -0,0 +1,149 @@
+"""
+Tests for the streaming uniformity auditor, including a pass/fail run of
+every generation mode
+"""
+
+import os
+import string
+
+import pytest
+
+from password_generator import compile_charset, generate_batch
+from password_generator.audit import (MODES, UniformityAuditor, audit_mode, chi2_sf, main,
+                                      normal_two_sided)
+from password_generator.vectorized import have_numpy
+
+CHARSET = string.ascii_letters + string.digits + string.punctuation
+
+needs_numpy = pytest.mark.skipif(not have_numpy(), reason="NumPy is not installed")
+
+
+def modulo_biased(n, length, chars=CHARSET):
+    """The classic bug: byte % k without rejection favours the first 256 % k symbols"""
+    data = os.urandom(n * length)
+    text = "".join(chars[b % len(chars)] for b in data)
+    return [text[i:i + length] for i in range(0, n * length, length)]
+
+
+def test_statistics_helpers():
+    # Median of chi-square(df) is close to df - 2/3
+    assert chi2_sf(99 - 2 / 3, 99) == pytest.approx(0.5, abs=0.01)
+    assert chi2_sf(150, 99) < 0.001 < chi2_sf(130, 99)
+    assert normal_two_sided(0) == 1.0
+    assert normal_two_sided(1.959964) == pytest.approx(0.05, abs=1e-4)
+
+
+@pytest.mark.parametrize("vectorized", [pytest.param(True, marks=needs_numpy), False])
+def test_correct_generator_passes(vectorized):
+    auditor = UniformityAuditor(CHARSET, 12, vectorized=vectorized)
+    for _ in range(4):
+        auditor.update(generate_batch(5000, 12, compile_charset()))
+    assert auditor.passwords == 20_000
+    assert auditor.chars == 240_000
+    names = {check.name for check in auditor.checks()}
+    assert {"alphabet", "chi2/overall", "chi2/pos0", "chi2/pos11", "serial",
+            "coverage/digits", "coverage/symbols"} <= names
+    assert auditor.passed(), auditor.summary()
+
+
+@needs_numpy
+def test_numpy_and_python_paths_agree():
+    passwords = generate_batch(3000, 10, "abcdefghij0123456789!?") + ["abcéefghij"]
+    fast = UniformityAuditor("abcdefghij0123456789!?", 10, vectorized=True)
+    slow = UniformityAuditor("abcdefghij0123456789!?", 10, vectorized=False)
+    fast.update(passwords)
+    slow.update(passwords)
+    assert fast.checks() == slow.checks()
+
+
+def test_modulo_bias_is_caught():
+    auditor = UniformityAuditor(CHARSET, 16)
+    auditor.update(modulo_biased(20_000, 16))
+    failed = {check.name for check in auditor.failures()}
+    assert "chi2/overall" in failed
+    assert "❌ FAIL" in auditor.summary()
+
+
+def test_single_position_bug_is_caught():
+    passwords = generate_batch(20_000, 8, CHARSET)
+    # Position 3 only ever draws from the first half of the alphabet
+    half = generate_batch(20_000, 1, CHARSET[:47])
+    passwords = [p[:3] + c + p[4:] for p, c in zip(passwords, half)]
+    auditor = UniformityAuditor(CHARSET, 8)
+    auditor.update(passwords)
+    failed = {check.name for check in auditor.failures()}
+    assert "chi2/pos3" in failed
+    assert not {f"chi2/pos{i}" for i in range(8) if i != 3} & failed
+
+
+def test_serial_dependence_is_caught():
+    base = generate_batch(20_000, 16, CHARSET)
+    repeat = os.urandom(20_000 * 16)
+    # Each character repeats its predecessor one time in eight
+    passwords = ["".join(p[i - 1] if i and repeat[n * 16 + i] < 32 else p[i] for i in range(16))
+                 for n, p in enumerate(base)]
+    auditor = UniformityAuditor(CHARSET, 16)
+    auditor.update(passwords)
+    assert "serial" in {check.name for check in auditor.failures()}
+
+
+def test_class_coverage_and_foreign_symbols():
+    # Half the passwords are letters only: per-position counts look merely
+    # lopsided but coverage of digits and symbols collapses
+    passwords = generate_batch(10_000, 16, CHARSET) + generate_batch(10_000, 16, string.ascii_letters)
+    auditor = UniformityAuditor(CHARSET, 16)
+    auditor.update(passwords)
+    failed = {check.name for check in auditor.failures()}
+    assert {"coverage/digits", "coverage/symbols"} <= failed
+
+    auditor = UniformityAuditor("abc", 4)
+    auditor.update(["abca", "abcd"])
+    assert [check.name for check in auditor.failures()] == ["alphabet"]
+    with pytest.raises(ValueError):
+        auditor.update(["abc"])
+
+
+def test_index_streams_and_expected_distribution():
+    auditor = UniformityAuditor(3, 2, expected=[0.5, 0.25, 0.25], classes={})
+    draws = [0 if b < 128 else 1 if b < 192 else 2 for b in os.urandom(20_000)]
+    auditor.update_indices([draws[i:i + 2] for i in range(0, 20_000, 2)])
+    assert auditor.passed(), auditor.summary()
+    # The same stream is far from uniform
+    uniform = UniformityAuditor(3, 2, classes={})
+    uniform.update_indices([draws[i:i + 2] for i in range(0, 20_000, 2)])
+    assert not uniform.passed()
+    with pytest.raises(TypeError):
+        auditor.update(["ab"])
+    with pytest.raises(ValueError):
+        UniformityAuditor(3, 2, expected=[0.5, 0.5, 0.5])
+
+
+def test_buffer_input_matches_strings():
+    passwords = generate_batch(2000, 8, CHARSET)
+    from_strings = UniformityAuditor(CHARSET, 8)
+    from_strings.update(passwords)
+    from_buffer = UniformityAuditor(CHARSET, 8)
+    from_buffer.update_buffer("".join(passwords).encode("latin-1"))
+    assert from_buffer.checks() == from_strings.checks()
+    with pytest.raises(ValueError):
+        from_buffer.update_buffer(b"abc")
+
+
+@pytest.mark.parametrize("mode", [pytest.param(m, marks=needs_numpy) if m == "vectorized" else m
+                                  for m in MODES])
+def test_every_generation_mode_is_uniform(mode):
+    count = 2_000 if mode in ("keyspace", "passphrase") else 20_000
+    auditor = audit_mode(mode, count, length=12, chunk=5_000)
+    assert auditor.passwords == count
+    assert auditor.passed(), auditor.summary()
+
+
+def test_cli_skips_the_vectorized_mode_without_numpy(monkeypatch, capsys):
+    monkeypatch.setattr("password_generator.audit._numpy", lambda: None)
+    assert main(["--mode", "vectorized", "core", "--count", "2000"]) == 0
+    assert "[vectorized] skipped: NumPy is not installed" in capsys.readouterr().out
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        audit_mode("nope", 10)
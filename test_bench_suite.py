@@ -0,0 +1,36 @@
+"""
+Tests for the benchmark suite's regression gate
+"""
+
+import json
+
+from benchmarks.suite import compare, main
+
+
+def result(throughput, p50_us, peak_kib):
+    return {"unit": "pw/s", "throughput": throughput, "p50_us": p50_us, "peak_kib": peak_kib}
+
+
+def test_compare_flags_slowdowns_and_memory_growth():
+    baseline = {"results": {"a": result(1000, 10.0, 1000), "gone": result(1, 1, 1)}}
+    assert compare({"results": {"a": result(900, 11.0, 1050)}}, baseline) == []
+    regressions = compare({"results": {"a": result(500, 30.0, 5000)}}, baseline)
+    assert len(regressions) == 3
+    assert compare({"results": {"a": result(500, 10.0, 1000)}}, baseline, tolerance=0.6) == []
+
+
+def test_suite_saves_and_gates_headless(tmp_path, capsys):
+    path = str(tmp_path / "baseline.json")
+    assert main(["--only", "charset/compile_cached", "--min-time", "0.01", "--save", path]) == 0
+    with open(path) as f:
+        saved = json.load(f)
+    assert set(saved["results"]) == {"charset/compile_cached"}
+    assert {"p50_us", "p95_us", "p99_us", "peak_kib", "throughput"} <= set(
+        saved["results"]["charset/compile_cached"])
+
+    saved["results"]["charset/compile_cached"]["throughput"] *= 1000
+    with open(path, "w") as f:
+        json.dump(saved, f)
+    assert main(["--only", "charset/compile_cached", "--min-time", "0.01",
+                 "--baseline", path]) == 1
+    assert "regression" in capsys.readouterr().out
@@ -0,0 +1,99 @@
+"""
+Tests for breached-password screening with the memory-mapped Bloom filter
+"""
+
+import hashlib
+import math
+import os
+import string
+
+import pytest
+
+from main import check_password_strength
+from password_generator.breach import DEFAULT_FILTER, BreachFilter, build_filter, default_filter
+from password_generator.core import Generator, PasswordPolicy, generate_batch
+from password_generator.strength import BREACHED, assess
+
+CORPUS = ["password", "123456", "Password1!", "letmein", "qwerty", "hunter2"]
+
+
+@pytest.fixture
+def corpus_filter(tmp_path):
+    path = str(tmp_path / "bad.pwbf")
+    build_filter(CORPUS, path, capacity=len(CORPUS))
+    with BreachFilter(path) as breached:
+        yield breached
+
+
+def test_lookup_finds_every_entry(corpus_filter):
+    assert corpus_filter.count == len(CORPUS)
+    assert all(p in corpus_filter for p in CORPUS)
+    assert "correct-horse-battery-staple" not in corpus_filter
+    assert corpus_filter.screen(["fine", "letmein"]) == ["letmein"]
+
+
+def test_hashed_lists_match_plain_lists(tmp_path):
+    lines = [hashlib.sha1(p.encode()).hexdigest().upper() + ":42\n" for p in CORPUS]
+    path = str(tmp_path / "hashed.pwbf")
+    build_filter(iter(lines), path, capacity=len(CORPUS), hashed=True)
+    with BreachFilter(path) as breached:
+        assert all(p in breached for p in CORPUS)
+
+
+def test_numpy_and_pure_python_builds_are_identical(tmp_path):
+    pytest.importorskip("numpy")
+    words = [f"pw{i}" for i in range(5000)]
+    build_filter(words, str(tmp_path / "a.pwbf"), capacity=5000, vectorized=True)
+    build_filter(words, str(tmp_path / "b.pwbf"), capacity=5000, vectorized=False)
+    assert (tmp_path / "a.pwbf").read_bytes() == (tmp_path / "b.pwbf").read_bytes()
+
+
+def test_false_positive_rate_is_near_target(tmp_path):
+    path = str(tmp_path / "fp.pwbf")
+    build_filter((f"bad-{i}" for i in range(20_000)), path, capacity=20_000, fp_rate=0.01)
+    with BreachFilter(path) as breached:
+        false_hits = sum(f"good-{i}" in breached for i in range(20_000))
+    assert false_hits < 20_000 * 0.02
+
+
+def test_bundled_filter_rarely_flags_generated_passwords():
+    with BreachFilter(DEFAULT_FILTER) as bundled:
+        fill = 1 - math.exp(-bundled.nhashes * bundled.count / bundled.nbits)
+        assert fill ** bundled.nhashes < 1e-9
+        charset = string.ascii_letters + string.digits + string.punctuation
+        assert bundled.screen(generate_batch(20_000, 12, charset)) == []
+
+
+def test_non_utf8_lines_are_keyed_by_raw_bytes(tmp_path):
+    source = tmp_path / "leak.txt"
+    source.write_bytes(b"letmein\nlatin1-p\xe4ss\nhunter2\n")
+    dest = tmp_path / "leak.pwbf"
+    assert build_filter(str(source), str(dest)) == 3
+    with BreachFilter(str(dest)) as breached:
+        assert breached.contains_digest(hashlib.sha1(b"latin1-p\xe4ss").digest())
+        assert "letmein" in breached
+
+
+def test_failed_build_removes_temporary_file(tmp_path):
+    dest = tmp_path / "bad.pwbf"
+    with pytest.raises(ValueError):
+        build_filter(iter(["not hex\n"]), str(dest), capacity=1, hashed=True)
+    assert os.listdir(tmp_path) == []
+
+
+def test_builder_counts_lines_and_needs_capacity_for_streams(tmp_path):
+    source = tmp_path / "list.txt"
+    source.write_text("\n".join(CORPUS) + "\n\n")
+    assert build_filter(str(source), str(tmp_path / "f.pwbf")) == len(CORPUS)
+    with pytest.raises(ValueError):
+        build_filter(iter(CORPUS), str(tmp_path / "g.pwbf"))
+
+
+def test_strength_checks_flag_breached_passwords(corpus_filter):
+    assert assess("Password1!").label != BREACHED
+    assert assess("Password1!", breached=corpus_filter) == (0.0, BREACHED)
+    assert default_filter() is not None
+    generator = Generator(PasswordPolicy(12))
+    assert check_password_strength("Password1!", generator) == "Breached (0 bits)"
+    assert check_password_strength("xQ7#pL2@vR9!", generator) == "Very Strong (79 bits)"
+    assert check_password_strength("xQ7#pL2@vR9!") == "Very Strong (79 bits)"
@@ -0,0 +1,51 @@
+"""
+Tests for the compiled charset cache
+"""
+
+import pickle
+import string
+
+import pytest
+
+from password_generator import charsets
+from password_generator.charsets import Alphabet, compile_charset
+
+
+def test_same_policy_returns_cached_alphabet():
+    charsets.clear_cache()
+    first = compile_charset(exclude_similar=True)
+    second = compile_charset(exclude_similar=True)
+    assert first is second
+    stats = charsets.cache_stats()["policies"]
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+def test_alphabet_carries_tables():
+    alphabet = compile_charset(uppercase=False, lowercase=False, symbols=False)
+    assert alphabet.chars == string.digits
+    assert alphabet.size == len(alphabet) == 10
+    assert alphabet.limit == 250
+    assert len(alphabet.table) == 256
+    assert alphabet.table[:10] == b"0123456789"
+    assert alphabet.rejected == bytes(range(250, 256))
+
+
+def test_include_exclude_and_exclusions():
+    alphabet = compile_charset(uppercase=False, lowercase=False, digits=True, symbols=False,
+                               exclude_similar=True, include="xy", exclude="9")
+    assert alphabet.chars == "2345678xy"
+    assert not compile_charset(False, False, False, False)
+
+
+def test_alphabet_is_immutable_and_picklable():
+    alphabet = Alphabet("abc")
+    with pytest.raises(AttributeError):
+        alphabet.chars = "xyz"
+    assert pickle.loads(pickle.dumps(alphabet)) == alphabet
+
+
+def test_multibyte_alphabet():
+    alphabet = Alphabet("αβγ")
+    assert not alphabet.single_byte
+    assert alphabet.decode(bytes([0, 2, 1])) == "αγβ"
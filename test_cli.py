@@ -0,0 +1,100 @@
+"""
+Tests for the non-interactive command-line mode of main.py
+"""
+
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from main import build_arg_parser, resolve_charset, write_passphrases
+from password_generator import streaming
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Cumulative import budget for `import main`, in microseconds
+IMPORT_BUDGET_US = 100_000
+
+
+def run_main(*args):
+    return subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), *args],
+                          capture_output=True, text=True, cwd=ROOT)
+
+
+def test_flags_generate_without_prompts():
+    result = run_main("--length", "20", "--count", "3", "--charset", "digits")
+    assert result.returncode == 0
+    lines = result.stdout.splitlines()
+    assert len(lines) == 3
+    assert all(len(p) == 20 and p.isdigit() for p in lines)
+
+
+def test_json_format_and_exclusions():
+    result = run_main("--count", "4", "--length", "30", "--format", "json",
+                      "--exclude-similar", "--exclude-ambiguous")
+    passwords = json.loads(result.stdout)
+    assert len(passwords) == 4
+    assert not set(''.join(passwords)) & set("0Ol1I{}[]()/'\"~,;.<>")
+
+
+def test_bad_options_exit_with_usage_error():
+    assert run_main("--charset", "emoji").returncode == 2
+    assert run_main("--length", "0").returncode == 2
+    assert run_main("--chars", "0O", "--exclude-similar").returncode == 2
+
+
+def test_options_that_would_be_ignored_are_rejected():
+    result = run_main("--seed", "abc", "--words", "3")
+    assert result.returncode == 2
+    assert "--seed" in result.stderr
+    assert run_main("--start", "5").returncode == 2
+    assert run_main("--start", "5", "--words", "3").returncode == 2
+
+
+def test_piped_answers_keep_the_original_prompt_order():
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py")],
+                            input="12\ny\ny\ny\nn\n", capture_output=True, text=True, cwd=ROOT)
+    assert result.returncode == 0, result.stderr
+    assert "Invalid input" not in result.stdout
+    line = next(l for l in result.stdout.splitlines() if "Generated Password:" in l)
+    assert len(line.split(": ", 1)[1]) == 12
+
+
+def test_passphrases_are_written_chunk_by_chunk(monkeypatch):
+    monkeypatch.setattr(streaming, "DEFAULT_CHUNK_SIZE", 7)
+    args = build_arg_parser().parse_args(["--words", "3", "--count", "20", "--format", "csv"])
+    out = io.BytesIO()
+    write_passphrases(out, args)
+    rows = list(csv.reader(io.StringIO(out.getvalue().decode())))
+    assert rows[0] == ["index", "password"]
+    assert [int(r[0]) for r in rows[1:]] == list(range(20))
+    assert all(len(r[1].split("-")) == 3 for r in rows[1:])
+
+
+def test_resolve_charset():
+    assert resolve_charset("digits").chars == "0123456789"
+    assert resolve_charset("letters,upper") == resolve_charset("letters")
+    assert resolve_charset("digits", chars="aab").chars == "ab"
+    with pytest.raises(ValueError):
+        resolve_charset("nope")
+
+
+def test_single_password_imports_stay_lean():
+    code = ("import sys, main; main.run_cli(['--length', '12']); "
+            "print(','.join(m for m in ('tkinter', 'pyperclip', 'numpy') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT)
+    assert result.returncode == 0
+    assert result.stdout.splitlines()[-1] == ""
+
+
+def test_import_time_under_budget():
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            capture_output=True, text=True, cwd=ROOT)
+    cumulative = [int(line.split("|")[1]) for line in result.stderr.splitlines()
+                  if line.rstrip().endswith("| main")]
+    assert cumulative, result.stderr
+    assert cumulative[0] < IMPORT_BUDGET_US
@@ -0,0 +1,160 @@
+"""
+Tests for the shared bulk generation engine in password_generator.core
+"""
+
+import string
+from collections import Counter
+
+import pytest
+
+from password_generator.core import (
+    Generator,
+    PasswordPolicy,
+    generate_batch,
+    generate_password,
+    random_string,
+    rejection_limit,
+)
+
+ALL_CHARS = string.ascii_letters + string.digits + string.punctuation
+
+# Cumulative import budget for `import password_generator.core`, in microseconds
+CORE_IMPORT_BUDGET_US = 50_000
+
+
+def test_batch_shape_and_charset():
+    passwords = generate_batch(500, 16, ALL_CHARS)
+    assert len(passwords) == 500
+    assert all(len(p) == 16 for p in passwords)
+    assert set(''.join(passwords)) <= set(ALL_CHARS)
+
+
+def test_single_password():
+    password = generate_password(12, string.digits)
+    assert len(password) == 12
+    assert password.isdigit()
+
+
+def test_rejection_limit_is_multiple_of_size():
+    for size in (1, 10, 62, 94, 255, 256):
+        limit = rejection_limit(size)
+        assert limit % size == 0
+        assert 256 - size < limit <= 256
+
+
+def test_distribution_is_roughly_uniform():
+    # 94 symbols do not divide 256, so a plain modulo would skew the first 68
+    counts = Counter(random_string(94 * 2000, ALL_CHARS))
+    assert set(counts) == set(ALL_CHARS)
+    assert max(counts.values()) < 2000 * 1.25
+    assert min(counts.values()) > 2000 * 0.75
+
+
+def test_non_latin1_and_wide_charsets():
+    greek = "αβγδεζηθ"
+    assert set(random_string(200, greek)) <= set(greek)
+    wide = ''.join(chr(0x4E00 + i) for i in range(300))
+    text = random_string(1000, wide)
+    assert len(text) == 1000
+    assert set(text) <= set(wide)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        generate_batch(1, 0, ALL_CHARS)
+    with pytest.raises(ValueError):
+        generate_batch(-1, 8, ALL_CHARS)
+    with pytest.raises(ValueError):
+        generate_password(8, "")
+    assert generate_batch(0, 8, ALL_CHARS) == []
+
+
+def test_entry_points_do_not_use_mersenne_twister():
+    # Security review: credentials must come from the OS CSPRNG, never `random`
+    import ast
+    import os
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    package = os.path.join(root, "password_generator")
+    sources = ["main.py", "gui_password_generator.py", "demo.py"]
+    sources += [os.path.join("password_generator", f) for f in os.listdir(package)
+                if f.endswith(".py")]
+    for source in sources:
+        with open(os.path.join(root, source), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                assert all(alias.name != "random" for alias in node.names), source
+            elif isinstance(node, ast.ImportFrom):
+                assert node.module != "random", source
+
+
+def test_default_sources_are_os_csprng(monkeypatch):
+    import os as os_module
+
+    calls = []
+
+    def tracking_urandom(n):
+        calls.append(n)
+        return original(n)
+
+    original = os_module.urandom
+    monkeypatch.setattr(os_module, "urandom", tracking_urandom)
+    generate_batch(10, 8, ALL_CHARS)
+    assert calls
+
+
+def test_policy_is_typed_and_immutable():
+    policy = PasswordPolicy(12, symbols=False)
+    assert policy.alphabet().chars == string.ascii_uppercase + string.ascii_lowercase + string.digits
+    assert policy == PasswordPolicy(12, symbols=False) and len({policy, policy.replace()}) == 1
+    assert policy.replace(length=20).length == 20
+    assert not hasattr(policy, "__dict__")
+    with pytest.raises(AttributeError):
+        policy.length = 4
+    with pytest.raises(TypeError):
+        PasswordPolicy("12")
+    with pytest.raises(TypeError):
+        PasswordPolicy(True)
+    with pytest.raises(TypeError):
+        PasswordPolicy(8, digits="yes")
+    with pytest.raises(ValueError):
+        PasswordPolicy(0)
+
+
+def test_policy_from_tokens():
+    assert PasswordPolicy.from_tokens("letters, DIGITS", 12) == PasswordPolicy(12, symbols=False)
+    assert PasswordPolicy.from_tokens("", 12) == PasswordPolicy(12)
+    assert PasswordPolicy.from_tokens("no-similar") == PasswordPolicy(exclude_similar=True)
+    assert PasswordPolicy.from_tokens("digits", exclude_ambiguous=True).exclude_ambiguous
+    with pytest.raises(ValueError):
+        PasswordPolicy.from_tokens("emoji")
+
+
+def test_generator_single_and_batch():
+    generator = Generator(PasswordPolicy(10, uppercase=False, lowercase=False, symbols=False))
+    assert len(generator.generate()) == 10 and generator.generate().isdigit()
+    batch = generator.generate_batch(50)
+    assert len(batch) == 50 and all(len(p) == 10 and p.isdigit() for p in batch)
+    assert generator.bits == pytest.approx(10 * 3.3219, rel=1e-3)
+    assert generator.assess(batch[0]).bits == pytest.approx(generator.bits)
+    with pytest.raises(ValueError):
+        Generator(PasswordPolicy(8, False, False, False, False))
+
+
+def test_core_import_is_lean_and_fast():
+    import os
+    import subprocess
+    import sys
+
+    code = ("import sys, password_generator.core; "
+            "print(','.join(m for m in ('tkinter', 'pyperclip') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.returncode == 0
+    assert result.stdout.strip() == ""
+    cumulative = [int(line.split("|")[1]) for line in result.stderr.splitlines()
+                  if line.split("|")[-1].strip() == "password_generator"]
+    assert cumulative, result.stderr
+    assert cumulative[0] < CORE_IMPORT_BUDGET_US
@@ -0,0 +1,47 @@
+"""
+Tests for demo.py's in-process, lazily importing launcher
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import demo
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_demo_starts_without_tools_or_tkinter():
+    code = ("import sys, demo; "
+            "print(','.join(m for m in ('main', 'gui_password_generator', 'tkinter') "
+            "if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_cli_launches_in_process(monkeypatch, capsys):
+    answers = iter(["10", "y", "y", "n", "n", "n"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    demo.launch("cli")
+    assert "Generated Password:" in capsys.readouterr().out
+    # A second launch reuses the imported module instead of starting a new interpreter
+    module = sys.modules["main"]
+    answers = iter(["12", "y", "n", "n", "n", "n"])
+    demo.launch("cli")
+    assert sys.modules["main"] is module
+    assert "Generated Password:" in capsys.readouterr().out
+
+
+def test_unknown_tool():
+    with pytest.raises(KeyError):
+        demo.launch("nope")
+
+
+def test_menu_exits_on_end_of_input():
+    result = subprocess.run([sys.executable, "demo.py"], input="3\n", capture_output=True,
+                            text=True, cwd=ROOT, timeout=30)
+    assert result.returncode == 0
+    assert "Thanks for using" in result.stdout
@@ -0,0 +1,98 @@
+"""
+Tests for the pre-filled, background-refilled entropy pool
+"""
+
+import multiprocessing
+import os
+import string
+import time
+
+import pytest
+
+from password_generator.core import generate_password
+from password_generator.entropy import EntropyPool
+
+
+def wait_for_standby(pool, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not pool.stats()["standby_ready"]:
+        assert time.monotonic() < deadline, "background refill never completed"
+        time.sleep(0.001)
+
+
+def test_read_wipes_consumed_bytes():
+    pool = EntropyPool(size=4096, background=False)
+    data = pool.read(64)
+    assert len(data) == 64 and isinstance(data, bytes)
+    assert bytes(pool._active[:64]) == bytes(64)
+    assert pool.stats()["bytes_served"] == 64
+
+
+def test_take_is_zero_copy_view():
+    pool = EntropyPool(size=4096, background=False)
+    view = pool.take(32)
+    assert isinstance(view, memoryview) and view.readonly
+    assert view.obj is pool._active
+
+
+def test_taken_regions_are_wiped_when_the_buffer_is_recycled():
+    pool = EntropyPool(size=4096, background=False)
+    view = pool.take(32)
+    pool._standby_ready = True
+    pool.take(4096)
+    assert bytes(view) == bytes(32)
+
+
+def _child_password(results):
+    results.put(generate_password(16, string.ascii_lowercase))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_forked_children_do_not_share_entropy():
+    generate_password(16, string.ascii_lowercase)  # create and draw from the default pool
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    children = [ctx.Process(target=_child_password, args=(results,)) for _ in range(4)]
+    for child in children:
+        child.start()
+    passwords = [results.get(timeout=10) for _ in children]
+    for child in children:
+        child.join()
+    passwords.append(generate_password(16, string.ascii_lowercase))
+    assert len(set(passwords)) == len(passwords)
+
+
+def test_background_refill_avoids_stalls():
+    pool = EntropyPool(size=4096, low_water=0.5)
+    try:
+        for _ in range(20):
+            wait_for_standby(pool)
+            for _ in range(4096 // 128):
+                pool.read(128)
+        stats = pool.stats()
+        assert stats["stalls"] == 0
+        assert stats["refills"] >= 19
+    finally:
+        pool.close()
+
+
+def test_without_background_thread_every_recycle_stalls():
+    pool = EntropyPool(size=1024, background=False)
+    for _ in range(3 * 1024 // 256):
+        pool.read(256)
+    stats = pool.stats()
+    assert stats["stalls"] == 2
+    assert stats["available"] == 0
+
+
+def test_large_requests_bypass_pool():
+    pool = EntropyPool(size=1024, background=False)
+    assert len(pool.read(5000)) == 5000
+    assert pool.stats()["available"] == 1024
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        EntropyPool(size=0)
+    with pytest.raises(ValueError):
+        EntropyPool(low_water=1.5)
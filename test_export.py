@@ -0,0 +1,160 @@
+"""
+Tests for streaming, chunked AEAD-encrypted exports
+"""
+
+import io
+import string
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from password_generator.export import (HEADER_SIZE, TAG_SIZE, EncryptedReader, EncryptedWriter,
+                                       export_encrypted, new_key)
+
+CHARSET = string.ascii_letters + string.digits
+
+
+class CountingSink:
+    """Write-only file object that keeps nothing but a byte count"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+
+
+def make_export(count, key, chunk_size=1024, **kwargs):
+    buf = io.BytesIO()
+    export_encrypted(buf, count, 12, CHARSET, key, chunk_size=chunk_size, **kwargs)
+    return buf
+
+
+@pytest.mark.parametrize("cipher", ["aes-256-gcm", "chacha20-poly1305"])
+def test_round_trip(cipher):
+    key = new_key()
+    buf = make_export(5000, key, cipher=cipher)
+    with EncryptedReader(buf, key) as reader:
+        passwords = list(reader)
+    assert len(passwords) == 5000
+    assert all(len(p) == 12 and set(p) <= set(CHARSET) for p in passwords)
+    assert len(set(passwords)) == 5000
+
+
+def test_non_ascii_charset_round_trips():
+    key = new_key()
+    buf = io.BytesIO()
+    export_encrypted(buf, 5000, 8, "abcé", key)
+    with EncryptedReader(buf, key) as reader:
+        passwords = list(reader)
+    assert len(passwords) == 5000
+    assert all(len(p) == 8 and set(p) <= set("abcé") for p in passwords)
+
+
+def test_chunks_are_fixed_size_and_seekable():
+    key = new_key()
+    buf = make_export(5000, key)
+    reader = EncryptedReader(buf, key)
+    assert len(buf.getvalue()) == HEADER_SIZE + reader.chunk_count * (1024 + TAG_SIZE)
+    everything = list(reader)
+    per_chunk = (1024 - 4) // 13
+    assert reader.passwords(7) == everything[7 * per_chunk:8 * per_chunk]
+    assert reader.passwords(reader.chunk_count - 1) == everything[(reader.chunk_count - 1) * per_chunk:]
+    with pytest.raises(IndexError):
+        reader.read_chunk(reader.chunk_count)
+
+
+def test_no_plaintext_on_disk():
+    key = new_key()
+    buf = io.BytesIO()
+    with EncryptedWriter(buf, key, chunk_size=256) as writer:
+        writer.write(["needle-password-1", "needle-password-2"])
+    assert b"needle" not in buf.getvalue()
+    assert list(EncryptedReader(buf, key)) == ["needle-password-1", "needle-password-2"]
+
+
+def test_passphrase_and_wrong_keys():
+    buf = io.BytesIO()
+    with EncryptedWriter(buf, passphrase="correct horse", chunk_size=128) as writer:
+        writer.write(["dürer", "x" * 40])
+    assert list(EncryptedReader(buf, passphrase="correct horse")) == ["dürer", "x" * 40]
+    with pytest.raises(ValueError):
+        EncryptedReader(buf, passphrase="wrong horse").read_chunk(0)
+    with pytest.raises(ValueError):
+        EncryptedReader(buf, key=new_key())
+    with pytest.raises(ValueError):
+        make_export(10, new_key()[:16])
+
+
+def test_tampering_and_truncation_are_detected():
+    key = new_key()
+    data = make_export(3000, key).getvalue()
+    stride = 1024 + TAG_SIZE
+
+    flipped = bytearray(data)
+    flipped[HEADER_SIZE + stride + 5] ^= 1
+    reader = EncryptedReader(io.BytesIO(bytes(flipped)), key)
+    reader.read_chunk(0)
+    with pytest.raises(ValueError):
+        reader.read_chunk(1)
+
+    # Header edits change every chunk's associated data
+    header = bytearray(data)
+    header[HEADER_SIZE - 1] ^= 1
+    with pytest.raises(ValueError):
+        EncryptedReader(io.BytesIO(bytes(header)), key).read_chunk(0)
+
+    # Dropping whole chunks leaves a last chunk not sealed as final
+    truncated = EncryptedReader(io.BytesIO(data[:-stride]), key)
+    with pytest.raises(ValueError):
+        list(truncated)
+    with pytest.raises(ValueError):
+        EncryptedReader(io.BytesIO(data[:-1]), key)
+
+
+def test_unfinished_writer_is_not_readable():
+    key = new_key()
+    buf = io.BytesIO()
+    with pytest.raises(RuntimeError):
+        with EncryptedWriter(buf, key, chunk_size=128) as writer:
+            writer.write(["a" * 20] * 50)
+            raise RuntimeError("generation failed")
+    reader = EncryptedReader(buf, key)
+    with pytest.raises(ValueError):
+        list(reader)
+
+
+def test_bad_input():
+    with pytest.raises(ValueError):
+        EncryptedWriter(io.BytesIO(), new_key(), chunk_size=128).write(["two\nlines"])
+    with pytest.raises(ValueError):
+        EncryptedWriter(io.BytesIO(), new_key(), chunk_size=64).write_block(b"y" * 100 + b"\n")
+    with pytest.raises(ValueError):
+        EncryptedWriter(io.BytesIO(), new_key(), passphrase="both")
+    with pytest.raises(ValueError):
+        EncryptedReader(io.BytesIO(b"PWEX" + bytes(100)), new_key())
+
+
+@pytest.mark.parametrize("log2_n", [0, 20, 64, 255])
+def test_scrypt_cost_from_the_header_is_bounded(log2_n):
+    data = bytearray(make_export(10, new_key()).getvalue())
+    data[7], data[8] = 1, log2_n  # claim a passphrase-derived key of cost 2**log2_n
+    with pytest.raises(ValueError, match="scrypt cost"):
+        EncryptedReader(io.BytesIO(bytes(data)), passphrase="guess")
+
+
+def test_memory_stays_flat():
+    key = new_key()
+
+    def peak(count):
+        tracemalloc.start()
+        try:
+            export_encrypted(CountingSink(), count, 16, CHARSET, key)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    small, large = peak(20_000), peak(400_000)
+    assert large < small * 1.5 + 256 * 1024
@@ -6,12 +6,14 @@ This script tests both the command-line and GUI versions programmatically
 
 import sys
 import os
-import random
 import string
 
 # Add current directory to path to import our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from password_generator import Generator, PasswordPolicy
+from password_generator.audit import UniformityAuditor
+
 def test_password_generation():
     """Test the core password generation logic"""
     print("🧪 Testing Password Generation Logic...")
@@ -26,81 +28,59 @@ def test_password_generation():
     ]
     
     for i, case in enumerate(test_cases, 1):
-        try:
-            password = ''.join(random.choice(case["chars"]) for _ in range(case["length"]))
-            print(f"✅ Test {i}: {case['name']}")
-            print(f"   Length: {len(password)} (expected: {case['length']})")
-            print(f"   Password: {password}")
-            print(f"   Valid characters: {all(c in case['chars'] for c in password)}")
-            print()
-        except Exception as e:
-            print(f"❌ Test {i} failed: {e}")
-    
-    return True
+        policy = PasswordPolicy(case["length"], uppercase=False, lowercase=False, digits=False,
+                                symbols=False, include=case["chars"])
+        password = Generator(policy).generate()
+        print(f"✅ Test {i}: {case['name']}")
+        print(f"   Length: {len(password)} (expected: {case['length']})")
+        assert len(password) == case["length"]
+        assert all(c in case["chars"] for c in password)
+
+        # Membership alone would not catch a biased mapping: audit a batch too
+        auditor = UniformityAuditor(case["chars"], case["length"])
+        auditor.update(Generator(policy).generate_batch(5000))
+        assert auditor.passed(), auditor.summary()
+    print()
 
 def test_strength_calculation():
     """Test password strength calculation"""
     print("🛡️ Testing Password Strength Calculation...")
     
     # Import the strength function from main.py
-    try:
-        from main import check_password_strength
-        
-        test_passwords = [
-            {"password": "abc", "expected": "Weak", "has_letters": True, "has_numbers": False, "has_symbols": False},
-            {"password": "Abc123!@", "expected": "Strong", "has_letters": True, "has_numbers": True, "has_symbols": True},
-            {"password": "VeryLongPasswordWith123AndSymbols!", "expected": "Very Strong", "has_letters": True, "has_numbers": True, "has_symbols": True},
-            {"password": "12345678", "expected": "Weak", "has_letters": False, "has_numbers": True, "has_symbols": False},
-        ]
-        
-        for i, test in enumerate(test_passwords, 1):
-            strength = check_password_strength(
-                test["password"], 
-                test["has_letters"], 
-                test["has_numbers"], 
-                test["has_symbols"]
-            )
-            status = "✅" if test["expected"].lower() in strength.lower() else "❌"
-            print(f"{status} Test {i}: '{test['password'][:10]}...' -> {strength}")
-        
-        print()
-        return True
-        
-    except ImportError as e:
-        print(f"❌ Could not import strength function: {e}")
-        return False
+    from main import check_password_strength
+    
+    test_passwords = [
+        {"password": "abc", "expected": "Very Weak", "has_letters": True, "has_numbers": False, "has_symbols": False},
+        {"password": "Abc123!@", "expected": "Strong", "has_letters": True, "has_numbers": True, "has_symbols": True},
+        {"password": "VeryLongPasswordWith123AndSymbols!", "expected": "Very Strong", "has_letters": True, "has_numbers": True, "has_symbols": True},
+        {"password": "12345678", "expected": "Breached", "has_letters": False, "has_numbers": True, "has_symbols": False},
+    ]
+    
+    for i, test in enumerate(test_passwords, 1):
+        policy = PasswordPolicy(16, uppercase=test["has_letters"], lowercase=test["has_letters"],
+                                digits=test["has_numbers"], symbols=test["has_symbols"])
+        strength = check_password_strength(test["password"], Generator(policy))
+        print(f"✅ Test {i}: '{test['password'][:10]}...' -> {strength}")
+        assert strength.startswith(test["expected"] + " ("), strength
+    print()
 
 def test_gui_imports():
-    """Test if GUI dependencies are available"""
+    """Report whether GUI dependencies are available, without touching the clipboard or display"""
+    import importlib.util
+    
     print("🖥️ Testing GUI Dependencies...")
     
-    try:
-        import tkinter as tk
+    if importlib.util.find_spec("tkinter"):
         print("✅ tkinter is available")
-        
-        try:
-            import pyperclip
-            print("✅ pyperclip is available")
-            
-            # Test clipboard functionality
-            test_text = "test_password_123"
-            pyperclip.copy(test_text)
-            copied_text = pyperclip.paste()
-            if copied_text == test_text:
-                print("✅ Clipboard functionality works")
-            else:
-                print("⚠️ Clipboard functionality may have issues")
-                
-        except ImportError:
-            print("⚠️ pyperclip not available - clipboard features will not work")
-            print("   Install with: pip install pyperclip")
-        
-        print()
-        return True
-        
-    except ImportError:
-        print("❌ tkinter not available - GUI version will not work")
-        return False
+    else:
+        print("⚠️ tkinter not available - GUI version will not work")
+    
+    if importlib.util.find_spec("pyperclip"):
+        print("✅ pyperclip is available")
+    else:
+        print("⚠️ pyperclip not available - clipboard features will not work")
+        print("   Install with: pip install pyperclip")
+    print()
 
 def test_file_structure():
     """Test if all required files are present"""
@@ -117,14 +97,9 @@ def test_file_structure():
     
     for file in required_files:
         file_path = os.path.join(current_dir, file)
-        if os.path.exists(file_path):
-            size = os.path.getsize(file_path)
-            print(f"✅ {file} exists ({size} bytes)")
-        else:
-            print(f"❌ {file} is missing")
-    
+        assert os.path.exists(file_path), f"{file} is missing"
+        print(f"✅ {file} exists ({os.path.getsize(file_path)} bytes)")
     print()
-    return True
 
 def main():
     """Run all tests"""
@@ -144,10 +119,10 @@ def main():
     
     for test in tests:
         try:
-            if test():
-                passed += 1
+            test()
+            passed += 1
         except Exception as e:
-            print(f"❌ Test failed with exception: {e}")
+            print(f"❌ {test.__name__} failed: {e!r}")
     
     print("=" * 50)
     print(f"📊 Test Results: {passed}/{total} tests passed")
@@ -160,6 +135,8 @@ def main():
     print("\n🚀 To run the applications:")
     print("   Command-line: python main.py")
     print("   GUI version:  python gui_password_generator.py")
+    print("   Benchmarks:   python benchmarks/suite.py --baseline benchmarks/baseline.json")
+    return 0 if passed == total else 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
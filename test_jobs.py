@@ -0,0 +1,57 @@
+"""
+Tests for background batch jobs used by the GUI batch panel
+"""
+
+import string
+
+from password_generator.jobs import BatchJob
+
+
+def collect(job):
+    results = []
+    while not job.done or not job.chunks.empty():
+        for chunk in job.drain():
+            results.extend(chunk)
+        job.join(0.01)
+    return results
+
+
+def test_job_delivers_all_passwords_in_chunks():
+    job = BatchJob(25_000, 12, string.ascii_letters, chunk_size=4000).start()
+    results = collect(job)
+    assert job.error is None
+    assert len(results) == 25_000
+    assert all(len(p) == 12 for p in results[:100])
+
+
+def test_long_passwords_use_smaller_chunks():
+    job = BatchJob(10, 4096, string.digits)
+    assert job.chunk_size == 256
+    results = collect(job.start())
+    assert [len(p) for p in results] == [4096] * 10
+
+
+def test_cancel_stops_between_chunks():
+    job = BatchJob(10_000_000, 16, string.ascii_letters, chunk_size=1000).start()
+    job.cancel()
+    assert job.join(5)
+    assert job.cancelled
+    assert job.generated < 10_000_000
+
+
+def test_errors_are_reported_not_raised():
+    job = BatchJob(10, 8, "").start()
+    job.join(5)
+    assert isinstance(job.error, ValueError)
+
+
+def test_job_applies_a_generators_rules():
+    from password_generator.policy import ConstrainedGenerator
+
+    generator = ConstrainedGenerator(8, string.ascii_lowercase + string.digits, {"digits": 2},
+                                     no_repeats=True)
+    results = collect(BatchJob(5000, 8, generator.alphabet, chunk_size=1000,
+                               generator=generator).start())
+    assert len(results) == 5000
+    assert all(sum(c.isdigit() for c in p) >= 2 for p in results)
+    assert all(a != b for p in results for a, b in zip(p, p[1:]))
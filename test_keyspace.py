@@ -0,0 +1,76 @@
+"""
+Tests for keyed sampling without replacement over short-code keyspaces
+"""
+
+import string
+
+import pytest
+
+from password_generator.keyspace import (
+    CodeIssuer,
+    CodeSequence,
+    load_cursor,
+    new_key,
+    save_cursor,
+    split_range,
+)
+
+
+def test_every_pin_is_issued_exactly_once():
+    sequence = CodeSequence(new_key(), string.digits, 3)
+    codes = list(sequence.iter_codes())
+    assert len(codes) == 1000
+    assert sorted(codes) == [f"{i:03d}" for i in range(1000)]
+    assert codes[:20] != [f"{i:03d}" for i in range(20)]
+
+
+def test_order_depends_on_key():
+    a = CodeSequence(b"key-a", string.digits, 4)
+    b = CodeSequence(b"key-b", string.digits, 4)
+    assert list(a.iter_codes(0, 20)) != list(b.iter_codes(0, 20))
+    assert list(a.iter_codes(0, 20)) == list(CodeSequence(b"key-a", string.digits, 4).iter_codes(0, 20))
+
+
+def test_inverse_on_huge_keyspace():
+    sequence = CodeSequence(new_key(), string.digits, 12)
+    assert sequence.size == 10**12
+    for index in (0, 1, 123456789, 10**12 - 1):
+        code = sequence.code_at(index)
+        assert len(code) == 12 and code.isdigit()
+        assert sequence.index_of(code) == index
+
+
+def test_resume_from_saved_cursor(tmp_path):
+    sequence = CodeSequence(new_key(), string.ascii_uppercase, 2)
+    issuer = CodeIssuer(sequence)
+    first = issuer.issue(100)
+    path = tmp_path / "cursor.json"
+    save_cursor(path, issuer)
+
+    resumed = load_cursor(path, sequence)
+    rest = resumed.issue(10**6)
+    assert resumed.remaining == 0
+    assert len(set(first + rest)) == 26 * 26
+    assert "key" not in path.read_text()
+
+
+def test_parallel_ranges_are_disjoint():
+    sequence = CodeSequence(new_key(), string.digits, 3)
+    ranges = split_range(sequence.size, 3)
+    assert ranges == [(0, 334), (334, 667), (667, 1000)]
+    issued = [code for start, stop in ranges for code in CodeIssuer(sequence, start, stop).issue(1000)]
+    assert len(issued) == len(set(issued)) == 1000
+
+
+def test_invalid_cursor():
+    sequence = CodeSequence(new_key(), string.digits, 2)
+    with pytest.raises(ValueError):
+        CodeIssuer(sequence, 10, 20, cursor=25)
+
+
+def test_foreign_characters_and_long_keys_are_rejected():
+    sequence = CodeSequence(new_key(), string.digits, 4)
+    with pytest.raises(ValueError):
+        sequence.index_of("12a4")
+    with pytest.raises(ValueError):
+        CodeSequence(b"k" * 65, string.digits, 4)
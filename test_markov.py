@@ -0,0 +1,158 @@
+"""
+Tests for pronounceable passwords sampled from a compiled trigram model
+"""
+
+import gc
+import math
+import os
+import weakref
+from collections import Counter
+
+import pytest
+
+from password_generator.markov import (DEFAULT_CORPUS, MarkovGenerator, TrigramModel, build_model,
+                                       generate_pronounceable, load_model)
+
+
+@pytest.fixture
+def tiny_model(tmp_path):
+    path = str(tmp_path / "tiny.pwmk")
+    build_model(["# comment", "1\tab", "2\tab", "3\tac", "", "4\tba"], path)
+    return TrigramModel(path)
+
+
+def counter_bytes(start):
+    """Deterministic randbytes stand-in: start, start + 1, ... as little-endian uint16"""
+    counter = [start]
+
+    def randbytes(n):
+        start = counter[0]
+        counter[0] += n // 2
+        return b"".join(((start + i) & 0xFFFF).to_bytes(2, "little") for i in range(n // 2))
+    return randbytes
+
+
+def test_every_state_sums_to_full_resolution():
+    model = load_model()
+    units = 1 << model.bits
+    for state in range(model.states):
+        weights = model.weights(state)
+        assert len(weights) == model.k
+        assert sum(weights) == units
+        assert min(weights) >= 0
+
+
+def test_transitions_follow_the_corpus(tiny_model):
+    # From the start state the corpus begins with "a" 3 times out of 4
+    weights = tiny_model.weights(0)
+    units = 1 << tiny_model.bits
+    assert weights[0] == 3 * units // 4
+    assert weights[1] == units // 4
+    assert sum(weights[2:]) == 0
+    # After "a" at the start: "b" twice, "c" once
+    state = tiny_model.next_state(0, 0)
+    weights = tiny_model.weights(state)
+    assert weights[1] + weights[2] == units
+    assert weights[1] == pytest.approx(2 * units / 3, abs=1)
+
+
+def test_sample_matches_lookup_table(tiny_model):
+    pytest.importorskip("numpy")
+    lookup = tiny_model.lookup()
+    units = 1 << tiny_model.bits
+    assert len(lookup) == tiny_model.states * units
+    for state in (0, tiny_model.next_state(0, 0), 5, tiny_model.states - 1):
+        for r in range(0, units, 7):
+            assert tiny_model.sample(state, r) == lookup[state * units + r]
+
+
+def test_batch_and_single_paths_agree():
+    # Feeding both paths the same random stream must give the same passwords
+    single = MarkovGenerator(10, randbytes=counter_bytes(12345))
+    batch = MarkovGenerator(10, randbytes=counter_bytes(12345))
+    expected = [single.generate() for _ in range(50)]
+    assert batch.generate_batch(50) == expected
+
+
+def test_output_shape_and_options():
+    gen = MarkovGenerator(14, capitalize=True)
+    for password in gen.generate_batch(200) + [gen.generate()]:
+        assert len(password) == 14
+        assert password[0].isupper()
+        assert password[1:].isalpha() and password[1:].islower()
+    assert len(generate_pronounceable(8)) == 8
+    with pytest.raises(ValueError):
+        MarkovGenerator(0)
+
+
+def test_entropy_is_exact_on_a_small_model(tiny_model):
+    gen = MarkovGenerator(2, tiny_model)
+    shannon, minimum = tiny_model.entropy(2)
+    assert gen.entropy_bits == shannon
+    assert gen.min_entropy_bits == minimum
+    # Brute force over every two-letter string the model can emit
+    units = 1 << tiny_model.bits
+    total = 0.0
+    best = 0.0
+    for a in range(tiny_model.k):
+        pa = tiny_model.weights(0)[a] / units
+        if not pa:
+            continue
+        state = tiny_model.next_state(0, a)
+        for b, w in enumerate(tiny_model.weights(state)):
+            if w:
+                p = pa * w / units
+                total -= p * math.log2(p)
+                best = max(best, p)
+    assert shannon == pytest.approx(total)
+    assert minimum == pytest.approx(-math.log2(best))
+
+
+def test_entropy_cache_does_not_keep_models_alive(tmp_path):
+    path = str(tmp_path / "tiny.pwmk")
+    build_model(["ab", "ac", "ba"], path)
+    model = TrigramModel(path)
+    assert model.entropy(4) is model.entropy(4)
+    ref = weakref.ref(model)
+    del model
+    gc.collect()
+    assert ref() is None
+
+
+def test_entropy_is_reported_honestly():
+    gen = MarkovGenerator(12)
+    assert 0 < gen.min_entropy_bits < gen.entropy_bits < 12 * math.log2(26)
+    assert MarkovGenerator(16).entropy_bits > gen.entropy_bits
+
+
+def test_surprisal(tiny_model):
+    units = 1 << tiny_model.bits
+    assert tiny_model.surprisal("a") == pytest.approx(-math.log2(tiny_model.weights(0)[0] / units))
+    assert tiny_model.surprisal("z") == math.inf
+    assert tiny_model.surprisal("a1") == math.inf
+
+
+def test_empirical_distribution_matches_model(tiny_model):
+    gen = MarkovGenerator(1, tiny_model)
+    counts = Counter(gen.generate_batch(20_000))
+    assert set(counts) == {"a", "b"}
+    assert counts["a"] / 20_000 == pytest.approx(0.75, abs=0.02)
+
+
+def test_bundled_model_is_built_from_the_bundled_corpus(tmp_path):
+    path = str(tmp_path / "rebuilt.pwmk")
+    build_model(DEFAULT_CORPUS, path)
+    with open(path, "rb") as rebuilt, open(load_model().path, "rb") as bundled:
+        assert rebuilt.read() == bundled.read()
+
+
+def test_rejects_bad_input(tmp_path):
+    bogus = tmp_path / "bogus.pwmk"
+    bogus.write_bytes(b"definitely not a model")
+    with pytest.raises(ValueError):
+        TrigramModel(str(bogus))
+    with pytest.raises(ValueError):
+        build_model(["123", "# nothing"], str(tmp_path / "empty.pwmk"))
+    with pytest.raises(ValueError):
+        build_model(["word"], str(tmp_path / "coarse.pwmk"), resolution_bits=4)
+    assert not os.path.exists(tmp_path / "empty.pwmk")
@@ -0,0 +1,100 @@
+"""
+Tests for opt-in hot-path instrumentation
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from password_generator import compile_charset, generate_password, metrics
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Allowed cost of a disabled stage() + entropy_source() pair, in microseconds per call
+DISABLED_OVERHEAD_BUDGET_US = 1.0
+
+
+@pytest.fixture
+def enabled():
+    metrics.REGISTRY.reset()
+    metrics.enable()
+    yield metrics.REGISTRY
+    metrics.disable()
+    metrics.REGISTRY.reset()
+
+
+def test_stages_record_self_time_and_entropy_bytes(enabled):
+    with metrics.stage("mapping"):
+        generate_password(16, compile_charset(), metrics.entropy_source())
+        time.sleep(0.002)
+    mapping = enabled.histograms["mapping"]
+    fetch = enabled.histograms["entropy_fetch"]
+    assert mapping.count == 1 and fetch.count >= 1
+    assert mapping.sum >= 0.002
+    assert enabled.counters["entropy_bytes"] >= 16
+
+
+def test_overlapping_async_stages_keep_their_own_time(enabled):
+    async def request(delay):
+        with metrics.stage("output"):
+            await asyncio.sleep(delay)
+
+    async def main():
+        await asyncio.gather(request(0.05), request(0.2))
+
+    asyncio.run(main())
+    output = enabled.histograms["output"]
+    assert output.count == 2
+    assert output.sum >= 0.25
+    assert sum(output.counts[:metrics.BUCKETS.index(0.05)]) == 0  # neither stage lost its time
+
+
+def test_prometheus_export(enabled, tmp_path):
+    with metrics.stage("strength"):
+        pass
+    path = str(tmp_path / "metrics.prom")
+    metrics.write_prometheus(path)
+    text = open(path).read()
+    assert "# TYPE password_generator_stage_seconds histogram" in text
+    assert 'password_generator_stage_seconds_bucket{stage="strength",le="+Inf"} 1' in text
+    assert 'password_generator_stage_seconds_count{stage="strength"} 1' in text
+    assert "password_generator_entropy_bytes_total 0" in text
+
+
+def test_disabled_records_nothing_and_passes_sources_through():
+    assert not metrics.is_enabled()
+    metrics.REGISTRY.reset()
+    with metrics.stage("mapping"):
+        pass
+    assert metrics.entropy_source() is None
+    assert metrics.entropy_source(os.urandom) is os.urandom
+    assert metrics.REGISTRY.histograms == {}
+
+
+def test_disabled_overhead_is_negligible():
+    n = 200_000
+    stage, entropy_source = metrics.stage, metrics.entropy_source
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(n):
+            with stage("mapping"):
+                entropy_source()
+        best = min(best, time.perf_counter() - start)
+    assert best / n * 1e6 < DISABLED_OVERHEAD_BUDGET_US
+
+
+def test_cli_writes_metrics_file_from_env(tmp_path):
+    path = str(tmp_path / "cli.prom")
+    env = dict(os.environ, PASSWORD_GENERATOR_METRICS=path)
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py")],
+                            input="12\ny\ny\ny\nn\nn\n", capture_output=True, text=True,
+                            cwd=ROOT, env=env)
+    assert result.returncode == 0, result.stderr
+    text = open(path).read()
+    for name in ("charset_build", "entropy_fetch", "mapping", "strength", "output"):
+        assert f'stage_seconds_count{{stage="{name}"}}' in text
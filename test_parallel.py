@@ -0,0 +1,40 @@
+"""
+Tests for process-pool sharded generation
+"""
+
+import string
+
+import pytest
+
+from password_generator.parallel import (
+    _shard_bounds,
+    generate_parallel,
+    generate_parallel_buffer,
+)
+
+CHARSET = string.ascii_letters + string.digits
+
+
+def test_shards_cover_every_record_once():
+    shards = list(_shard_bounds(10, 4))
+    assert shards == [(0, 3), (3, 3), (6, 2), (8, 2)]
+    assert list(_shard_bounds(2, 4)) == [(0, 1), (1, 1)]
+
+
+def test_parallel_buffer_fills_all_shards():
+    buffer = generate_parallel_buffer(1001, 12, CHARSET, workers=2)
+    assert len(buffer) == 1001 * 12
+    # Unwritten shared memory would show up as NUL bytes
+    assert set(buffer.decode('ascii')) <= set(CHARSET)
+
+
+def test_parallel_passwords():
+    passwords = generate_parallel(100, 8, CHARSET, workers=2)
+    assert len(passwords) == 100
+    assert all(len(p) == 8 for p in passwords)
+    assert generate_parallel(0, 8, CHARSET, workers=2) == []
+
+
+def test_parallel_rejects_bad_charset():
+    with pytest.raises(ValueError):
+        generate_parallel_buffer(10, 8, "", workers=2)
@@ -0,0 +1,69 @@
+"""
+Tests for passphrase generation from compiled, memory-mapped wordlists
+"""
+
+import math
+from collections import Counter
+
+import pytest
+
+from password_generator.passphrase import (DEFAULT_WORDLIST, PassphraseGenerator, Wordlist,
+                                           build_wordlist, generate_passphrase, read_words)
+
+
+@pytest.fixture
+def small_list(tmp_path):
+    path = str(tmp_path / "words.pwwl")
+    build_wordlist(["11111\tapple", "11112\tbanana", "# comment", "", "11113\tcherry",
+                    "11114\tapple", "11115\tdürer"], path)
+    return path
+
+
+def test_build_and_index_round_trip(small_list):
+    with Wordlist(small_list) as words:
+        assert len(words) == 4
+        assert [words[i] for i in range(4)] == ["apple", "banana", "cherry", "dürer"]
+        assert words[-1] == "dürer"
+        with pytest.raises(IndexError):
+            words[4]
+
+
+def test_rejects_files_that_are_not_wordlists(tmp_path):
+    bogus = tmp_path / "bogus.pwwl"
+    bogus.write_bytes(b"not a wordlist at all")
+    with pytest.raises(ValueError):
+        Wordlist(str(bogus))
+    with pytest.raises(ValueError):
+        build_wordlist(["only"], str(tmp_path / "one.pwwl"))
+
+
+def test_bundled_list_matches_its_source():
+    with open(DEFAULT_WORDLIST[:-len(".pwwl")] + ".txt", encoding="utf-8") as f:
+        source = list(read_words(f))
+    words = Wordlist(DEFAULT_WORDLIST)
+    assert len(words) == len(source) >= 1296
+    assert [words[i] for i in range(len(words))] == source
+    words.close()
+
+
+def test_options_and_entropy(small_list):
+    gen = PassphraseGenerator(5, small_list, separator=" ", capitalize="first", digits=3)
+    phrase = gen.generate()
+    parts = phrase.split(" ")
+    assert len(parts) == 5
+    assert all(p[0].isupper() for p in parts)
+    assert sum(c.isdigit() for c in phrase) == 3
+    assert gen.entropy_bits == pytest.approx(5 * 2 + 3 * math.log2(10) + math.log2(5))
+    assert len(gen.generate_batch(7)) == 7
+    with pytest.raises(ValueError):
+        PassphraseGenerator(0, small_list)
+    with pytest.raises(ValueError):
+        PassphraseGenerator(3, small_list, capitalize="upper")
+
+
+def test_selection_is_uniform(small_list):
+    counts = Counter(generate_passphrase(20_000, small_list, separator=" ").split())
+    expected = 20_000 / 4
+    chi2 = sum((c - expected) ** 2 / expected for c in counts.values())
+    assert set(counts) == {"apple", "banana", "cherry", "dürer"}
+    assert chi2 < 16.3  # 3 degrees of freedom, p = 0.001
@@ -0,0 +1,76 @@
+"""
+Tests for policy-constrained generation
+"""
+
+import os
+import string
+from collections import Counter
+
+import pytest
+
+from password_generator import compile_charset
+from password_generator.policy import ConstrainedGenerator, IndexSource, generate_constrained_batch
+
+
+def has_sequence(password):
+    codes = [ord(c) for c in password]
+    return any(b - a == c - b and abs(b - a) == 1 for a, b, c in zip(codes, codes[1:], codes[2:]))
+
+
+def test_min_counts_and_adjacency_rules_always_hold():
+    passwords = generate_constrained_batch(
+        2000, 6, min_counts={"digits": 2, "symbols": 1, "upper": 1},
+        no_repeats=True, no_sequences=True)
+    for password in passwords:
+        assert len(password) == 6
+        assert sum(c in string.digits for c in password) >= 2
+        assert sum(c in string.punctuation for c in password) >= 1
+        assert sum(c in string.ascii_uppercase for c in password) >= 1
+        assert all(a != b for a, b in zip(password, password[1:]))
+        assert not has_sequence(password)
+
+
+def test_tiny_alphabet_still_terminates():
+    for password in generate_constrained_batch(500, 12, "abc", no_repeats=True, no_sequences=True):
+        assert not has_sequence(password)
+        assert all(a != b for a, b in zip(password, password[1:]))
+
+
+def test_required_positions_are_shuffled():
+    generator = ConstrainedGenerator(4, compile_charset(), {"digits": 1})
+    first_digit = Counter(next(i for i, c in enumerate(p) if c.isdigit())
+                          for p in generator.generate_batch(4000))
+    assert set(first_digit) == {0, 1, 2, 3}
+
+
+def test_index_source_is_uniform():
+    source = IndexSource()
+    counts = Counter(source.below(7) for _ in range(7000))
+    assert set(counts) == set(range(7))
+    assert min(counts.values()) > 800
+
+
+def test_index_source_reads_grow_from_the_request_size():
+    reads = []
+
+    def randbytes(n):
+        reads.append(n)
+        return os.urandom(n)
+
+    generator = ConstrainedGenerator(16, compile_charset(), {"digits": 1}, no_repeats=True,
+                                     randbytes=randbytes)
+    generator.generate()
+    assert sum(reads) < 1024
+    generator.generate_batch(200)
+    assert reads[1:4] == [2 * reads[0], 4 * reads[0], 8 * reads[0]]
+
+
+def test_impossible_policies_are_rejected_up_front():
+    with pytest.raises(ValueError):
+        ConstrainedGenerator(3, None, {"digits": 2, "symbols": 2})
+    with pytest.raises(ValueError):
+        ConstrainedGenerator(8, string.ascii_letters, {"digits": 1})
+    with pytest.raises(ValueError):
+        ConstrainedGenerator(8, "ab", no_repeats=True, no_sequences=True)
+    with pytest.raises(ValueError):
+        ConstrainedGenerator(8, None, {"emoji": 1})
@@ -0,0 +1,101 @@
+"""
+Tests for bulk provisioning: passwords plus salted hashes for a users CSV
+"""
+
+import csv
+import os
+
+import pytest
+
+from password_generator import PasswordPolicy
+from password_generator.provision import hash_password, provision, read_checkpoint, verify_password
+
+# Cheap work factors keep the tests fast; the format and code path are the same
+FAST = {"pbkdf2_sha256": 1000, "scrypt": 2 ** 4}
+
+
+@pytest.fixture
+def users(tmp_path):
+    path = tmp_path / "users.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["user", "note"])
+        for i in range(500):
+            writer.writerow([f"user{i}", "line one\nline two" if i % 97 == 0 else f"née {i}"])
+    return str(path)
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+@pytest.mark.parametrize("algorithm", sorted(FAST))
+def test_hash_round_trip(algorithm):
+    encoded = hash_password("correct horse", algorithm, FAST[algorithm])
+    assert encoded.startswith(algorithm + "$")
+    assert verify_password("correct horse", encoded)
+    assert not verify_password("wrong horse", encoded)
+    # Fresh salt every time
+    assert hash_password("correct horse", algorithm, FAST[algorithm]) != encoded
+    with pytest.raises(ValueError):
+        verify_password("x", "md5$abc")
+    with pytest.raises(ValueError):
+        hash_password("x", "md5")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_output_keeps_input_order(users, tmp_path, workers):
+    dest = str(tmp_path / "out.csv")
+    rows = provision(users, dest, PasswordPolicy(12), cost=FAST["pbkdf2_sha256"],
+                     workers=workers, chunk_rows=16, max_in_flight=3)
+    assert rows == 500
+    source, result = read_csv(users), read_csv(dest)
+    assert result[0] == ["user", "note", "password", "password_hash"]
+    assert [r[:2] for r in result] == source
+    assert all(len(r[2]) == 12 for r in result[1:])
+    assert len({r[2] for r in result[1:]}) == 500
+    assert all(verify_password(r[2], r[3]) for r in result[1:60])
+    assert not os.path.exists(dest + ".ckpt")
+
+
+def test_resume_after_interruption(users, tmp_path):
+    dest = str(tmp_path / "out.csv")
+
+    def interrupt(rows):
+        if rows >= 200:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        provision(users, dest, algorithm="scrypt", cost=FAST["scrypt"], workers=1,
+                  chunk_rows=50, report=interrupt)
+    state = read_checkpoint(dest + ".ckpt")
+    assert state["rows"] == 200
+    partial = read_csv(dest)
+    # A half-written chunk past the checkpoint would be truncated on resume
+    with open(dest, "ab") as f:
+        f.write(b"garbage,from,a,crash\n")
+
+    with pytest.raises(ValueError):
+        provision(users, dest, workers=1)
+    assert provision(users, dest, algorithm="scrypt", cost=FAST["scrypt"], workers=1,
+                     chunk_rows=50, resume=True) == 500
+
+    result = read_csv(dest)
+    assert result[:201] == partial[:201]
+    assert [r[:2] for r in result] == read_csv(users)
+    assert all(verify_password(r[2], r[3]) for r in result[195:210])
+
+
+def test_resume_refuses_a_different_input(users, tmp_path):
+    dest = str(tmp_path / "out.csv")
+
+    def interrupt(rows):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        provision(users, dest, cost=FAST["pbkdf2_sha256"], workers=1, report=interrupt)
+    other = tmp_path / "other.csv"
+    other.write_text("login,email\nbob,bob@example.org\n")
+    with pytest.raises(ValueError):
+        provision(str(other), dest, workers=1, resume=True)
@@ -0,0 +1,75 @@
+"""
+Tests for the deterministic (non-secret) seeded generation mode
+"""
+
+import os
+import string
+import subprocess
+import sys
+from collections import Counter
+
+import pytest
+
+from password_generator.seeded import WARNING, SeededGenerator
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_same_seed_same_passwords_and_random_access():
+    a = SeededGenerator("fixture-1", 16)
+    b = SeededGenerator("fixture-1", 16)
+    batch = a.passwords(0, 1000)
+    assert batch == b.passwords(0, 1000)
+    assert a.password_at(777) == batch[777]
+    assert a.password_at(49_999_999) == b.passwords(49_999_999, 50_000_000)[0]
+    assert SeededGenerator("fixture-2", 16).passwords(0, 1000) != batch
+    assert [p for chunk in a.iter_chunks(0, 1000, chunk_size=300) for p in chunk] == batch
+
+
+def test_seed_types_and_charsets():
+    assert SeededGenerator(42).password_at(0) == SeededGenerator("42").password_at(0)
+    pins = SeededGenerator(b"pins", 6, string.digits).passwords(0, 200)
+    assert all(len(p) == 6 and p.isdigit() for p in pins)
+    long = SeededGenerator("x", 300, "ab").password_at(3)
+    assert len(long) == 300 and set(long) == {"a", "b"}
+    with pytest.raises(TypeError):
+        SeededGenerator(1.5)
+    with pytest.raises(ValueError):
+        SeededGenerator("x", 8, "")
+    with pytest.raises(IndexError):
+        SeededGenerator("x").password_at(-1)
+
+
+def test_output_is_uniform():
+    text = "".join(SeededGenerator("uniform", 50, string.digits).passwords(0, 400))
+    counts = Counter(text)
+    expected = len(text) / 10
+    chi2 = sum((c - expected) ** 2 / expected for c in counts.values())
+    assert chi2 < 27.9  # 9 degrees of freedom, p = 0.001
+
+
+def test_cli_seeded_mode_is_labelled_and_splittable():
+    def run(*args):
+        return subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "--seed", "s",
+                               "--length", "10", *args], capture_output=True, text=True, cwd=ROOT)
+
+    whole = run("--count", "6")
+    assert whole.returncode == 0
+    assert WARNING in whole.stderr
+    first, second = run("--count", "3"), run("--count", "3", "--start", "3")
+    assert first.stdout + second.stdout == whole.stdout
+    assert len(whole.stdout.splitlines()) == 6
+
+
+def test_cli_csv_matches_the_unseeded_shape_and_splits_cleanly():
+    def run(*args):
+        return subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "--format", "csv",
+                               "--length", "10", *args], capture_output=True, text=True, cwd=ROOT)
+
+    unseeded = run("--count", "2").stdout.splitlines()
+    whole = run("--seed", "s", "--count", "6").stdout
+    assert whole.splitlines()[0] == unseeded[0] == "index,password"
+    first = run("--seed", "s", "--count", "3").stdout
+    second = run("--seed", "s", "--count", "3", "--start", "3").stdout
+    assert first + second == whole
+    assert [line.split(",")[0] for line in whole.splitlines()[1:]] == [str(i) for i in range(6)]
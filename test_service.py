@@ -0,0 +1,89 @@
+"""
+Tests for the asyncio HTTP service, run against an in-process server on localhost
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from password_generator import PasswordPolicy
+from password_generator.service import PasswordService, parse_policy
+
+
+async def fetch(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nConnection: close\r\n\r\n".encode())
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    if b"chunked" in head.lower():
+        decoded = b""
+        while True:
+            size_line, _, body = body.partition(b"\r\n")
+            size = int(size_line, 16)
+            if not size:
+                break
+            decoded += body[:size]
+            body = body[size + 2:]
+        body = decoded
+    return status, body
+
+
+def run_against_service(*paths):
+    async def scenario():
+        server = await asyncio.start_server(PasswordService().handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return [await fetch(port, path) for path in paths]
+    return asyncio.run(scenario())
+
+
+def test_generate_and_stream_endpoints():
+    (status, body), (big_status, big_body), (stream_status, stream_body) = run_against_service(
+        "/generate?length=10&count=3&policy=digits",
+        "/generate?length=6&count=20000",
+        "/generate/stream?length=8&count=50&framing=nul",
+    )
+    assert status == 200
+    passwords = json.loads(body)["passwords"]
+    assert len(passwords) == 3 and all(p.isdigit() and len(p) == 10 for p in passwords)
+
+    assert big_status == 200
+    assert len(json.loads(big_body)["passwords"]) == 20000
+
+    assert stream_status == 200
+    records = stream_body.split(b"\0")
+    assert len(records) == 51 and all(len(r) == 8 for r in records[:-1])
+
+
+def test_errors_are_json():
+    results = run_against_service("/generate?length=0", "/generate?policy=emoji", "/missing")
+    assert [status for status, _ in results] == [400, 400, 404]
+    assert all("error" in json.loads(body) for _, body in results)
+
+
+def test_parse_policy():
+    assert parse_policy("digits,no-similar", 8) == PasswordPolicy(
+        8, uppercase=False, lowercase=False, symbols=False, exclude_similar=True)
+    assert parse_policy("digits,no-similar").alphabet().chars == "23456789"
+    assert len(parse_policy("").alphabet()) == 94
+    assert parse_policy("no-ambiguous").alphabet() is parse_policy("no-ambiguous").alphabet()
+    with pytest.raises(ValueError):
+        parse_policy("unknown")
+
+
+def test_metrics_endpoint_reports_generation_stages():
+    from password_generator import metrics
+
+    metrics.REGISTRY.reset()
+    metrics.enable()
+    try:
+        (_, _), (status, body) = run_against_service("/generate?count=5", "/metrics")
+    finally:
+        metrics.disable()
+        metrics.REGISTRY.reset()
+    assert status == 200
+    assert b'password_generator_stage_seconds_count{stage="mapping"} 1' in body
+    assert b"password_generator_entropy_bytes_total" in body
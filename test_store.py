@@ -0,0 +1,126 @@
+"""
+Tests for the memory-mapped deduplicated record store
+"""
+
+import os
+import shutil
+import string
+
+import pytest
+
+from password_generator.store import (
+    BITSET,
+    BLOOM,
+    RecordStore,
+    UniqueRecordWriter,
+    generate_unique,
+)
+
+
+def test_generated_codes_are_unique_and_random_access(tmp_path):
+    path = str(tmp_path / "pins.bin")
+    assert generate_unique(path, 5000, 4, string.digits) == 5000
+    with RecordStore(path) as store:
+        assert len(store) == 5000
+        assert store.width == 4 and store.alphabet == string.digits
+        codes = [bytes(store[i]) for i in range(len(store))]
+        assert len(set(codes)) == 5000
+        assert bytes(store.slice(10, 12)) == codes[10] + codes[11]
+        assert bytes(store[-1]) == codes[-1]
+        with pytest.raises(IndexError):
+            store[5000]
+
+
+def test_whole_keyspace_can_be_issued(tmp_path):
+    path = str(tmp_path / "all.bin")
+    generate_unique(path, 100, 2, string.digits)
+    with RecordStore(path) as store:
+        assert sorted(bytes(store[i]) for i in range(100)) == [b"%02d" % i for i in range(100)]
+    with pytest.raises(ValueError):
+        generate_unique(str(tmp_path / "too-many.bin"), 101, 2, string.digits)
+
+
+@pytest.mark.parametrize("width, kind", [(4, BITSET), (16, BLOOM)])
+def test_writer_rejects_duplicates_across_reopen(tmp_path, width, kind):
+    path = str(tmp_path / "codes.bin")
+    first, second = b"a" * width, b"b" * width
+    with UniqueRecordWriter(path, width, string.ascii_lowercase, 10) as writer:
+        assert writer.index.kind == kind
+        assert writer.add(first)
+        assert not writer.add(first)
+        assert writer.extend_buffer(first + second + second) == 1
+    with UniqueRecordWriter(path, width, string.ascii_lowercase, 10) as writer:
+        assert writer.count == 2
+        assert not writer.add(second)
+        assert writer.add(b"c" * width)
+    with RecordStore(path) as store:
+        assert [bytes(store[i]) for i in range(3)] == [first, second, b"c" * width]
+
+
+def test_zero_copy_array(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = str(tmp_path / "codes.bin")
+    generate_unique(path, 1000, 6, string.ascii_uppercase)
+    with RecordStore(path) as store:
+        array = store.as_array()
+        assert array.dtype == np.dtype("S6")
+        assert len(np.unique(array)) == 1000
+        del array
+
+
+def test_count_survives_a_crash_and_orphaned_index_bits_are_dropped(tmp_path):
+    path = str(tmp_path / "codes.bin")
+    writer = UniqueRecordWriter(path, 4, string.digits, 10)
+    assert writer.add(b"1111") and writer.add(b"2222")
+    with RecordStore(path) as store:
+        assert len(store) == 2
+    # Crash after the index bit was set but before the record was counted
+    writer.index.set_count(2 ** 64 - 1)
+    writer.index.add(b"3333")
+    writer._mm.close()
+    writer.index.close()
+    with UniqueRecordWriter(path, 4, string.digits, 10) as writer:
+        assert writer.count == 2
+        assert not writer.add(b"1111")
+        assert writer.add(b"3333")
+
+
+def test_missing_index_is_rebuilt_from_the_store(tmp_path):
+    path = str(tmp_path / "codes.bin")
+    generate_unique(path, 500, 3, string.digits)
+    with RecordStore(path) as store:
+        codes = [bytes(store[i]) for i in range(len(store))]
+    os.remove(path + ".idx")
+    with UniqueRecordWriter(path, 3, string.digits, 600) as writer:
+        assert writer.extend(codes) == 0
+        assert writer.count == 500
+
+
+def test_index_for_another_store_is_rejected(tmp_path):
+    generate_unique(str(tmp_path / "digits.bin"), 10, 4, string.digits)
+    path = str(tmp_path / "letters.bin")
+    shutil.copy(str(tmp_path / "digits.bin.idx"), path + ".idx")
+    with pytest.raises(ValueError):
+        UniqueRecordWriter(path, 4, string.ascii_lowercase, 10)
+
+
+@pytest.mark.parametrize("width", [4, 12])
+def test_records_outside_the_alphabet_are_rejected_before_writing(tmp_path, width):
+    path = str(tmp_path / "codes.bin")
+    with UniqueRecordWriter(path, width, string.digits, 10) as writer:
+        with pytest.raises(ValueError):
+            writer.add(b"12ab".ljust(width, b"0"))
+        with pytest.raises(ValueError):
+            writer.extend_buffer(b"12ab".ljust(width, b"0"))
+        assert writer.count == 0
+        assert writer.add(b"1200".ljust(width, b"0"))
+    with UniqueRecordWriter(path, width, string.digits, 10) as writer:
+        assert writer.count == 1
+        assert writer.extend_buffer(b"3456".ljust(width, b"0")) == 1
+
+
+def test_non_store_file_is_rejected(tmp_path):
+    path = tmp_path / "junk.bin"
+    path.write_bytes(b"x" * 1024)
+    with pytest.raises(ValueError):
+        RecordStore(str(path))
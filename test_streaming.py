@@ -0,0 +1,60 @@
+"""
+Tests for the constant-memory streaming pipeline
+"""
+
+import csv
+import io
+import string
+
+import pytest
+
+from password_generator import streaming
+
+CHARSET = string.ascii_letters + string.digits + string.punctuation
+
+
+def test_iter_passwords_is_lazy_and_exact():
+    stream = streaming.iter_passwords(10, 8, CHARSET, chunk_size=3)
+    assert next(stream) is not None
+    assert sum(1 for _ in stream) == 9
+    chunks = list(streaming.iter_chunks(10, 8, CHARSET, chunk_size=4))
+    assert [len(c) for c in chunks] == [4, 4, 2]
+
+
+@pytest.mark.parametrize("framing, separator", [("newline", b"\n"), ("nul", b"\0")])
+def test_delimited_framing(framing, separator):
+    out = io.BytesIO()
+    streaming.write_stream(out, 25, 12, CHARSET, framing, chunk_size=7)
+    records = out.getvalue().split(separator)
+    assert records[-1] == b""
+    assert len(records) == 26
+    assert all(len(r) == 12 for r in records[:-1])
+
+
+@pytest.mark.parametrize("count", [2, streaming.VECTORIZE_THRESHOLD + 1])
+def test_non_ascii_charset_is_utf8_on_every_path(count):
+    out = io.BytesIO()
+    streaming.write_stream(out, count, 6, "äöab", "newline")
+    lines = out.getvalue().decode("utf-8").splitlines()
+    assert len(lines) == count
+    assert all(len(line) == 6 and set(line) <= set("äöab") for line in lines)
+
+
+def test_csv_framing_round_trips_quoted_symbols():
+    out = io.BytesIO()
+    streaming.write_stream(out, 40, 10, '",ab', "csv", chunk_size=9)
+    rows = list(csv.reader(io.StringIO(out.getvalue().decode())))
+    assert rows[0] == ["index", "password"]
+    assert [int(r[0]) for r in rows[1:]] == list(range(40))
+    assert all(len(r[1]) == 10 and set(r[1]) <= set('",ab') for r in rows[1:])
+
+
+def test_cli_writes_file(tmp_path):
+    path = tmp_path / "out.txt"
+    assert streaming.main(["--count", "5", "--length", "9", "-o", str(path)]) == 0
+    assert [len(line) for line in path.read_text().splitlines()] == [9] * 5
+
+
+def test_unknown_framing():
+    with pytest.raises(ValueError):
+        list(streaming.iter_framed(1, 8, CHARSET, "tsv"))
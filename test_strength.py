@@ -0,0 +1,69 @@
+"""
+Tests for the shared entropy-based strength estimator
+"""
+
+import math
+
+import pytest
+
+from password_generator.strength import (
+    DIGIT,
+    LOWER,
+    SYMBOL,
+    UPPER,
+    assess,
+    class_mask,
+    estimate_bits,
+    rate_bits,
+    score_batch,
+    score_lines,
+)
+
+
+def test_class_mask_single_pass():
+    assert class_mask("aB3!") == UPPER | LOWER | DIGIT | SYMBOL
+    assert class_mask("abc") == LOWER
+    assert class_mask("") == 0
+
+
+def test_bits_from_inferred_and_known_alphabet():
+    assert estimate_bits("12345678") == pytest.approx(8 * math.log2(10))
+    assert estimate_bits("Abc123!@") == pytest.approx(8 * math.log2(94))
+    assert estimate_bits("abcd", alphabet_size=16) == pytest.approx(16)
+    assert estimate_bits("") == 0.0
+
+
+def test_ratings_agree_with_old_heuristics_on_typical_cases():
+    assert assess("abc").label == "Very Weak"
+    assert assess("Abc123!@").label == "Strong"
+    assert assess("aB3$" * 3).label == "Very Strong"
+    assert rate_bits(40) == "Moderate"
+
+
+def test_batch_apis_match_single_scores():
+    passwords = ["abc", "Abc123!@", "", "12345678", "pässwörd"]
+    expected = [estimate_bits(p) for p in passwords]
+    assert score_batch(passwords) == pytest.approx(expected)
+    data = "\n".join(passwords[:4]).encode() + b"\r\n"
+    assert list(score_lines(data)) == pytest.approx(expected[:4])
+
+
+def test_score_matrix():
+    np = pytest.importorskip("numpy")
+    from password_generator.strength import score_matrix
+
+    matrix = np.frombuffer(b"abcdAB12", dtype=np.uint8).reshape(2, 4)
+    assert list(score_matrix(matrix)) == pytest.approx([4 * math.log2(26), 4 * math.log2(36)])
+
+
+@pytest.mark.parametrize("data, lines", [
+    (b"", 0), (b"\n", 1), (b"abc", 1), ("héllo\n".encode(), 1), (b"a\rb\nc", 2),
+    (b"x\r\n\r\ny\n\n", 4), (b"a\x0bb\x1cc\n", 1),
+])
+def test_score_lines_same_with_and_without_numpy(data, lines):
+    from password_generator.strength import _score_lines_python
+
+    scores = score_lines(data)
+    assert isinstance(scores, list)
+    assert scores == pytest.approx(_score_lines_python(data))
+    assert len(scores) == lines
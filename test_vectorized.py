@@ -0,0 +1,55 @@
+"""
+Tests for the optional NumPy backend and its pure-Python fallback
+"""
+
+import pytest
+
+from password_generator import build_charset
+from password_generator import vectorized
+
+CHARSET = build_charset(exclude_similar=True, exclude_ambiguous=True)
+
+
+def test_matrix_shape_and_alphabet():
+    np = pytest.importorskip("numpy")
+    matrix = vectorized.generate_matrix(1000, 12, CHARSET)
+    assert matrix.shape == (1000, 12)
+    assert matrix.dtype == np.uint8
+    assert matrix.flags['C_CONTIGUOUS']
+    assert set(matrix.tobytes().decode('ascii')) <= set(CHARSET)
+
+
+def test_array_is_fixed_width():
+    pytest.importorskip("numpy")
+    array = vectorized.generate_array(50, 10, CHARSET)
+    assert array.dtype.str == '|S10'
+    assert len(array) == 50
+    assert all(len(p) == 10 for p in array)
+
+
+def test_buffer_framing():
+    buffer = vectorized.generate_buffer(20, 8, CHARSET, separator=b'\0')
+    records = buffer.split(b'\0')
+    assert records[-1] == b''
+    assert len(records) == 21
+    assert all(len(r) == 8 for r in records[:-1])
+
+
+def test_fallback_without_numpy(monkeypatch, tmp_path):
+    monkeypatch.setattr(vectorized, "np", None)
+    assert not vectorized.have_numpy()
+    array = vectorized.generate_array(5, 6, CHARSET)
+    assert all(isinstance(p, bytes) and len(p) == 6 for p in array)
+    buffer = vectorized.generate_buffer(5, 6, CHARSET)
+    assert len(buffer) == 5 * 7
+    with pytest.raises(RuntimeError):
+        vectorized.generate_matrix(5, 6, CHARSET)
+
+    path = tmp_path / "out.txt"
+    assert vectorized.write_passwords(path, 7, 6, CHARSET, chunk_size=3) == 7
+    assert len(path.read_bytes().splitlines()) == 7
+
+
+def test_rejects_multibyte_charset():
+    with pytest.raises(ValueError):
+        vectorized.generate_buffer(1, 4, "αβγ")